@@ -5,6 +5,8 @@ from pathlib import Path
 import csv
 import click
 
+from lib.universal_mixin import bulk
+
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.materias.models import Materia
@@ -23,7 +25,7 @@ def alimentar_autoridades():
         return
     click.echo("Alimentando autoridades...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             distrito_id = int(row["distrito_id"])
@@ -5,6 +5,8 @@ from pathlib import Path
 import csv
 import click
 
+from lib.universal_mixin import bulk
+
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.autoridades_funcionarios.models import AutoridadFuncionario
 from plataforma_web.blueprints.funcionarios.models import Funcionario
@@ -27,7 +29,7 @@ def alimentar_autoridades_funcionarios():
     click.echo("Alimentando autoridades-funcionarios...")
     contador = 0
     autoridad = None
-    with open(ruta, encoding="utf-8") as puntero:
+    with open(ruta, encoding="utf-8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             funcionario_id = int(row["funcionario_id"])
@@ -5,6 +5,8 @@ from pathlib import Path
 import csv
 import click
 
+from lib.universal_mixin import bulk
+
 from plataforma_web.blueprints.distritos.models import Distrito
 
 DISTRITOS_CSV = "seed/distritos.csv"
@@ -21,7 +23,7 @@ def alimentar_distritos():
         return
     click.echo("Alimentando distritos...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             distrito_id = int(row["distrito_id"])
@@ -6,6 +6,7 @@ import csv
 import click
 
 from lib.safe_string import safe_string
+from lib.universal_mixin import bulk
 
 from plataforma_web.blueprints.funcionarios.models import Funcionario
 
@@ -23,7 +24,7 @@ def alimentar_funcionarios():
         return
     click.echo("Alimentando funcionarios...")
     contador = 0
-    with open(ruta, encoding="utf-8") as puntero:
+    with open(ruta, encoding="utf-8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             funcionario_id = int(row["funcionario_id"])
@@ -6,6 +6,7 @@ import csv
 import click
 
 from lib.safe_string import safe_string
+from lib.universal_mixin import bulk
 
 from plataforma_web.blueprints.materias.models import Materia
 
@@ -23,7 +24,7 @@ def alimentar_materias():
         return
     click.echo("Alimentando materias...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             materia_id = int(row["materia_id"])
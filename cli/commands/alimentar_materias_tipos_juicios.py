@@ -6,6 +6,7 @@ import csv
 import click
 
 from lib.safe_string import safe_string
+from lib.universal_mixin import bulk
 
 from plataforma_web.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
 
@@ -23,7 +24,7 @@ def alimentar_materias_tipos_juicios():
         return
     click.echo("Alimentando materias tipos juicios...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             materia_tipo_juicio_id = int(row["materia_tipo_juicio_id"])
@@ -6,6 +6,7 @@ import csv
 import click
 
 from lib.safe_string import safe_string
+from lib.universal_mixin import bulk
 
 from plataforma_web.blueprints.modulos.models import Modulo
 
@@ -23,7 +24,7 @@ def alimentar_modulos():
         return
     click.echo("Alimentando módulos...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             modulo_id = int(row["modulo_id"])
@@ -5,6 +5,8 @@ from pathlib import Path
 import csv
 import click
 
+from lib.universal_mixin import bulk
+
 from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.roles.models import Rol
@@ -27,7 +29,7 @@ def alimentar_permisos():
         return
     click.echo("Alimentando permisos...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             rol_id = int(row["rol_id"])
@@ -5,6 +5,7 @@ from pathlib import Path
 import csv
 import click
 from lib.pwgen import generar_contrasena
+from lib.universal_mixin import bulk
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.usuarios.models import Usuario
@@ -24,7 +25,7 @@ def alimentar_usuarios():
         return
     click.echo("Alimentando usuarios...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             if "autoridad_clave" in row:
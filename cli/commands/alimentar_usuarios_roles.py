@@ -5,6 +5,8 @@ from pathlib import Path
 import csv
 import click
 
+from lib.universal_mixin import bulk
+
 from plataforma_web.blueprints.roles.models import Rol
 from plataforma_web.blueprints.usuarios.models import Usuario
 from plataforma_web.blueprints.usuarios_roles.models import UsuarioRol
@@ -26,7 +28,7 @@ def alimentar_usuarios_roles():
         return
     click.echo("Alimentando usuarios-roles...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             usuario_id = int(row["usuario_id"])
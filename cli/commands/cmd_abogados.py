@@ -10,6 +10,7 @@ import csv
 import click
 
 from lib.safe_string import safe_string
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 from plataforma_web.extensions import db
@@ -38,7 +39,7 @@ def alimentar(entrada_csv):
         return
     click.echo("Alimentando abogados...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             try:
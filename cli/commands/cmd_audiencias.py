@@ -11,6 +11,7 @@ import click
 
 from lib.safe_string import safe_string
 from lib.time_utc import local_to_utc, utc_to_local_str
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 from plataforma_web.extensions import db
@@ -48,7 +49,7 @@ def alimentar(entrada_csv):
         return
     click.echo("Alimentando audiencias...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             try:
@@ -0,0 +1,38 @@
+"""
+Auditoría
+
+- drenar: Escribir en la base de datos los eventos de auditoría que esperan en Redis
+"""
+import click
+
+from lib import audit
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+app = create_app()
+db.app = app
+
+ESPERA_MILISEGUNDOS = 5000
+
+
+@click.group()
+def cli():
+    """Auditoría"""
+
+
+@click.command()
+@click.option("--continuo", is_flag=True, help="Seguir esperando eventos nuevos")
+def drenar(continuo):
+    """Escribir en la base de datos los eventos de auditoría que esperan en Redis"""
+    total = 0
+    while True:
+        with app.app_context():
+            cantidad = audit.drain(bloquear_milisegundos=ESPERA_MILISEGUNDOS if continuo else None)
+            db.session.remove()
+        total += cantidad
+        if not continuo and cantidad < audit.LOTE:
+            break
+    click.echo(f"Se escribieron {total} eventos de auditoría.")
+
+
+cli.add_command(drenar)
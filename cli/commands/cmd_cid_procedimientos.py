@@ -21,7 +21,7 @@ def cli():
 @click.argument("cid_procedimiento_id", type=int)
 def crear_pdf(cid_procedimiento_id):
     """Crear PDF"""
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.cid_procedimientos.tasks.crear_pdf",
         cid_procedimiento_id=cid_procedimiento_id,
     )
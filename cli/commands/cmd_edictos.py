@@ -42,7 +42,7 @@ def refrescar(autoridad_clave):
     if autoridad.directorio_edictos is None or autoridad.directorio_edictos == "":
         click.echo(f"La autoridad {autoridad_clave} no tiene directorio para edictos")
         return
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.edictos.tasks.refrescar",
         autoridad_id=autoridad.id,
         usuario_id=None,
@@ -62,7 +62,7 @@ def refrescar_todos():
             continue
         if autoridad.directorio_edictos is None or autoridad.directorio_edictos == "":
             continue
-        app.task_queue.enqueue(
+        app.task_queues.enqueue(
             "plataforma_web.blueprints.edictos.tasks.refrescar",
             autoridad_id=autoridad.id,
             usuario_id=None,
@@ -0,0 +1,32 @@
+"""
+Expedientes Registros
+
+- rellenar: Volver a anotar los registros activos de los módulos en el índice de expedientes
+"""
+import click
+
+from lib.expedientes import FUENTES, rebuild
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+app = create_app()
+db.app = app
+
+
+@click.group()
+def cli():
+    """Expedientes Registros"""
+
+
+@click.command()
+@click.option("--modulo", multiple=True, type=click.Choice(sorted(FUENTES)), help="Sólo estos módulos")
+@click.option("--lote", default=1000, type=int, help="Cantidad de registros por transacción")
+def rellenar(modulo, lote):
+    """Volver a anotar los registros activos de los módulos en el índice de expedientes"""
+    with app.app_context():
+        for nombre in modulo or sorted(FUENTES):
+            contador = rebuild(nombre, lote)
+            click.echo(f"- {nombre}: {contador} registros anotados")
+
+
+cli.add_command(rellenar)
@@ -45,7 +45,7 @@ def refrescar(autoridad_clave):
     if autoridad.directorio_glosas is None or autoridad.directorio_glosas == "":
         click.echo(f"La autoridad {autoridad_clave} no tiene directorio para glosas")
         return
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.glosas.tasks.refrescar",
         autoridad_id=autoridad.id,
         usuario_id=None,
@@ -65,7 +65,7 @@ def refrescar_todos():
             continue
         if autoridad.directorio_glosas is None or autoridad.directorio_glosas == "":
             continue
-        app.task_queue.enqueue(
+        app.task_queues.enqueue(
             "plataforma_web.blueprints.glosas.tasks.refrescar",
             autoridad_id=autoridad.id,
             usuario_id=None,
@@ -0,0 +1,64 @@
+"""
+Índices
+
+- crear: Crear los índices declarados en los modelos que aun no existen en la base de datos
+- asesorar: Ejecutar EXPLAIN en cada combinación de filtros de los datatables y reportar los recorridos completos
+"""
+import click
+
+from lib.index_advisor import DATATABLES, advise
+from lib.trigrams import EXTENSION_SQL
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+app = create_app()
+db.app = app
+
+
+@click.group()
+def cli():
+    """Índices"""
+
+
+@click.command()
+def crear():
+    """Crear los índices declarados en los modelos que aun no existen en la base de datos"""
+    with app.app_context():
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.begin() as conexion:
+                conexion.execute(db.text(EXTENSION_SQL))
+        inspector = db.inspect(db.engine)
+        contador = 0
+        for tabla in db.metadata.sorted_tables:
+            if not inspector.has_table(tabla.name):
+                continue
+            existentes = {indice["name"] for indice in inspector.get_indexes(tabla.name)}
+            for indice in tabla.indexes:
+                if indice.info.get("dialecto") not in (None, db.engine.dialect.name):
+                    continue  # Índice sólo para otra base de datos, como los GIN de PostgreSQL
+                if indice.name not in existentes:
+                    click.echo(f"- Creando {indice.name} en {tabla.name}")
+                    indice.create(bind=db.engine)
+                    contador += 1
+        click.echo(f"Se crearon {contador} índices.")
+
+
+@click.command()
+@click.option("--datatable", multiple=True, type=click.Choice(sorted(DATATABLES)), help="Sólo estos datatables")
+@click.option("--plan", is_flag=True, help="Mostrar el plan de los recorridos completos")
+def asesorar(datatable, plan):
+    """Ejecutar EXPLAIN en cada combinación de filtros de los datatables y reportar los recorridos completos"""
+    with app.app_context():
+        resultados = advise(datatable)
+    recorridos = [resultado for resultado in resultados if resultado["recorrido_completo"]]
+    for resultado in recorridos:
+        filtros = ", ".join(resultado["filtros"]) if resultado["filtros"] else "sin filtros"
+        click.echo(f"- {resultado['datatable']}: {filtros}")
+        if plan:
+            for renglon in resultado["plan"]:
+                click.echo(f"    {renglon}")
+    click.echo(f"De {len(resultados)} combinaciones, {len(recorridos)} recorren la tabla completa.")
+
+
+cli.add_command(crear)
+cli.add_command(asesorar)
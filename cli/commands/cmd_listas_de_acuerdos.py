@@ -38,7 +38,7 @@ def enviar_reporte(fecha):
             return
     else:
         fecha_date = None
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.listas_de_acuerdos.tasks.enviar_reporte",
         fecha=fecha_date,
     )
@@ -65,7 +65,7 @@ def refrescar(autoridad_clave):
     if autoridad.directorio_listas_de_acuerdos is None or autoridad.directorio_listas_de_acuerdos == "":
         click.echo(f"La autoridad {autoridad_clave} no tiene directorio para listas de acuerdos")
         return
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.listas_de_acuerdos.tasks.refrescar",
         autoridad_id=autoridad.id,
         usuario_id=None,
@@ -85,7 +85,7 @@ def refrescar_todos():
             continue
         if autoridad.directorio_listas_de_acuerdos is None or autoridad.directorio_listas_de_acuerdos == "":
             continue
-        app.task_queue.enqueue(
+        app.task_queues.enqueue(
             "plataforma_web.blueprints.listas_de_acuerdos.tasks.refrescar",
             autoridad_id=autoridad.id,
             usuario_id=None,
@@ -0,0 +1,81 @@
+"""
+Particiones
+
+- convertir: Cambiar las tablas de bitácoras y entradas y salidas por tablas particionadas por mes
+- crear: Crear las particiones del mes actual y de los siguientes
+- archivar: Exportar a CSV comprimido y desprender las particiones más antiguas
+"""
+from datetime import date
+import os
+
+import click
+
+from lib import partitions
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+app = create_app()
+db.app = app
+
+
+@click.group()
+def cli():
+    """Particiones"""
+
+
+@click.command()
+def convertir():
+    """Cambiar las tablas de bitácoras y entradas y salidas por tablas particionadas por mes"""
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            click.echo("Las particiones sólo son para PostgreSQL.")
+            return
+        for tabla in partitions.TABLAS:
+            with db.engine.begin() as conexion:
+                if partitions.is_partitioned(conexion, tabla):
+                    click.echo(f"- {tabla} ya está particionada")
+                    continue
+                partitions.convert(conexion, tabla)
+                click.echo(f"- {tabla} convertida con {len(partitions.partitions(conexion, tabla))} particiones")
+
+
+@click.command()
+@click.option("--meses", default=partitions.MESES_ADELANTE, type=int, help="Meses futuros a crear")
+def crear(meses):
+    """Crear las particiones del mes actual y de los siguientes"""
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            click.echo("Las particiones sólo son para PostgreSQL.")
+            return
+        for tabla in partitions.TABLAS:
+            with db.engine.begin() as conexion:
+                if not partitions.is_partitioned(conexion, tabla):
+                    click.echo(f"AVISO: {tabla} no está particionada, ejecute primero convertir")
+                    continue
+                cantidad = partitions.create_future_partitions(conexion, tabla, meses)
+                click.echo(f"- {tabla}: revisadas {cantidad} particiones")
+
+
+@click.command()
+@click.option("--conservar", default=12, type=int, help="Meses que se conservan en la base de datos")
+@click.option("--directorio", default=".", type=click.Path(exists=True, file_okay=False, writable=True), help="Directorio para los archivos")
+@click.option("--desprender", is_flag=True, help="Sólo desprender, sin eliminar las particiones exportadas")
+def archivar(conservar, directorio, desprender):
+    """Exportar a CSV comprimido y desprender las particiones más antiguas"""
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            click.echo("Las particiones sólo son para PostgreSQL.")
+            return
+        limite = partitions.month_start(date.today(), -conservar)
+        for tabla in partitions.TABLAS:
+            with db.engine.connect() as conexion:
+                meses = [mes for mes in partitions.partitions(conexion, tabla) if mes < limite]
+            for mes in meses:
+                with db.engine.begin() as conexion:
+                    ruta = partitions.archive(conexion, tabla, mes, directorio, eliminar=not desprender)
+                click.echo(f"- {partitions.partition_name(tabla, mes)} exportada a {os.path.abspath(ruta)}")
+
+
+cli.add_command(convertir)
+cli.add_command(crear)
+cli.add_command(archivar)
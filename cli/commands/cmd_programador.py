@@ -0,0 +1,81 @@
+"""
+Programador
+
+- arrancar: Arrancar el programador que lanza las tareas según sus programas
+- ejecutar: Lanzar ahora las tareas de un programa
+- historial: Mostrar el historial de un programa
+- listar: Mostrar los programas con su siguiente ejecución
+"""
+from datetime import datetime
+import time
+import click
+
+from lib.scheduler import Scheduler
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+app = create_app()
+db.app = app
+
+INTERVALO_SEGUNDOS = 30
+
+
+@click.group()
+def cli():
+    """Programador"""
+
+
+@click.command()
+def arrancar():
+    """Arrancar el programador que lanza las tareas según sus programas"""
+    programador = Scheduler(app.task_queues, app.redis)
+    click.echo(f"Programador {programador.identidad} arrancado con {len(programador.programas)} programas.")
+    while True:
+        with app.app_context():
+            for nombre in programador.tick():
+                click.echo(f"- {datetime.now().strftime('%Y-%m-%d %H:%M')} Lanzado {nombre}")
+            db.session.remove()
+        time.sleep(INTERVALO_SEGUNDOS)
+
+
+@click.command()
+@click.argument("nombre", type=str)
+def ejecutar(nombre):
+    """Lanzar ahora las tareas de un programa"""
+    programador = Scheduler(app.task_queues, app.redis)
+    if nombre not in programador.programas:
+        click.echo(f"AVISO: No existe el programa {nombre}")
+        return
+    with app.app_context():
+        cantidad = programador.launch(programador.programas[nombre], datetime.now())
+    if cantidad is None:
+        click.echo(f"AVISO: {nombre} tiene tareas sin terminar, se omitió.")
+        return
+    click.echo(f"Se lanzaron {cantidad} tareas de {nombre}.")
+
+
+@click.command()
+@click.argument("nombre", type=str)
+def historial(nombre):
+    """Mostrar el historial de un programa"""
+    programador = Scheduler(app.task_queues, app.redis)
+    if nombre not in programador.programas:
+        click.echo(f"AVISO: No existe el programa {nombre}")
+        return
+    for renglon in programador.history(programador.programas[nombre]):
+        click.echo(f"- {renglon['programado']} lanzado {renglon['lanzado']} {renglon['resultado']} {renglon['cantidad']}")
+
+
+@click.command()
+def listar():
+    """Mostrar los programas con su siguiente ejecución"""
+    programador = Scheduler(app.task_queues, app.redis)
+    for programa in programador.programas.values():
+        siguiente = programador.next_run(programa)
+        click.echo(f"- {programa.nombre} [{programa.cron.expresion}] siguiente {siguiente.strftime('%Y-%m-%d %H:%M')}")
+
+
+cli.add_command(arrancar)
+cli.add_command(ejecutar)
+cli.add_command(historial)
+cli.add_command(listar)
@@ -28,7 +28,7 @@ def elaborar():
         return
     cantidad = 0
     for rep_grafica in rep_graficas:
-        app.task_queue.enqueue(
+        app.task_queues.enqueue(
             "plataforma_web.blueprints.rep_graficas.tasks.elaborar",
             rep_grafica_id=rep_grafica.id,
         )
@@ -28,7 +28,7 @@ def cli():
 @click.command()
 def enviar_reporte():
     """Enviar via correo electronico el reporte de sentencias"""
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.sentencias.tasks.enviar_reporte",
     )
     click.echo("Enviar reporte de sentencias se está ejecutando en el fondo.")
@@ -54,7 +54,7 @@ def refrescar(autoridad_clave):
     if autoridad.directorio_sentencias is None or autoridad.directorio_sentencias == "":
         click.echo(f"La autoridad {autoridad_clave} no tiene directorio para listas de acuerdos")
         return
-    app.task_queue.enqueue(
+    app.task_queues.enqueue(
         "plataforma_web.blueprints.sentencias.tasks.refrescar",
         autoridad_id=autoridad.id,
         usuario_id=None,
@@ -74,7 +74,7 @@ def refrescar_todos():
             continue
         if autoridad.directorio_sentencias is None or autoridad.directorio_sentencias == "":
             continue
-        app.task_queue.enqueue(
+        app.task_queues.enqueue(
             "plataforma_web.blueprints.sentencias.tasks.refrescar",
             autoridad_id=autoridad.id,
             usuario_id=None,
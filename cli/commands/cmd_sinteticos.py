@@ -0,0 +1,73 @@
+"""
+Datos sintéticos
+
+- generar: Generar autoridades con años de registros y el árbol de archivos del depósito para pruebas de carga
+"""
+from datetime import datetime
+import os
+import time
+
+import click
+
+from lib.synthetic import VOLUMENES, generate
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+app = create_app()
+db.app = app
+
+entorno_implementacion = os.environ.get("DEPLOYMENT_ENVIRONMENT", "develop").upper()
+
+
+@click.group()
+def cli():
+    """Datos sintéticos"""
+
+
+@click.command()
+@click.option("--autoridades", default=800, help="Cantidad de autoridades")
+@click.option("--anos", default=3, help="Años de registros hacia atrás")
+@click.option("--semilla", default=20240101, help="Semilla, la misma con la misma fecha de referencia genera los mismos datos")
+@click.option("--directorio", default=None, help="Directorio donde escribir el árbol de archivos del depósito")
+@click.option("--archivos", default=10, help="Autoridades, las primeras, que tendrán archivos en el directorio")
+@click.option("--acuerdos-por-lista", default=VOLUMENES["acuerdos_por_lista"], help="Acuerdos de cada lista")
+@click.option("--hoy", default="", type=str, help="Fecha de referencia AAAA-MM-DD, por defecto la de hoy")
+def generar(autoridades, anos, semilla, directorio, archivos, acuerdos_por_lista, hoy):
+    """Generar autoridades con años de registros y el árbol de archivos del depósito para pruebas de carga"""
+    if entorno_implementacion == "PRODUCTION":
+        click.echo("PROHIBIDO: No se generan datos sintéticos porque este es el servidor de producción.")
+        return
+    if hoy != "":
+        try:
+            hoy_fecha = datetime.strptime(hoy, "%Y-%m-%d").date()
+        except ValueError as mensaje:
+            click.echo(f"AVISO: Fecha de referencia es incorrecta: {mensaje}")
+            return
+    else:
+        hoy_fecha = None
+    with app.app_context():
+        deposito = app.config["CLOUD_STORAGE_DEPOSITO"]
+        inicio = time.perf_counter()
+        with db.engine.begin() as conexion:
+            contadores, _ = generate(
+                conexion,
+                autoridades=autoridades,
+                anos=anos,
+                semilla=semilla,
+                deposito=deposito,
+                raiz=directorio,
+                archivos=archivos,
+                volumenes={"acuerdos_por_lista": acuerdos_por_lista},
+                hoy=hoy_fecha,
+                avisar=lambda mensaje: click.echo(f"  {mensaje}"),
+            )
+        segundos = time.perf_counter() - inicio
+    for tabla, cantidad in contadores.items():
+        click.echo(f"- {tabla}: {cantidad} renglones")
+    total = sum(contadores.values())
+    click.echo(f"Termina generar: {total} renglones en {segundos:.0f} segundos, {total / segundos * 60:.0f} por minuto.")
+    if directorio is not None:
+        click.echo(f"Suba {directorio} al depósito {deposito} para que las tareas refrescar encuentren los archivos.")
+
+
+cli.add_command(generar)
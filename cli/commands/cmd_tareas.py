@@ -1,10 +1,15 @@
 """
 Tareas
 
+- colas: Mostrar la profundidad y tiempos de espera de las colas
+- reconciliar: Terminar las tareas que ya no están en espera ni en proceso en RQ
 - terminar: Terminar todas las tareas
+- trabajar: Arrancar el worker que consume las colas en orden de prioridad
 """
 import click
+from rq import Worker
 
+from lib.tasks import reconcile_tasks
 from plataforma_web.app import create_app
 from plataforma_web.extensions import db
 
@@ -19,15 +24,43 @@ def cli():
     """ Tareas """
 
 
+@click.command()
+def colas():
+    """ Mostrar la profundidad y tiempos de espera de las colas """
+    for estadistica in app.task_queues.stats():
+        click.echo(
+            f"- {estadistica['nombre']}: {estadistica['en_espera']} en espera, {estadistica['en_proceso']} en proceso, {estadistica['fallidas']} fallidas, "
+            f"espera máxima {estadistica['espera_maxima']} s, espera promedio {estadistica['espera_promedio']} s"
+        )
+
+
+@click.command()
+def reconciliar():
+    """ Terminar las tareas que ya no están en espera ni en proceso en RQ """
+    with app.app_context():
+        contador = reconcile_tasks(app.task_queues)
+    click.echo(f"Se han cambiado {contador} tareas huérfanas como terminadas.")
+
+
 @click.command()
 def terminar():
     """ Terminar todas las tareas """
-    contador = 0
-    for tarea in Tarea.query.filter(Tarea.ha_terminado is False).all():
-        tarea.ha_terminado = True
-        tarea.save()
-        contador += 1
+    with app.app_context():
+        contador = Tarea.query.filter(Tarea.ha_terminado == False).update({"ha_terminado": True}, synchronize_session=False)
+        db.session.commit()
     click.echo(f"Se han cambiado {contador} tareas como terminadas.")
 
 
+@click.command()
+@click.option("--burst", is_flag=True, default=False, help="Terminar cuando las colas estén vacías")
+def trabajar(burst):
+    """ Arrancar el worker que consume las colas en orden de prioridad """
+    colas_en_orden = app.task_queues.in_order()
+    click.echo("Consumiendo " + ", ".join([queue.name for queue in colas_en_orden]))
+    Worker(colas_en_orden, connection=app.redis).work(burst=burst, with_scheduler=True)
+
+
+cli.add_command(colas)
+cli.add_command(reconciliar)
 cli.add_command(terminar)
+cli.add_command(trabajar)
@@ -0,0 +1,42 @@
+"""
+Tesis y Jurisprudencias
+
+- rellenar: Agregar la columna, el disparador y el índice de búsqueda y llenar la búsqueda de las existentes
+"""
+import click
+
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.tesis_jurisprudencias.models import BUSQUEDA_DISPARADOR_SQL, BUSQUEDA_VECTOR_SQL, TesisJurisprudencia
+
+app = create_app()
+db.app = app
+
+
+@click.group()
+def cli():
+    """Tesis y Jurisprudencias"""
+
+
+@click.command()
+@click.option("--lote", default=1000, type=int, help="Cantidad de renglones por actualización")
+def rellenar(lote):
+    """Agregar la columna, el disparador y el índice de búsqueda y llenar la búsqueda de las existentes"""
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            click.echo("La búsqueda de texto completo sólo se rellena en PostgreSQL.")
+            return
+        with db.engine.begin() as conexion:
+            conexion.execute(db.text("ALTER TABLE tesis_jurisprudencias ADD COLUMN IF NOT EXISTS busqueda tsvector"))
+            conexion.exec_driver_sql(BUSQUEDA_DISPARADOR_SQL)
+            conexion.execute(db.text("CREATE INDEX IF NOT EXISTS ix_tesis_jurisprudencias_busqueda ON tesis_jurisprudencias USING gin (busqueda)"))
+        maximo = db.session.query(db.func.max(TesisJurisprudencia.id)).scalar() or 0
+        actualizar = db.text(f"UPDATE tesis_jurisprudencias SET busqueda = {BUSQUEDA_VECTOR_SQL.format(fila='')} WHERE id > :desde AND id <= :hasta")
+        contador = 0
+        for desde in range(0, maximo, lote):
+            with db.engine.begin() as conexion:
+                contador += conexion.execute(actualizar, {"desde": desde, "hasta": desde + lote}).rowcount
+        click.echo(f"Se rellenó la búsqueda de {contador} tesis y jurisprudencias.")
+
+
+cli.add_command(rellenar)
@@ -0,0 +1,98 @@
+"""
+Tráfico
+
+- resumir: Latencias grabadas por endpoint de los archivos de tráfico
+- reproducir: Reproducir el tráfico grabado y entregar las latencias por endpoint
+"""
+import os
+
+import click
+
+from lib import traffic
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+from plataforma_web.blueprints.roles.models import Rol
+from plataforma_web.blueprints.usuarios.models import Usuario
+from plataforma_web.blueprints.usuarios_roles.models import UsuarioRol
+
+app = create_app()
+db.app = app
+
+entorno_implementacion = os.environ.get("DEPLOYMENT_ENVIRONMENT", "develop").upper()
+
+
+def users_by_class(clases: set, email: str = None):
+    """Id de un usuario activo por cada clase de usuario, con exactamente esos roles; si no hay, el del email"""
+    respaldo = Usuario.query.filter_by(email=email).first() if email else None
+    usuarios_ids = {}
+    for clase in clases:
+        if clase == traffic.ANONIMO:
+            continue
+        roles = clase.split("+")
+        candidatos = Usuario.query.join(UsuarioRol).join(Rol).filter(Rol.nombre == roles[0], UsuarioRol.estatus == "A", Usuario.estatus == "A").limit(100).all()
+        for usuario in candidatos:
+            if sorted(usuario_rol.rol.nombre for usuario_rol in usuario.usuarios_roles if usuario_rol.estatus == "A") == roles:
+                usuarios_ids[clase] = usuario.id
+                break
+        else:
+            if respaldo is not None:
+                usuarios_ids[clase] = respaldo.id
+    return usuarios_ids
+
+
+def echo_report(resumenes: list):
+    """Mostrar las latencias por endpoint"""
+    click.echo(f"{'Endpoint':48} {'Cantidad':>8} {'Omitidas':>8} {'Errores':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Máxima':>8}")
+    for resumen in resumenes:
+        click.echo(
+            f"{resumen['endpoint'][:48]:48} {resumen['cantidad']:>8} {resumen['omitidas']:>8} {resumen['errores']:>7} "
+            f"{resumen['p50']:>8} {resumen['p95']:>8} {resumen['p99']:>8} {resumen['maxima']:>8}"
+        )
+
+
+@click.group()
+def cli():
+    """Tráfico"""
+
+
+@click.command()
+@click.argument("rutas", nargs=-1, required=True, type=click.Path(exists=True))
+def resumir(rutas):
+    """Latencias grabadas por endpoint de los archivos de tráfico"""
+    entradas = traffic.read_entries(rutas)
+    echo_report(traffic.report([(entrada["e"] or entrada["p"], entrada["s"], entrada["d"]) for entrada in entradas]))
+    click.echo(f"{len(entradas)} peticiones grabadas.")
+
+
+@click.command()
+@click.argument("rutas", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--url", default=None, help="Servidor a donde enviar, como http://127.0.0.1:8000; sin ella se usa el cliente de pruebas")
+@click.option("--galleta", default=None, help="Galleta de una sesión iniciada en el servidor, como session=...")
+@click.option("--csrf", default=None, help="Token CSRF de esa sesión; sin él se toma de la página de inicio del servidor")
+@click.option("--usuario", default=None, help="Email del usuario para las clases sin un usuario con los mismos roles")
+@click.option("--hilos", default=4, help="Peticiones simultáneas máximas")
+@click.option("--velocidad", default=1.0, help="Veces más rápido que lo grabado, cero para enviar sin pausas")
+@click.option("--escrituras", is_flag=True, help="Reproducir también las que modifican, como nuevos y subidas")
+def reproducir(rutas, url, galleta, csrf, usuario, hilos, velocidad, escrituras):
+    """Reproducir el tráfico grabado y entregar las latencias por endpoint"""
+    if escrituras and entorno_implementacion == "PRODUCTION":
+        click.echo("PROHIBIDO: No se reproducen escrituras porque este es el servidor de producción.")
+        return
+    entradas = traffic.read_entries(rutas)
+    if not escrituras:
+        entradas = [entrada for entrada in entradas if traffic.is_read_only(entrada)]
+    click.echo(f"Reproduciendo {len(entradas)} peticiones con {hilos} hilos a velocidad {velocidad}...")
+    if url is not None:
+        enviar = traffic.HttpSender(url, galleta, csrf)
+    else:
+        app.config["TRAFICO_DIRECTORIO"] = ""  # No volver a grabar lo reproducido
+        app.config["WTF_CSRF_ENABLED"] = False
+        with app.app_context():
+            usuarios_ids = users_by_class({entrada["r"] for entrada in entradas}, usuario)
+        enviar = traffic.TestClientSender(app, usuarios_ids)
+    echo_report(traffic.report(traffic.replay(entradas, enviar, hilos, velocidad)))
+
+
+cli.add_command(resumir)
+cli.add_command(reproducir)
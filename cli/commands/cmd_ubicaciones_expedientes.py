@@ -10,6 +10,8 @@ from pathlib import Path
 import csv
 import click
 
+from lib.universal_mixin import bulk
+
 from plataforma_web.app import create_app
 from plataforma_web.extensions import db
 
@@ -43,7 +45,7 @@ def alimentar(entrada_csv):
         return
     click.echo("Alimentando ubicaciones de expedientes...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             # Validar ubicación
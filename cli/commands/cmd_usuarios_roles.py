@@ -9,6 +9,7 @@ import click
 
 from lib.pwgen import generar_contrasena
 from lib.safe_string import safe_string
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 from plataforma_web.extensions import db, pwd_context
@@ -44,7 +45,7 @@ def alimentar(entrada_csv):
         return
     click.echo("Alimentando usuarios...")
     contador = 0
-    with open(ruta, encoding="utf8") as puntero:
+    with open(ruta, encoding="utf8") as puntero, bulk():
         rows = csv.DictReader(puntero)
         for row in rows:
             # Tomar valores
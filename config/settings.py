@@ -18,6 +18,11 @@ CLOUD_SQL_CONNECTION_NAME = os.environ.get("CLOUD_SQL_CONNECTION_NAME", "none")
 # NUEVO Google Cloud SQL a Minerva con PostgreSQL
 SQLALCHEMY_DATABASE_URI = f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
 
+# Réplica de lectura, opcional, para las GET, los datatables y los reportes
+DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST", "")
+if DB_REPLICA_HOST != "":
+    SQLALCHEMY_BINDS = {"replica": f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}/{DB_NAME}"}
+
 # Always in False
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
@@ -28,6 +33,15 @@ SECRET_KEY = os.environ.get("SECRET_KEY", "Esta es una muy mala cadena aleatoria
 REDIS_URL = os.environ.get("REDIS_URL", "redis://")
 TASK_QUEUE = os.environ.get("TASK_QUEUE", "pjecz_plataforma_web")
 
+# Auditoría: "cola" para enviar las bitácoras a Redis y escribirlas por lotes, "transaccion" para guardarlas con la petición
+AUDITORIA_MODO = os.environ.get("AUDITORIA_MODO", "cola")
+
+# Peticiones que tarden más que esto se anotan en el registro con su consulta más lenta, cero para no anotarlas
+PETICION_LENTA_MILISEGUNDOS = int(os.environ.get("PETICION_LENTA_MILISEGUNDOS", "2000"))
+
+# Directorio donde anotar cada petición para reproducir el tráfico después, vacío para no anotar
+TRAFICO_DIRECTORIO = os.environ.get("TRAFICO_DIRECTORIO", "")
+
 # Google Cloud Storage
 CLOUD_STORAGE_DEPOSITO = os.environ.get("CLOUD_STORAGE_DEPOSITO", "pjecz-pruebas")
 
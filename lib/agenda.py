@@ -0,0 +1,158 @@
+"""
+Agenda de audiencias
+
+Las audiencias activas de una autoridad en un rango de fechas, para las vistas de semana y de mes.
+Se entregan por columnas, una lista por cada campo, sólo con los campos de la categoría de audiencias de la autoridad.
+Cada semana, de lunes a domingo en la hora local, se guarda en Redis por autoridad; las semanas que faltan se consultan
+juntas usando el índice parcial de (autoridad_id, tiempo) de las activas. Al confirmar cambios en audiencias
+se descartan las semanas de su tiempo anterior y nuevo.
+"""
+from datetime import date, datetime, time, timedelta
+import json
+
+from flask import current_app
+import redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from lib.time_utc import decombine_to_local, local_to_utc, utc_to_local_str
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.audiencias.models import Audiencia
+
+PREFIJO = "agenda"
+CACHE_SEGUNDOS = 60 * 60
+RANGO_LIMITE_DIAS = 42  # Seis semanas, lo que muestra una vista de mes
+
+COLUMNAS_COMUNES = ("id", "tiempo", "tipo_audiencia")
+COLUMNAS_POR_CATEGORIA = {
+    "CIVIL FAMILIAR MERCANTIL LETRADO TCYA": ("expediente", "actores", "demandados"),
+    "MATERIA ACUSATORIO PENAL ORAL": ("sala", "caracter", "causa_penal", "delitos"),
+    "DISTRITALES": ("toca", "expediente_origen", "imputados"),
+    "SALAS": ("toca", "expediente_origen", "delitos", "origen"),
+}
+
+
+def week_start(fecha: date):
+    """Lunes de la semana de la fecha"""
+    return fecha - timedelta(days=fecha.weekday())
+
+
+def cache_key(autoridad_id: int, lunes: date):
+    """Llave en Redis"""
+    return f"{PREFIJO}:{autoridad_id}:{lunes.isoformat()}"
+
+
+def columns(autoridad):
+    """Campos que se entregan según la categoría de audiencias de la autoridad"""
+    return COLUMNAS_COMUNES + COLUMNAS_POR_CATEGORIA.get(autoridad.audiencia_categoria, ())
+
+
+def utc_limit(fecha: date):
+    """Inicio del día local en UTC, como se guarda el tiempo de las audiencias"""
+    return local_to_utc(datetime.combine(fecha, time())).replace(tzinfo=None)
+
+
+def query_weeks(autoridad, desde: date, hasta: date):
+    """Consultar las semanas de los lunes desde hasta antes de hasta, entrega un diccionario lunes -> columnas"""
+    campos = columns(autoridad)
+    semanas = {}
+    lunes = desde
+    while lunes < hasta:
+        semanas[lunes] = {campo: [] for campo in campos}
+        lunes += timedelta(days=7)
+    consulta = (
+        db.select(*[getattr(Audiencia, campo) for campo in campos])
+        .where(Audiencia.autoridad_id == autoridad.id, Audiencia.estatus == "A")
+        .where(Audiencia.tiempo >= utc_limit(desde), Audiencia.tiempo < utc_limit(hasta))
+        .order_by(Audiencia.tiempo)
+    )
+    for renglon in db.session.execute(consulta):
+        tiempo = utc_to_local_str(renglon.tiempo)[:16]
+        semana = semanas[week_start(date.fromisoformat(tiempo[:10]))]
+        for campo, valor in zip(campos, renglon):
+            semana[campo].append(tiempo if campo == "tiempo" else valor)
+    return semanas
+
+
+def get_range(autoridad, desde: date, hasta: date):
+    """Audiencias activas de la autoridad desde la fecha y antes de hasta, por columnas"""
+    hasta = min(max(hasta, desde + timedelta(days=1)), desde + timedelta(days=RANGO_LIMITE_DIAS))
+    lunes_todos = []
+    lunes = week_start(desde)
+    while lunes < hasta:
+        lunes_todos.append(lunes)
+        lunes += timedelta(days=7)
+    llaves = [cache_key(autoridad.id, lunes) for lunes in lunes_todos]
+    try:
+        guardados = current_app.redis.mget(llaves)
+    except redis.exceptions.RedisError:
+        guardados = [None] * len(llaves)
+    semanas = {lunes: json.loads(guardado) for lunes, guardado in zip(lunes_todos, guardados) if guardado is not None}
+    faltantes = [lunes for lunes in lunes_todos if lunes not in semanas]
+    if faltantes:
+        consultadas = query_weeks(autoridad, faltantes[0], faltantes[-1] + timedelta(days=7))
+        try:
+            tubo = current_app.redis.pipeline(transaction=False)
+            for lunes in faltantes:
+                tubo.set(cache_key(autoridad.id, lunes), json.dumps(consultadas[lunes], separators=(",", ":")), ex=CACHE_SEGUNDOS)
+            tubo.execute()
+        except redis.exceptions.RedisError:
+            pass
+        semanas.update(consultadas)
+    # Juntar las semanas y quitar los días fuera del rango de la primera y la última
+    campos = columns(autoridad)
+    audiencias = {campo: [] for campo in campos}
+    desde_texto, hasta_texto = desde.isoformat(), hasta.isoformat()
+    for lunes in lunes_todos:
+        semana = semanas[lunes]
+        for indice, tiempo in enumerate(semana["tiempo"]):
+            if desde_texto <= tiempo[:10] < hasta_texto:
+                for campo in campos:
+                    audiencias[campo].append(semana[campo][indice])
+    return {
+        "autoridad_id": autoridad.id,
+        "desde": desde_texto,
+        "hasta": hasta_texto,
+        "cantidad": len(audiencias["id"]),
+        "columnas": list(campos),
+        "audiencias": audiencias,
+    }
+
+
+def changed_weeks(instancia):
+    """Autoridades y lunes del tiempo anterior y del nuevo de una audiencia cambiada"""
+    estado = inspect(instancia)
+    autoridades_ids = set(estado.attrs.autoridad_id.history.deleted) | {instancia.autoridad_id}
+    tiempos = set(estado.attrs.tiempo.history.deleted) | {instancia.tiempo}
+    return {
+        (autoridad_id, week_start(decombine_to_local(tiempo)[0]))
+        for autoridad_id in autoridades_ids
+        for tiempo in tiempos
+        if autoridad_id is not None and tiempo is not None
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def collect_changes(session, flush_context):
+    """Anotar en la sesión las semanas de las audiencias cambiadas"""
+    for instancia in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instancia, Audiencia):
+            session.info.setdefault(PREFIJO, set()).update(changed_weeks(instancia))
+
+
+@event.listens_for(Session, "after_commit")
+def discard_changes(session):
+    """Al confirmar, descartar las semanas guardadas"""
+    semanas = session.info.pop(PREFIJO, set())
+    if not semanas:
+        return
+    try:
+        current_app.redis.delete(*[cache_key(autoridad_id, lunes) for autoridad_id, lunes in semanas])
+    except redis.exceptions.RedisError:
+        pass  # Las semanas caducan solas en CACHE_SEGUNDOS
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changes(session):
+    """Al deshacer, olvidar las semanas anotadas"""
+    session.info.pop(PREFIJO, None)
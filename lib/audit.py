@@ -0,0 +1,179 @@
+"""
+Registro de auditoría
+
+Las bitácoras y las entradas y salidas ya no confirman su propia transacción. Su save() entrega el evento a este
+registro y confirma lo pendiente de la sesión, así el cambio auditado, guardado antes con save(commit=False), y la
+bitácora llevan una sola confirmación. Según AUDITORIA_MODO el evento va por uno de dos caminos:
+
+- cola: los eventos de la petición se juntan y al terminarla, aunque la vista falle, se agregan de una vez a un stream de Redis;
+  drain() los lee como grupo de consumidores y los escribe con un INSERT por tabla. Si Redis falla, se escriben en la base de datos.
+  Si el lote falla, se reintenta evento por evento y los que siguen fallando pasan al stream DESCARTADOS, así uno
+  malo, como uno sin partición para su mes, no detiene a los demás.
+- transaccion: el evento se agrega a la sesión y se confirma en la misma transacción que el cambio auditado;
+  con commit=False queda pendiente y, si al terminar la petición sigue así, se confirma entonces.
+
+Fuera de una petición, como en las tareas y la línea de comandos, los eventos de la cola se envían en el momento.
+"""
+from datetime import datetime, timezone
+import json
+import os
+import socket
+
+from flask import current_app, g, has_request_context
+import redis
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import RelationshipDirection
+from sqlalchemy.orm.attributes import set_committed_value
+
+from lib.universal_mixin import BULK
+from plataforma_web.extensions import db
+
+STREAM = "auditoria"
+GRUPO = "escritores"
+STREAM_LIMITE = 1000000  # Longitud aproximada máxima del stream
+DESCARTADOS = "auditoria_descartados"  # Eventos que no se pudieron escribir, con el error, para revisarlos a mano
+LOTE = 500
+RECLAMAR_MILISEGUNDOS = 60000  # Los eventos de un consumidor caído se reclaman después de este tiempo
+MODO_COLA = "cola"
+MODO_TRANSACCION = "transaccion"
+
+
+def event_values(instancia):
+    """Valores de las columnas del evento, las llaves foráneas se toman de las relaciones asignadas y creado es UTC"""
+    estado = inspect(instancia)
+    valores = {}
+    for relacion in estado.mapper.relationships:
+        if relacion.direction is RelationshipDirection.MANYTOONE and estado.dict.get(relacion.key) is not None:
+            relacionado = estado.dict[relacion.key]
+            for local, remota in relacion.local_remote_pairs:
+                valores[local.key] = getattr(relacionado, remota.key)
+            # Quitarlo de la colección del relacionado para que la sesión no intente guardarlo
+            setattr(instancia, relacion.key, None)
+            set_committed_value(instancia, relacion.key, relacionado)
+    for columna in estado.mapper.columns:
+        if columna.key in estado.dict and estado.dict[columna.key] is not None:
+            valores[columna.key] = estado.dict[columna.key]
+    # El evento se escribe después, así que se toma la hora ahora; con zona horaria para que la base de datos la
+    # convierta a la suya como hace con func.now() de server_default, sin depender de la zona del servidor web
+    valores.setdefault("creado", datetime.now(timezone.utc))
+    return valores
+
+
+def encode(tabla: str, valores: dict):
+    """Evento para el stream"""
+    return {"tabla": tabla, "valores": json.dumps(valores, default=lambda valor: valor.isoformat())}
+
+
+def decode(campos: dict):
+    """Tabla y valores de un evento del stream"""
+    valores = json.loads(campos[b"valores"])
+    if "creado" in valores:
+        valores["creado"] = datetime.fromisoformat(valores["creado"])
+    return campos[b"tabla"].decode(), valores
+
+
+def write_events(eventos: list):
+    """Escribir los eventos con un INSERT por tabla y confirmar"""
+    por_tabla = {}
+    for tabla, valores in eventos:
+        por_tabla.setdefault(tabla, []).append(valores)
+    for tabla, renglones in por_tabla.items():
+        db.session.execute(db.metadata.tables[tabla].insert(), renglones)
+    db.session.commit()
+
+
+def publish(eventos: list):
+    """Agregar los eventos al stream, si Redis falla se escriben en la base de datos"""
+    try:
+        tubo = current_app.redis.pipeline(transaction=False)
+        for tabla, valores in eventos:
+            tubo.xadd(STREAM, encode(tabla, valores), maxlen=STREAM_LIMITE, approximate=True)
+        tubo.execute()
+    except redis.exceptions.RedisError as error:
+        current_app.logger.warning("Sin Redis para la auditoría, se escribe en la base de datos: %s", error)
+        write_events(eventos)
+
+
+def record(instancia, commit: bool = True):
+    """Registrar el evento de auditoría de una bitácora o una entrada o salida y confirmar lo pendiente de la sesión"""
+    confirmar = commit and BULK not in db.session.info
+    if current_app.config.get("AUDITORIA_MODO", MODO_COLA) == MODO_TRANSACCION:
+        db.session.add(instancia)
+        if confirmar:
+            db.session.commit()
+        elif has_request_context():
+            g.auditoria_pendiente = True
+        return instancia
+    if instancia in db.session:
+        db.session.expunge(instancia)
+    evento = (instancia.__tablename__, event_values(instancia))
+    if confirmar:
+        db.session.commit()  # El cambio auditado; si falla, el evento no se registra
+    if has_request_context():
+        g.setdefault("auditoria", []).append(evento)
+    else:
+        publish([evento])
+    return instancia
+
+
+def drain(limite: int = LOTE, bloquear_milisegundos: int = None):
+    """Leer del stream como grupo de consumidores y escribir en la base de datos, entrega cuántos escribió"""
+    conexion = current_app.redis
+    try:
+        conexion.xgroup_create(STREAM, GRUPO, id="0", mkstream=True)
+    except redis.exceptions.ResponseError:
+        pass  # El grupo ya existe
+    consumidor = f"{socket.gethostname()}-{os.getpid()}"
+    # Redis 6.2 entrega dos elementos y Redis 7 tres, en ambos los mensajes reclamados son el segundo
+    mensajes = list(conexion.xautoclaim(STREAM, GRUPO, consumidor, RECLAMAR_MILISEGUNDOS, count=limite)[1])
+    if len(mensajes) < limite:
+        for _, leidos in conexion.xreadgroup(GRUPO, consumidor, {STREAM: ">"}, count=limite - len(mensajes), block=bloquear_milisegundos) or []:
+            mensajes.extend(leidos)
+    mensajes = [(mensaje_id, campos) for mensaje_id, campos in mensajes if campos]
+    if not mensajes:
+        return 0
+    escritos = len(mensajes)
+    try:
+        write_events([decode(campos) for _, campos in mensajes])
+    except (SQLAlchemyError, KeyError, ValueError) as error:
+        db.session.rollback()
+        current_app.logger.warning("Falló el lote de %d eventos de auditoría, se escriben uno por uno: %s", len(mensajes), error)
+        escritos = 0
+        for mensaje_id, campos in mensajes:
+            try:
+                write_events([decode(campos)])
+                escritos += 1
+            except (SQLAlchemyError, KeyError, ValueError) as error_evento:
+                db.session.rollback()
+                current_app.logger.error("Evento de auditoría %s descartado a %s: %s", mensaje_id.decode(), DESCARTADOS, error_evento)
+                conexion.xadd(DESCARTADOS, {**campos, b"error": str(error_evento)[:1000]}, maxlen=STREAM_LIMITE, approximate=True)
+    ids = [mensaje_id for mensaje_id, _ in mensajes]
+    conexion.xack(STREAM, GRUPO, *ids)
+    conexion.xdel(STREAM, *ids)
+    return escritos
+
+
+def init_app(app):
+    """Al terminar cada petición, confirmar los eventos pendientes y enviar los de la cola"""
+
+    @app.after_request
+    def commit_audit(response):
+        """Confirmar los eventos que quedaron pendientes en la sesión"""
+        if g.pop("auditoria_pendiente", False) and db.session.new:
+            db.session.commit()
+        return response
+
+    @app.teardown_request
+    def flush_audit(error=None):
+        """Enviar los eventos juntados en la petición, aunque la vista haya fallado después de confirmar sus cambios"""
+        eventos = g.pop("auditoria", None)
+        if not eventos:
+            return
+        if error is not None:
+            db.session.rollback()  # Lo que la vista dejó sin confirmar, por si Redis falla y se escriben aquí
+        try:
+            publish(eventos)
+        except SQLAlchemyError as error_escribir:
+            db.session.rollback()
+            current_app.logger.error("Se perdieron %d eventos de auditoría: %s", len(eventos), error_escribir)
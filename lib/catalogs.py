@@ -0,0 +1,218 @@
+"""
+Catálogos
+
+Distritos, autoridades, materias, tipos de juicios, módulos y épocas cambian pocas veces al año,
+pero los buscadores y los listados los consultan en cada página. Cada proceso guarda una foto inmutable
+de cada catálogo y la conserva mientras su versión en Redis no cambie. Al confirmar (commit) una sesión
+que agregó, modificó o borró registros de un catálogo, se incrementa su versión y los demás procesos
+vuelven a cargarlo en su siguiente uso.
+"""
+from collections import namedtuple
+import time
+
+from flask import abort, current_app
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.autoridades.models import Autoridad
+from plataforma_web.blueprints.distritos.models import Distrito
+from plataforma_web.blueprints.epocas.models import Epoca
+from plataforma_web.blueprints.materias.models import Materia
+from plataforma_web.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
+from plataforma_web.blueprints.modulos.models import Modulo
+
+PREFIJO = "catalogos"
+VERIFICAR_SEGUNDOS = 5  # Tiempo entre consultas de las versiones en Redis
+SIN_REDIS_SEGUNDOS = 60  # Sin Redis, tiempo máximo que se conserva una foto
+
+MODELOS = {
+    "autoridades": Autoridad,
+    "distritos": Distrito,
+    "epocas": Epoca,
+    "materias": Materia,
+    "materias_tipos_juicios": MateriaTipoJuicio,
+    "modulos": Modulo,
+}
+
+
+class CatalogCache:
+    """Fotos inmutables de los catálogos en este proceso"""
+
+    def __init__(self):
+        self.tipos = {nombre: namedtuple(modelo.__name__, [columna.key for columna in modelo.__table__.columns]) for nombre, modelo in MODELOS.items()}
+        self.fotos = {}  # nombre -> (versión, tiempo de carga, diccionario id -> registro)
+        self.indices = {}  # (nombre, columna) -> (diccionario id -> registro, diccionario valor -> registro)
+        self.versiones = {}  # nombre -> versión en Redis
+        self.verificado = 0
+
+    def refresh_versions(self):
+        """Consultar las versiones en Redis, a lo más una vez cada VERIFICAR_SEGUNDOS"""
+        ahora = time.monotonic()
+        if ahora - self.verificado < VERIFICAR_SEGUNDOS:
+            return True
+        nombres = list(MODELOS)
+        try:
+            valores = current_app.redis.mget([f"{PREFIJO}:{nombre}:version" for nombre in nombres])
+        except redis.exceptions.RedisError:
+            return False
+        self.versiones = {nombre: int(valor) if valor is not None else 0 for nombre, valor in zip(nombres, valores)}
+        self.verificado = ahora
+        return True
+
+    def load(self, nombre: str):
+        """Cargar el catálogo completo, activos e inactivos, en orden de id"""
+        modelo = MODELOS[nombre]
+        tipo = self.tipos[nombre]
+        renglones = db.session.query(*modelo.__table__.columns).order_by(modelo.id).all()
+        return {renglon.id: tipo(*renglon) for renglon in renglones}
+
+    def get(self, nombre: str):
+        """Diccionario id -> registro del catálogo"""
+        con_redis = self.refresh_versions()
+        version = self.versiones.get(nombre, 0)
+        foto = self.fotos.get(nombre)
+        if foto is not None:
+            foto_version, cargado, registros = foto
+            if con_redis and foto_version == version:
+                return registros
+            if not con_redis and time.monotonic() - cargado < SIN_REDIS_SEGUNDOS:
+                return registros
+        registros = self.load(nombre)
+        self.fotos[nombre] = (version, time.monotonic(), registros)
+        return registros
+
+    def index(self, nombre: str, columna: str):
+        """Diccionario valor de la columna -> registro, se rehace sólo cuando cambia la foto"""
+        registros = self.get(nombre)
+        indice = self.indices.get((nombre, columna))
+        if indice is None or indice[0] is not registros:
+            indice = (registros, {getattr(registro, columna): registro for registro in registros.values()})
+            self.indices[(nombre, columna)] = indice
+        return indice[1]
+
+    def clear(self):
+        """Descartar las fotos de este proceso"""
+        self.fotos = {}
+        self.indices = {}
+        self.verificado = 0
+
+
+catalogos = CatalogCache()
+
+
+def bump_catalog(nombre: str):
+    """Incrementar la versión del catálogo para que todos los procesos lo vuelvan a cargar"""
+    try:
+        current_app.redis.incr(f"{PREFIJO}:{nombre}:version")
+    except redis.exceptions.RedisError:
+        pass  # Las fotos caducan solas en SIN_REDIS_SEGUNDOS
+    catalogos.fotos.pop(nombre, None)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_changes(session, flush_context):
+    """Anotar en la sesión los catálogos con registros agregados, modificados o borrados"""
+    for instancia in list(session.new) + list(session.dirty) + list(session.deleted):
+        for nombre, modelo in MODELOS.items():
+            if isinstance(instancia, modelo):
+                session.info.setdefault(PREFIJO, set()).add(nombre)
+
+
+@event.listens_for(Session, "after_commit")
+def bump_changes(session):
+    """Al confirmar, incrementar las versiones de los catálogos modificados"""
+    for nombre in session.info.pop(PREFIJO, set()):
+        bump_catalog(nombre)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_changes(session):
+    """Al deshacer, olvidar los catálogos anotados"""
+    session.info.pop(PREFIJO, None)
+
+
+def get_or_404(nombre: str, registro_id: int):
+    """Registro del catálogo o error 404"""
+    registro = catalogos.get(nombre).get(registro_id)
+    if registro is None:
+        abort(404)
+    return registro
+
+
+def get_autoridad(autoridad_id):
+    """Autoridad por su id, o None"""
+    try:
+        return catalogos.get("autoridades").get(int(autoridad_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_distrito(distrito_id):
+    """Distrito por su id, o None"""
+    try:
+        return catalogos.get("distritos").get(int(distrito_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_modulo(nombre: str):
+    """Módulo activo por su nombre, o None"""
+    modulo = catalogos.index("modulos", "nombre").get(nombre.upper())
+    if modulo is None or modulo.estatus != "A":
+        return None
+    return modulo
+
+
+def modulo_id(nombre: str):
+    """Id del módulo activo por su nombre, o None"""
+    modulo = get_modulo(nombre)
+    return modulo.id if modulo is not None else None
+
+
+def distritos_judiciales():
+    """Distritos judiciales activos ordenados por nombre"""
+    distritos = [distrito for distrito in catalogos.get("distritos").values() if distrito.estatus == "A" and distrito.es_distrito_judicial]
+    return sorted(distritos, key=lambda distrito: distrito.nombre)
+
+
+def autoridades_jurisdiccionales(distrito_id: int = None, con_notarias: bool = False):
+    """Autoridades jurisdiccionales activas ordenadas por clave, opcionalmente de un distrito"""
+    autoridades = []
+    for autoridad in catalogos.get("autoridades").values():
+        if autoridad.estatus != "A" or not autoridad.es_jurisdiccional:
+            continue
+        if not con_notarias and autoridad.es_notaria:
+            continue
+        if distrito_id is not None and autoridad.distrito_id != distrito_id:
+            continue
+        autoridades.append(autoridad)
+    return sorted(autoridades, key=lambda autoridad: autoridad.clave)
+
+
+def autoridades_por_organos(organos_jurisdiccionales):
+    """Autoridades activas de los órganos jurisdiccionales dados ordenadas por clave"""
+    autoridades = [autoridad for autoridad in catalogos.get("autoridades").values() if autoridad.estatus == "A" and autoridad.organo_jurisdiccional in organos_jurisdiccionales]
+    return sorted(autoridades, key=lambda autoridad: autoridad.clave)
+
+
+def materias():
+    """Materias activas en orden de id"""
+    return [materia for materia in catalogos.get("materias").values() if materia.estatus == "A"]
+
+
+def materias_tipos_juicios():
+    """Tipos de juicios activos ordenados por materia y descripción"""
+    tipos_juicios = [tipo_juicio for tipo_juicio in catalogos.get("materias_tipos_juicios").values() if tipo_juicio.estatus == "A"]
+    return sorted(tipos_juicios, key=lambda tipo_juicio: (tipo_juicio.materia_id, tipo_juicio.descripcion))
+
+
+def epocas():
+    """Épocas activas ordenadas por nombre"""
+    return sorted([epoca for epoca in catalogos.get("epocas").values() if epoca.estatus == "A"], key=lambda epoca: epoca.nombre)
+
+
+def modulos():
+    """Módulos activos en orden de id"""
+    return [modulo for modulo in catalogos.get("modulos").values() if modulo.estatus == "A"]
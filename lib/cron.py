@@ -0,0 +1,85 @@
+"""
+Cron
+
+Interpreta expresiones con los cinco campos de cron: minuto, hora, día del mes, mes y día de la semana.
+Acepta *, listas con comas, rangos con guión y pasos con diagonal, como "*/15 1-5 * * 1,3,5".
+El día de la semana va de 0 (domingo) a 6 (sábado).
+"""
+from datetime import datetime, timedelta
+
+CAMPOS = (
+    ("minuto", 0, 59),
+    ("hora", 0, 23),
+    ("dia", 1, 31),
+    ("mes", 1, 12),
+    ("dia_semana", 0, 6),
+)
+LIMITE_DIAS = 366 * 5
+
+
+def parse_field(texto: str, minimo: int, maximo: int):
+    """Convertir un campo en el conjunto de valores que acepta"""
+    valores = set()
+    for parte in texto.split(","):
+        paso = 1
+        if "/" in parte:
+            parte, paso_str = parte.split("/", 1)
+            paso = int(paso_str)
+            if paso <= 0:
+                raise ValueError(f"Paso incorrecto en {texto}")
+        if parte == "*":
+            inicio, termino = minimo, maximo
+        elif "-" in parte:
+            inicio_str, termino_str = parte.split("-", 1)
+            inicio, termino = int(inicio_str), int(termino_str)
+        else:
+            inicio = int(parte)
+            termino = maximo if paso > 1 else inicio
+        if inicio < minimo or termino > maximo or inicio > termino:
+            raise ValueError(f"Fuera de rango {texto}")
+        valores.update(range(inicio, termino + 1, paso))
+    return valores
+
+
+class Cron:
+    """Expresión cron"""
+
+    def __init__(self, expresion: str):
+        campos = expresion.split()
+        if len(campos) != len(CAMPOS):
+            raise ValueError(f"La expresión cron debe tener {len(CAMPOS)} campos: {expresion}")
+        self.expresion = expresion
+        self.minutos, self.horas, self.dias, self.meses, self.dias_semana = [parse_field(texto, minimo, maximo) for texto, (_, minimo, maximo) in zip(campos, CAMPOS)]
+        self.dia_es_libre = campos[2] == "*"
+        self.dia_semana_es_libre = campos[4] == "*"
+
+    def matches_day(self, fecha: datetime):
+        """¿El día cumple? Como en cron, si se restringen ambos días basta con que cumpla uno"""
+        if fecha.month not in self.meses:
+            return False
+        cumple_dia = fecha.day in self.dias
+        cumple_dia_semana = (fecha.weekday() + 1) % 7 in self.dias_semana
+        if self.dia_es_libre:
+            return cumple_dia_semana
+        if self.dia_semana_es_libre:
+            return cumple_dia
+        return cumple_dia or cumple_dia_semana
+
+    def next_after(self, tiempo: datetime):
+        """Siguiente tiempo, estrictamente posterior, en que se cumple la expresión"""
+        tiempo = tiempo.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(LIMITE_DIAS):
+            if self.matches_day(tiempo):
+                for hora in sorted(self.horas):
+                    if hora < tiempo.hour:
+                        continue
+                    for minuto in sorted(self.minutos):
+                        if hora == tiempo.hour and minuto < tiempo.minute:
+                            continue
+                        return tiempo.replace(hour=hora, minute=minuto)
+            tiempo = (tiempo + timedelta(days=1)).replace(hour=0, minute=0)
+        raise ValueError(f"La expresión cron no se cumple en {LIMITE_DIAS} días: {self.expresion}")
+
+    def __repr__(self):
+        """Representación"""
+        return f"<Cron {self.expresion}>"
@@ -0,0 +1,154 @@
+"""
+Tablero de la página de inicio
+
+Las tarjetas de audiencias, edictos, listas de acuerdos y sentencias de una autoridad se obtienen
+con una sola consulta: un UNION ALL con los conteos y los últimos registros de cada una.
+El resultado se guarda en Redis por autoridad y se descarta al confirmar (commit) cambios
+en los registros de esa autoridad.
+"""
+from datetime import date, datetime, timedelta
+import json
+
+from flask import current_app
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.audiencias.models import Audiencia
+from plataforma_web.blueprints.edictos.models import Edicto
+from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
+from plataforma_web.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
+from plataforma_web.blueprints.sentencias.models import Sentencia
+
+PREFIJO = "inicio"
+CACHE_SEGUNDOS = 300
+BREVE_LIMITE_DIAS = 15
+TARJETAS_LIMITE_REGISTROS = 5
+
+MODELOS = (Audiencia, Edicto, ListaDeAcuerdo, Sentencia)
+
+
+def breve_desde():
+    """Inicio del periodo para los recién subidos, se calcula en cada petición"""
+    hoy = date.today()
+    return datetime(year=hoy.year, month=hoy.month, day=hoy.day) - timedelta(days=BREVE_LIMITE_DIAS)
+
+
+def cache_key(autoridad_id: int):
+    """Llave en Redis, incluye la fecha para que el periodo no se quede en el día anterior"""
+    return f"{PREFIJO}:{autoridad_id}:{date.today().isoformat()}"
+
+
+def card_selects(tarjeta: str, modelo, consulta, orden, tiempo, texto_1, texto_2, desde: datetime, consulta_listado=()):
+    """Consulta del conteo y consulta de los últimos registros de una tarjeta"""
+    conteo = db.select(
+        db.literal(tarjeta).label("tarjeta"),
+        db.literal("conteo").label("clase"),
+        db.literal(0).label("id"),
+        db.cast(db.null(), db.DateTime).label("tiempo"),
+        db.literal("").label("texto_1"),
+        db.literal("").label("texto_2"),
+        db.func.count(modelo.id).label("total"),
+        db.func.coalesce(db.func.sum(db.case((modelo.creado >= desde, 1), else_=0)), 0).label("recientes"),
+    ).where(*consulta)
+    ultimos = (
+        db.select(
+            db.literal(tarjeta).label("tarjeta"),
+            db.literal("listado").label("clase"),
+            modelo.id.label("id"),
+            db.type_coerce(tiempo, db.DateTime).label("tiempo"),
+            texto_1.label("texto_1"),
+            texto_2.label("texto_2"),
+            db.literal(0).label("total"),
+            db.literal(0).label("recientes"),
+        )
+        .where(*consulta, *consulta_listado)
+        .order_by(orden)
+        .limit(TARJETAS_LIMITE_REGISTROS)
+    )
+    if modelo is Sentencia:
+        ultimos = ultimos.join(MateriaTipoJuicio, Sentencia.materia_tipo_juicio_id == MateriaTipoJuicio.id)
+    # Los SELECT con ORDER BY y LIMIT deben ir en una subconsulta para entrar en el UNION ALL
+    ultimos = ultimos.subquery()
+    return [conteo, db.select(*ultimos.c)]
+
+
+def query_cards(autoridad, ahora: datetime, desde: datetime):
+    """Consultar todas las tarjetas de la autoridad en un solo viaje a la base de datos"""
+    selects = []
+    if autoridad.audiencia_categoria != "NO DEFINIDO":
+        consulta = (Audiencia.autoridad_id == autoridad.id, Audiencia.estatus == "A")
+        # El listado de audiencias son las próximas, no las recientes
+        selects += card_selects("audiencias", Audiencia, consulta, Audiencia.tiempo, Audiencia.tiempo, Audiencia.tipo_audiencia, db.literal(""), desde, (Audiencia.tiempo >= ahora,))
+    if autoridad.directorio_edictos != "":
+        consulta = (Edicto.autoridad_id == autoridad.id, Edicto.estatus == "A")
+        selects += card_selects("edictos", Edicto, consulta, Edicto.fecha.desc(), Edicto.fecha, Edicto.expediente, Edicto.descripcion, desde)
+    if autoridad.directorio_listas_de_acuerdos != "":
+        consulta = (ListaDeAcuerdo.autoridad_id == autoridad.id, ListaDeAcuerdo.estatus == "A")
+        selects += card_selects("listas_de_acuerdos", ListaDeAcuerdo, consulta, ListaDeAcuerdo.fecha.desc(), ListaDeAcuerdo.fecha, db.literal(""), db.literal(""), desde)
+    if autoridad.directorio_sentencias != "":
+        consulta = (Sentencia.autoridad_id == autoridad.id, Sentencia.estatus == "A")
+        selects += card_selects("sentencias", Sentencia, consulta, Sentencia.fecha.desc(), Sentencia.fecha, Sentencia.sentencia, MateriaTipoJuicio.descripcion, desde)
+    tarjetas = {}
+    if not selects:
+        return tarjetas
+    for renglon in db.session.execute(db.union_all(*selects)):
+        tarjeta = tarjetas.setdefault(renglon.tarjeta, {"total": 0, "recientes": 0, "listado": []})
+        if renglon.clase == "conteo":
+            tarjeta["total"] = renglon.total
+            tarjeta["recientes"] = renglon.recientes
+        else:
+            tarjeta["listado"].append({"id": renglon.id, "tiempo": renglon.tiempo.isoformat(), "texto_1": renglon.texto_1, "texto_2": renglon.texto_2})
+    # El orden de un UNION ALL no está garantizado
+    for nombre, tarjeta in tarjetas.items():
+        tarjeta["listado"].sort(key=lambda renglon: renglon["tiempo"], reverse=nombre != "audiencias")
+    return tarjetas
+
+
+def get_cards(autoridad):
+    """Tarjetas de la autoridad, desde Redis o desde la base de datos"""
+    ahora = datetime.now()
+    llave = cache_key(autoridad.id)
+    try:
+        guardado = current_app.redis.get(llave)
+    except redis.exceptions.RedisError:
+        guardado = None
+    if guardado is not None:
+        tarjetas = json.loads(guardado)
+    else:
+        tarjetas = query_cards(autoridad, ahora, breve_desde())
+        try:
+            current_app.redis.set(llave, json.dumps(tarjetas), ex=CACHE_SEGUNDOS)
+        except redis.exceptions.RedisError:
+            pass
+    # Las audiencias guardadas que ya pasaron se quitan
+    if "audiencias" in tarjetas:
+        tarjetas["audiencias"]["listado"] = [renglon for renglon in tarjetas["audiencias"]["listado"] if renglon["tiempo"] >= ahora.isoformat()]
+    return tarjetas
+
+
+@event.listens_for(Session, "after_flush")
+def collect_changes(session, flush_context):
+    """Anotar en la sesión las autoridades con audiencias, edictos, listas de acuerdos o sentencias cambiadas"""
+    for instancia in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instancia, MODELOS) and instancia.autoridad_id is not None:
+            session.info.setdefault(PREFIJO, set()).add(instancia.autoridad_id)
+
+
+@event.listens_for(Session, "after_commit")
+def discard_changes(session):
+    """Al confirmar, descartar las tarjetas guardadas de esas autoridades"""
+    autoridades_ids = session.info.pop(PREFIJO, set())
+    if not autoridades_ids:
+        return
+    try:
+        current_app.redis.delete(*[cache_key(autoridad_id) for autoridad_id in autoridades_ids])
+    except redis.exceptions.RedisError:
+        pass  # Las tarjetas caducan solas en CACHE_SEGUNDOS
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changes(session):
+    """Al deshacer, olvidar las autoridades anotadas"""
+    session.info.pop(PREFIJO, None)
@@ -17,6 +17,21 @@ def get_parameters():
     return draw, start, rows_per_page
 
 
+def get_cursor():
+    """Tomar el id del último renglón de la página anterior, para paginar por llave en lugar de OFFSET"""
+    try:
+        return int(request.form["despues_de"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def output_keyset(draw, start, rows_per_page, data):
+    """Entregar JSON sin contar la tabla, data trae un renglón de más cuando hay otra página"""
+    hay_mas = len(data) > rows_per_page
+    total = start + min(len(data), rows_per_page) + (1 if hay_mas else 0)
+    return output(draw, total, data[:rows_per_page])
+
+
 def output(draw, total, data):
     """Entregar JSON"""
     return {
@@ -0,0 +1,154 @@
+"""
+Índice de expedientes
+
+Las audiencias, edictos, glosas, acuerdos de las listas de acuerdos, sentencias y ubicaciones de expedientes se anotan
+en expedientes_registros con su autoridad y su expediente normalizado. Las anotaciones se actualizan después de cada
+flush en la misma transacción, así se confirman o se deshacen junto con los registros. Los acuerdos toman la autoridad,
+la fecha y el estatus de su lista de acuerdos, por eso al cambiar estos en una lista se vuelven a anotar sus acuerdos.
+Encontrar todo lo de un expediente es una sola consulta por el índice (autoridad_id, expediente).
+"""
+from collections import namedtuple
+from datetime import datetime
+
+from flask import url_for
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload
+
+from lib.safe_string import safe_expediente
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.audiencias.models import Audiencia
+from plataforma_web.blueprints.edictos.models import Edicto
+from plataforma_web.blueprints.expedientes_registros.models import ExpedienteRegistro
+from plataforma_web.blueprints.glosas.models import Glosa
+from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
+from plataforma_web.blueprints.listas_de_acuerdos_acuerdos.models import ListaDeAcuerdoAcuerdo
+from plataforma_web.blueprints.sentencias.models import Sentencia
+from plataforma_web.blueprints.ubicaciones_expedientes.models import UbicacionExpediente
+
+DESCRIPCION_LIMITE = 256
+
+# Módulo, modelo, vista de detalle y una función que entrega autoridad_id, fecha y descripción de un registro
+Fuente = namedtuple("Fuente", "modelo endpoint parametro referencia")
+FUENTES = {
+    "AUDIENCIAS": Fuente(Audiencia, "audiencias.detail", "audiencia_id", lambda r: (r.autoridad_id, r.tiempo.date(), r.tipo_audiencia)),
+    "EDICTOS": Fuente(Edicto, "edictos.detail", "edicto_id", lambda r: (r.autoridad_id, r.fecha, r.descripcion)),
+    "GLOSAS": Fuente(Glosa, "glosas.detail", "glosa_id", lambda r: (r.autoridad_id, r.fecha, r.descripcion)),
+    "LISTAS DE ACUERDOS ACUERDOS": Fuente(
+        ListaDeAcuerdoAcuerdo,
+        "listas_de_acuerdos_acuerdos.detail",
+        "lista_de_acuerdo_acuerdo_id",
+        lambda r: (r.lista_de_acuerdo.autoridad_id, r.lista_de_acuerdo.fecha, r.tipo_acuerdo),
+    ),
+    "SENTENCIAS": Fuente(Sentencia, "sentencias.detail", "sentencia_id", lambda r: (r.autoridad_id, r.fecha, f"Sentencia {r.sentencia} {r.descripcion}".strip())),
+    "UBICACIONES EXPEDIENTES": Fuente(
+        UbicacionExpediente,
+        "ubicaciones_expedientes.detail",
+        "ubicacion_expediente_id",
+        lambda r: (r.autoridad_id, (inspect(r).dict.get("modificado") or datetime.now()).date(), f"Ubicación {r.ubicacion}"),
+    ),
+}
+MODULOS = {fuente.modelo: modulo for modulo, fuente in FUENTES.items()}
+LISTA_CAMPOS = ("autoridad", "autoridad_id", "fecha", "estatus")  # Al cambiar alguno se vuelven a anotar sus acuerdos
+
+
+def normalize(expediente: str):
+    """Expediente normalizado, texto vacío si no es válido"""
+    try:
+        return safe_expediente(expediente)
+    except (IndexError, ValueError):
+        return ""
+
+
+def record(modulo: str, registro):
+    """Renglón para expedientes_registros, None si el registro no se anota"""
+    expediente = normalize(registro.expediente)
+    if expediente == "" or (inspect(registro).dict.get("estatus") or "A") != "A":
+        return None
+    if isinstance(registro, ListaDeAcuerdoAcuerdo) and registro.lista_de_acuerdo.estatus != "A":
+        return None
+    autoridad_id, fecha, descripcion = FUENTES[modulo].referencia(registro)
+    return {
+        "autoridad_id": autoridad_id,
+        "expediente": expediente,
+        "modulo": modulo,
+        "registro_id": registro.id,
+        "fecha": fecha,
+        "descripcion": descripcion[:DESCRIPCION_LIMITE],
+    }
+
+
+def replace_records(conexion, modulo: str, registros: list, borrados_ids: list = None):
+    """Cambiar las anotaciones de los registros de un módulo"""
+    tabla = ExpedienteRegistro.__table__
+    ids = [registro.id for registro in registros] + (borrados_ids or [])
+    conexion.execute(tabla.delete().where(tabla.c.modulo == modulo, tabla.c.registro_id.in_(ids)))
+    renglones = [renglon for renglon in (record(modulo, registro) for registro in registros) if renglon is not None]
+    if renglones:
+        conexion.execute(tabla.insert(), renglones)
+    return len(renglones)
+
+
+def lookup(autoridad_id: int, expediente: str, modulos: list = None):
+    """Registros de todos los módulos de un expediente de una autoridad, del más al menos reciente"""
+    expediente = normalize(expediente)
+    if expediente == "":
+        return []
+    consulta = ExpedienteRegistro.query.filter_by(autoridad_id=autoridad_id, expediente=expediente)
+    if modulos is not None:
+        consulta = consulta.filter(ExpedienteRegistro.modulo.in_(modulos))
+    return [
+        {
+            "modulo": registro.modulo,
+            "fecha": registro.fecha.strftime("%Y-%m-%d"),
+            "descripcion": registro.descripcion,
+            "url": url_for(FUENTES[registro.modulo].endpoint, **{FUENTES[registro.modulo].parametro: registro.registro_id}),
+        }
+        for registro in consulta.order_by(ExpedienteRegistro.fecha.desc(), ExpedienteRegistro.id.desc()).all()
+    ]
+
+
+def rebuild(modulo: str, lote: int = 1000):
+    """Volver a anotar todos los registros activos de un módulo, por lotes de ids"""
+    fuente = FUENTES[modulo]
+    tabla = ExpedienteRegistro.__table__
+    consulta = fuente.modelo.query.filter_by(estatus="A")
+    if fuente.modelo is ListaDeAcuerdoAcuerdo:
+        consulta = consulta.join(ListaDeAcuerdoAcuerdo.lista_de_acuerdo).filter(ListaDeAcuerdo.estatus == "A")
+        consulta = consulta.options(joinedload(ListaDeAcuerdoAcuerdo.lista_de_acuerdo))
+    db.session.execute(tabla.delete().where(tabla.c.modulo == modulo))
+    contador = 0
+    ultimo_id = 0
+    while True:
+        registros = consulta.filter(fuente.modelo.id > ultimo_id).order_by(fuente.modelo.id).limit(lote).all()
+        if not registros:
+            break
+        contador += replace_records(db.session.connection(), modulo, registros)
+        ultimo_id = registros[-1].id
+        db.session.commit()
+        db.session.expunge_all()
+    db.session.commit()
+    return contador
+
+
+@event.listens_for(Session, "after_flush")
+def update_records(session, flush_context):
+    """Actualizar las anotaciones de los registros nuevos, cambiados o borrados en el flush, y de los acuerdos de las listas cambiadas"""
+    cambios = {}
+    for registro in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(registro, ListaDeAcuerdo) and registro in session.dirty:
+            estado = inspect(registro)
+            if any(estado.attrs[campo].history.has_changes() for campo in LISTA_CAMPOS):
+                cambios.setdefault(MODULOS[ListaDeAcuerdoAcuerdo], ([], []))
+                cambios[MODULOS[ListaDeAcuerdoAcuerdo]][0].extend(acuerdo for acuerdo in registro.listas_de_acuerdos_acuerdos if acuerdo not in session.deleted)
+            continue
+        modulo = MODULOS.get(type(registro))
+        if modulo is None or (registro in session.dirty and not session.is_modified(registro)):
+            continue
+        cambios.setdefault(modulo, ([], []))
+        if registro in session.deleted:
+            cambios[modulo][1].append(registro.id)
+        else:
+            cambios[modulo][0].append(registro)
+    for modulo, (registros, borrados_ids) in cambios.items():
+        # Un acuerdo cambiado de una lista cambiada llega dos veces
+        replace_records(session.connection(), modulo, list({registro.id: registro for registro in registros}.values()), borrados_ids)
@@ -0,0 +1,52 @@
+"""
+Búsqueda de texto completo
+
+En PostgreSQL usa la columna tsvector con websearch_to_tsquery, así los usuarios pueden buscar "frases entre comillas",
+palabras sueltas y -excluidas. Los fragmentos se elaboran con ts_headline sólo para los renglones de la página.
+En otras bases de datos, como SQLite en desarrollo, se busca con LIKE sobre las columnas de texto sin ordenar por relevancia.
+"""
+from markupsafe import Markup, escape
+
+from plataforma_web.extensions import db
+
+CONFIGURACION = "spanish"
+FRAGMENTOS_OPCIONES = "MaxFragments=2, MinWords=8, MaxWords=24, FragmentDelimiter=' … ', StartSel=[[[, StopSel=]]]"
+
+
+def is_postgresql():
+    """¿La base de datos es PostgreSQL?"""
+    return db.engine.dialect.name == "postgresql"
+
+
+def tsquery(frase: str):
+    """Consulta de texto completo a partir de lo que escribió el usuario"""
+    return db.func.websearch_to_tsquery(CONFIGURACION, frase)
+
+
+def filter_match(consulta, vector, columnas, frase: str):
+    """Filtrar la consulta por la frase"""
+    if is_postgresql():
+        return consulta.filter(vector.op("@@")(tsquery(frase)))
+    patron = "%" + frase.replace('"', "").strip() + "%"
+    return consulta.filter(db.or_(*[columna.ilike(patron) for columna in columnas]))
+
+
+def order_by_rank(consulta, vector, frase: str):
+    """Ordenar por relevancia, de la más a la menos relevante"""
+    if is_postgresql():
+        return consulta.order_by(db.func.ts_rank_cd(vector, tsquery(frase)).desc())
+    return consulta
+
+
+def highlight(texto: str):
+    """Escapar el fragmento y cambiar las marcas de ts_headline por <mark>"""
+    return Markup(str(escape(texto)).replace("[[[", "<mark>").replace("]]]", "</mark>"))
+
+
+def headlines(modelo, columna, ids: list, frase: str):
+    """Diccionario id -> fragmento resaltado, sólo para los ids dados"""
+    if not ids or not is_postgresql():
+        return {}
+    fragmento = db.func.ts_headline(CONFIGURACION, columna, tsquery(frase), FRAGMENTOS_OPCIONES)
+    renglones = db.session.query(modelo.id, fragmento).filter(modelo.id.in_(ids)).all()
+    return {renglon_id: highlight(texto) for renglon_id, texto in renglones}
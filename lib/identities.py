@@ -0,0 +1,60 @@
+"""
+Identidades
+
+Carga del usuario de la sesión para Flask-Login. El usuario llega con su autoridad y distrito en la misma consulta;
+sus niveles de permiso por módulo se guardan en Redis por usuario y por versión de los permisos (la misma de los menús),
+así los can_view, can_edit, etc. de las plantillas no consultan roles ni permisos.
+Cuando no están en Redis, la consulta también trae sus roles y permisos.
+"""
+import json
+
+from flask import current_app
+import redis
+from sqlalchemy.orm import contains_eager, joinedload
+
+from lib import menus
+from plataforma_web.blueprints.autoridades.models import Autoridad
+from plataforma_web.blueprints.permisos.models import Permiso
+from plataforma_web.blueprints.roles.models import Rol
+from plataforma_web.blueprints.usuarios.models import Usuario
+from plataforma_web.blueprints.usuarios_roles.models import UsuarioRol
+
+PREFIJO = "identidades"
+CACHE_SEGUNDOS = 12 * 60 * 60  # Lo que dura una jornada en la sesión
+
+
+def identity_key(usuario_id: int):
+    """Llave en Redis"""
+    return f"{PREFIJO}:{usuario_id}:{menus.menu_version()}"
+
+
+def load_identity(usuario_id):
+    """Cargar el usuario de la sesión con una sola consulta"""
+    try:
+        usuario_id = int(usuario_id)
+    except (TypeError, ValueError):
+        return None
+    try:
+        llave = identity_key(usuario_id)
+        guardado = current_app.redis.get(llave)
+    except redis.exceptions.RedisError:
+        llave = guardado = None
+    consulta = Usuario.query.options(joinedload(Usuario.autoridad).joinedload(Autoridad.distrito)).filter(Usuario.id == usuario_id)
+    if guardado is not None:
+        usuario = consulta.first()
+        if usuario is not None:
+            usuario.permisos_niveles = {int(modulo_id): nivel for modulo_id, nivel in json.loads(guardado).items()}
+        return usuario
+    # Con sus roles y permisos; first() no sirve aquí porque el LIMIT cortaría los renglones de las colecciones
+    consulta = consulta.outerjoin(Usuario.usuarios_roles).outerjoin(UsuarioRol.rol).outerjoin(Rol.permisos)
+    consulta = consulta.options(contains_eager(Usuario.usuarios_roles).contains_eager(UsuarioRol.rol).contains_eager(Rol.permisos))
+    usuarios = consulta.order_by(UsuarioRol.id, Permiso.id).all()
+    if not usuarios:
+        return None
+    usuario = usuarios[0]
+    if llave is not None:
+        try:
+            current_app.redis.set(llave, json.dumps(usuario.get_permissions()), ex=CACHE_SEGUNDOS)
+        except redis.exceptions.RedisError:
+            pass
+    return usuario
@@ -0,0 +1,99 @@
+"""
+Asesor de índices
+
+Registro de los filtros de los datatables de los listados. Por cada combinación de filtros se arma la misma consulta
+que hace la vista, se obtiene su plan con EXPLAIN y se reportan las que recorren la tabla completa.
+"""
+from datetime import date, timedelta
+from itertools import combinations
+
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.audiencias.models import Audiencia
+from plataforma_web.blueprints.bitacoras.models import Bitacora
+from plataforma_web.blueprints.edictos.models import Edicto
+from plataforma_web.blueprints.glosas.models import Glosa
+from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
+from plataforma_web.blueprints.sentencias.models import Sentencia
+from plataforma_web.blueprints.ubicaciones_expedientes.models import UbicacionExpediente
+
+MUESTRA_DIAS = 30
+
+# Filtros que aplican los datatables, reciben el modelo y la muestra de valores
+FILTROS = {
+    "estatus": lambda modelo, muestra: modelo.estatus == "A",
+    "autoridad": lambda modelo, muestra: modelo.autoridad_id == muestra["autoridad_id"],
+    "fecha_desde": lambda modelo, muestra: modelo.fecha >= muestra["fecha_desde"],
+    "fecha_hasta": lambda modelo, muestra: modelo.fecha <= muestra["fecha_hasta"],
+    "expediente": lambda modelo, muestra: modelo.expediente == muestra["expediente"],
+}
+
+# Datatables: modelo, orden, filtros que siempre van y filtros opcionales
+DATATABLES = {
+    "audiencias": (Audiencia, Audiencia.tiempo.desc(), ["estatus"], ["autoridad"]),
+    "bitacoras": (Bitacora, Bitacora.creado.desc(), [], []),
+    "edictos": (Edicto, Edicto.fecha.desc(), ["estatus"], ["autoridad", "fecha_desde", "fecha_hasta", "expediente"]),
+    "glosas": (Glosa, Glosa.fecha.desc(), ["estatus"], ["autoridad", "fecha_desde", "fecha_hasta", "expediente"]),
+    "listas_de_acuerdos": (ListaDeAcuerdo, ListaDeAcuerdo.fecha.desc(), ["estatus"], ["autoridad", "fecha_desde", "fecha_hasta"]),
+    "sentencias": (Sentencia, Sentencia.fecha.desc(), ["estatus"], ["autoridad", "fecha_desde", "fecha_hasta", "expediente"]),
+    "ubicaciones_expedientes": (UbicacionExpediente, UbicacionExpediente.creado.desc(), ["estatus"], ["autoridad", "expediente"]),
+}
+
+
+def sample_values(modelo):
+    """Valores representativos: la autoridad con más registros y el expediente más reciente"""
+    muestra = {"fecha_desde": date.today() - timedelta(days=MUESTRA_DIAS), "fecha_hasta": date.today(), "autoridad_id": 0, "expediente": ""}
+    if hasattr(modelo, "autoridad_id"):
+        renglon = db.session.query(modelo.autoridad_id).group_by(modelo.autoridad_id).order_by(db.func.count(modelo.id).desc()).first()
+        if renglon is not None:
+            muestra["autoridad_id"] = renglon.autoridad_id
+    if hasattr(modelo, "expediente"):
+        renglon = db.session.query(modelo.expediente).order_by(modelo.id.desc()).first()
+        if renglon is not None:
+            muestra["expediente"] = renglon.expediente
+    return muestra
+
+
+def filter_combinations(opcionales):
+    """Todas las combinaciones de los filtros opcionales, desde ninguno hasta todos"""
+    for cantidad in range(len(opcionales) + 1):
+        for combinacion in combinations(opcionales, cantidad):
+            yield list(combinacion)
+
+
+def explain(consulta):
+    """Plan de la consulta como listado de renglones de texto"""
+    sql = str(consulta.statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+    if db.engine.dialect.name == "sqlite":
+        return [renglon.detail for renglon in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}"))]
+    return [renglon[0] for renglon in db.session.execute(db.text(f"EXPLAIN {sql}"))]
+
+
+def sequential_scans(plan, tabla: str):
+    """Renglones del plan que recorren la tabla completa"""
+    if db.engine.dialect.name == "sqlite":
+        return [renglon for renglon in plan if renglon.startswith(f"SCAN {tabla}") and "INDEX" not in renglon]
+    return [renglon.strip() for renglon in plan if f"Seq Scan on {tabla}" in renglon]
+
+
+def advise(nombres=None):
+    """Revisar las combinaciones de filtros, entrega un listado de diccionarios por cada una"""
+    resultados = []
+    for nombre, (modelo, orden, fijos, opcionales) in DATATABLES.items():
+        if nombres and nombre not in nombres:
+            continue
+        muestra = sample_values(modelo)
+        for combinacion in filter_combinations(opcionales):
+            consulta = modelo.query
+            for filtro in fijos + combinacion:
+                consulta = consulta.filter(FILTROS[filtro](modelo, muestra))
+            plan = explain(consulta.order_by(orden).limit(10))
+            recorridos = sequential_scans(plan, modelo.__tablename__)
+            resultados.append(
+                {
+                    "datatable": nombre,
+                    "filtros": fijos + combinacion,
+                    "recorrido_completo": bool(recorridos),
+                    "plan": plan,
+                }
+            )
+    return resultados
@@ -0,0 +1,77 @@
+"""
+Menús
+
+El menú principal de cada usuario (nombre, nombre corto, icono y ruta de sus módulos) se guarda en Redis
+por usuario y por versión de los permisos. Al confirmar (commit) cambios en módulos, roles, permisos
+o en los roles de los usuarios se incrementa la versión y los menús se vuelven a elaborar en su siguiente uso.
+"""
+import json
+
+from flask import current_app
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from plataforma_web.blueprints.modulos.models import Modulo
+from plataforma_web.blueprints.permisos.models import Permiso
+from plataforma_web.blueprints.roles.models import Rol
+from plataforma_web.blueprints.usuarios_roles.models import UsuarioRol
+
+PREFIJO = "menus"
+CACHE_SEGUNDOS = 24 * 60 * 60
+
+MODELOS = (Modulo, Permiso, Rol, UsuarioRol)
+
+
+def menu_version():
+    """Versión de los permisos"""
+    valor = current_app.redis.get(f"{PREFIJO}:version")
+    return int(valor) if valor is not None else 0
+
+
+def get_menu(usuario):
+    """Menú del usuario, desde Redis o elaborado con sus módulos"""
+    try:
+        llave = f"{PREFIJO}:{usuario.id}:{menu_version()}"
+        guardado = current_app.redis.get(llave)
+    except redis.exceptions.RedisError:
+        llave = guardado = None
+    if guardado is not None:
+        return json.loads(guardado)
+    menu = [{"nombre": modulo.nombre, "nombre_corto": modulo.nombre_corto, "icono": modulo.icono, "ruta": modulo.ruta} for modulo in usuario.modulos()]
+    if llave is not None:
+        try:
+            current_app.redis.set(llave, json.dumps(menu), ex=CACHE_SEGUNDOS)
+        except redis.exceptions.RedisError:
+            pass
+    return menu
+
+
+def bump_menus():
+    """Incrementar la versión de los permisos, los menús guardados dejan de usarse y caducan solos"""
+    try:
+        current_app.redis.incr(f"{PREFIJO}:version")
+    except redis.exceptions.RedisError:
+        pass
+
+
+@event.listens_for(Session, "after_flush")
+def collect_changes(session, flush_context):
+    """Anotar en la sesión si cambiaron módulos, roles, permisos o roles de usuarios"""
+    for instancia in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instancia, MODELOS):
+            session.info[PREFIJO] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def bump_changes(session):
+    """Al confirmar, incrementar la versión de los permisos"""
+    if session.info.pop(PREFIJO, False):
+        bump_menus()
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_changes(session):
+    """Al deshacer, olvidar lo anotado"""
+    session.info.pop(PREFIJO, None)
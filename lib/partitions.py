@@ -0,0 +1,128 @@
+"""
+Particiones mensuales
+
+En PostgreSQL las tablas de bitácoras y de entradas y salidas se particionan por rango del mes de creado.
+La llave primaria de la tabla pasa a ser (id, creado) porque debe incluir la columna de la partición;
+el modelo sigue usando sólo id, que viene de la misma secuencia. Las particiones se llaman como la tabla
+con el año y el mes, por ejemplo bitacoras_2024_01. Las consultas que filtran por creado sólo leen
+las particiones de esos meses. Las particiones viejas se exportan a CSV comprimido y se desprenden.
+"""
+from datetime import date, datetime, time, timedelta
+import gzip
+import os
+
+import sqlalchemy as sa
+from sqlalchemy.schema import AddConstraint
+
+from plataforma_web.extensions import db
+
+TABLAS = ("bitacoras", "entradas_salidas")
+MESES_ADELANTE = 3  # Meses futuros con partición creada de antemano
+RECIENTES_DIAS = 60  # Periodo por defecto de los listados, así sólo se leen las particiones de los últimos meses
+
+
+def month_start(fecha: date, meses: int = 0):
+    """Primer día del mes de la fecha, más o menos los meses dados"""
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def recent_start():
+    """Fecha desde la que se listan por defecto los renglones de las tablas particionadas"""
+    return date.today() - timedelta(days=RECIENTES_DIAS)
+
+
+def parse_date(texto: str):
+    """Fecha AAAA-MM-DD del formulario, None si está vacía o no es válida"""
+    try:
+        return date.fromisoformat(texto) if texto else None
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_created(consulta, columna, fecha_desde: str = None, fecha_hasta: str = None):
+    """Filtrar por el periodo de creado, por defecto los recientes, con ambas fechas incluidas; las fechas no válidas se ignoran"""
+    desde = parse_date(fecha_desde) or recent_start()
+    consulta = consulta.filter(columna >= datetime.combine(desde, time()))
+    hasta = parse_date(fecha_hasta)
+    if hasta:
+        consulta = consulta.filter(columna < datetime.combine(hasta + timedelta(days=1), time()))
+    return consulta
+
+
+def partition_name(tabla: str, mes: date):
+    """Nombre de la partición del mes"""
+    return f"{tabla}_{mes.strftime('%Y_%m')}"
+
+
+def is_partitioned(conexion, tabla: str):
+    """¿La tabla ya está particionada?"""
+    sql = "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :tabla"
+    return conexion.execute(sa.text(sql), {"tabla": tabla}).first() is not None
+
+
+def partitions(conexion, tabla: str):
+    """Meses de las particiones de la tabla, del más antiguo al más reciente"""
+    sql = (
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :tabla ORDER BY c.relname"
+    )
+    meses = []
+    for (nombre,) in conexion.execute(sa.text(sql), {"tabla": tabla}):
+        ano, mes = nombre[len(tabla) + 1 :].split("_")
+        meses.append(date(int(ano), int(mes), 1))
+    return meses
+
+
+def create_partition(conexion, tabla: str, mes: date, padre: str = None):
+    """Crear la partición del mes si no existe, el padre es otro cuando se está convirtiendo la tabla"""
+    conexion.execute(
+        sa.text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(tabla, mes)} PARTITION OF {padre or tabla} "
+            f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{month_start(mes, 1).isoformat()}')"
+        )
+    )
+
+
+def create_future_partitions(conexion, tabla: str, meses: int = MESES_ADELANTE):
+    """Crear las particiones del mes actual y de los siguientes, entrega cuántos meses revisó"""
+    actual = month_start(date.today())
+    for cantidad in range(meses + 1):
+        create_partition(conexion, tabla, month_start(actual, cantidad))
+    return meses + 1
+
+
+def convert(conexion, tabla: str):
+    """Cambiar una tabla sin particiones por una particionada con los mismos renglones, índices y llaves foráneas"""
+    modelo = db.metadata.tables[tabla]
+    conexion.execute(sa.text(f"LOCK TABLE {tabla} IN ACCESS EXCLUSIVE MODE"))
+    conexion.execute(sa.text(f"ALTER SEQUENCE {tabla}_id_seq OWNED BY NONE"))
+    conexion.execute(sa.text(f"CREATE TABLE {tabla}_particionada (LIKE {tabla} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (creado)"))
+    conexion.execute(sa.text(f"ALTER TABLE {tabla}_particionada ADD PRIMARY KEY (id, creado)"))
+    primero = conexion.execute(sa.text(f"SELECT min(creado) FROM {tabla}")).scalar()
+    mes = month_start(primero.date() if primero is not None else date.today())
+    while mes <= month_start(date.today(), MESES_ADELANTE):
+        create_partition(conexion, tabla, mes, padre=f"{tabla}_particionada")
+        mes = month_start(mes, 1)
+    conexion.execute(sa.text(f"INSERT INTO {tabla}_particionada SELECT * FROM {tabla}"))
+    conexion.execute(sa.text(f"DROP TABLE {tabla}"))
+    conexion.execute(sa.text(f"ALTER TABLE {tabla}_particionada RENAME TO {tabla}"))
+    conexion.execute(sa.text(f"ALTER SEQUENCE {tabla}_id_seq OWNED BY {tabla}.id"))
+    for indice in modelo.indexes:
+        indice.create(bind=conexion)
+    for llave in modelo.foreign_key_constraints:
+        conexion.execute(AddConstraint(llave))
+
+
+def archive(conexion, tabla: str, mes: date, directorio: str, eliminar: bool = True):
+    """Exportar la partición del mes a CSV comprimido y desprenderla de la tabla, entrega la ruta del archivo"""
+    nombre = partition_name(tabla, mes)
+    ruta = os.path.join(directorio, f"{nombre}.csv.gz")
+    cursor = conexion.connection.dbapi_connection.cursor()
+    with gzip.open(ruta, "wt", encoding="utf-8") as archivo:
+        cursor.copy_expert(f"COPY {nombre} TO STDOUT WITH CSV HEADER", archivo)
+    cursor.close()
+    conexion.execute(sa.text(f"ALTER TABLE {tabla} DETACH PARTITION {nombre}"))
+    if eliminar:
+        conexion.execute(sa.text(f"DROP TABLE {nombre}"))
+    return ruta
@@ -0,0 +1,154 @@
+"""
+Perfilador de peticiones
+
+Un administrador del módulo MODULO enciende el perfilador para una petición con el encabezado ENCABEZADO,
+o para todas las suyas durante unos minutos con la galleta COOKIE que pone la vista de perfiles.
+Esa petición se ejecuta con cProfile y el resultado se guarda en Redis por RETENER_SEGUNDOS: un resumen con las
+funciones de mayor tiempo y las estadísticas completas, que se descargan para verlas con snakeviz.
+Sin el encabezado ni la galleta sólo se revisan esos dos valores, no se consulta al usuario ni se perfila.
+"""
+from datetime import datetime
+import cProfile
+import json
+import marshal
+import os
+import pstats
+import time
+import uuid
+
+from flask import current_app, g, request
+from flask_login import current_user
+import redis
+
+MODULO = "MODULOS"
+ENCABEZADO = "X-Perfilar"
+COOKIE = "perfilar"
+COOKIE_SEGUNDOS = 10 * 60
+PREFIJO = "perfiles"
+RETENER_SEGUNDOS = 60 * 60
+RETENER_PERFILES = 100
+RENGLONES = 40  # Funciones en el resumen
+EXCLUIR_ENDPOINTS = (
+    "static",
+    "modulos.profiles",
+    "modulos.profiles_on",
+    "modulos.profiles_off",
+    "modulos.profile_detail",
+    "modulos.profile_download",
+)
+
+
+def function_name(funcion: tuple):
+    """Nombre legible de la función de pstats, la ruta relativa al proyecto o a site-packages"""
+    archivo, linea, nombre = funcion
+    if archivo == "~":
+        return nombre  # Funciones de C
+    if "site-packages" in archivo:
+        archivo = archivo.split("site-packages" + os.sep, 1)[1]
+    elif archivo.startswith(current_app.root_path):
+        archivo = os.path.relpath(archivo, os.path.dirname(current_app.root_path))
+    return f"{archivo}:{linea}({nombre})"
+
+
+def summarize(estadisticas: dict, orden: int):
+    """Las funciones de mayor tiempo, el orden es 2 para el tiempo propio y 3 para el acumulado"""
+    renglones = sorted(estadisticas.items(), key=lambda item: item[1][orden], reverse=True)[:RENGLONES]
+    return [
+        {
+            "funcion": function_name(funcion),
+            "llamadas": llamadas,
+            "propio": round(propio * 1000, 1),
+            "acumulado": round(acumulado * 1000, 1),
+        }
+        for funcion, (_, llamadas, propio, acumulado, _) in renglones
+    ]
+
+
+def save_profile(connection, perfil: cProfile.Profile, duracion: float):
+    """Guardar el resumen y las estadísticas del perfil en Redis, entrega su id"""
+    estadisticas = pstats.Stats(perfil).stats
+    perfil_id = uuid.uuid4().hex
+    ahora = time.time()
+    resumen = {
+        "id": perfil_id,
+        "tiempo": ahora,
+        "creado": datetime.fromtimestamp(ahora).strftime("%Y-%m-%d %H:%M:%S"),
+        "metodo": request.method,
+        "ruta": request.full_path.rstrip("?"),
+        "endpoint": request.endpoint,
+        "usuario": current_user.email,
+        "duracion": round(duracion * 1000, 1),
+        "llamadas": sum(valores[1] for valores in estadisticas.values()),
+        "acumulado": summarize(estadisticas, 3),
+        "propio": summarize(estadisticas, 2),
+    }
+    llave = f"{PREFIJO}:{perfil_id}"
+    tubo = connection.pipeline()
+    tubo.hset(llave, mapping={"resumen": json.dumps(resumen), "estadisticas": marshal.dumps(estadisticas)})
+    tubo.expire(llave, RETENER_SEGUNDOS)
+    tubo.zadd(PREFIJO, {perfil_id: ahora})
+    tubo.zremrangebyscore(PREFIJO, "-inf", ahora - RETENER_SEGUNDOS)
+    tubo.zremrangebyrank(PREFIJO, 0, -RETENER_PERFILES - 1)
+    tubo.execute()
+    return perfil_id
+
+
+def profiles(connection):
+    """Resúmenes de los perfiles guardados, del más reciente al más antiguo"""
+    perfiles_ids = connection.zrevrange(PREFIJO, 0, -1)
+    if not perfiles_ids:
+        return []
+    tubo = connection.pipeline()
+    for perfil_id in perfiles_ids:
+        tubo.hget(f"{PREFIJO}:{perfil_id.decode()}", "resumen")
+    return [json.loads(resumen) for resumen in tubo.execute() if resumen is not None]
+
+
+def profile_summary(connection, perfil_id: str):
+    """Resumen de un perfil, None si ya expiró"""
+    resumen = connection.hget(f"{PREFIJO}:{perfil_id}", "resumen")
+    return json.loads(resumen) if resumen is not None else None
+
+
+def profile_stats(connection, perfil_id: str):
+    """Estadísticas del perfil en el formato de pstats, como las escribe dump_stats; None si ya expiró"""
+    return connection.hget(f"{PREFIJO}:{perfil_id}", "estadisticas")
+
+
+def init_app(app):
+    """Perfilar las peticiones de los administradores que lo pidan"""
+
+    @app.before_request
+    def start_profile():
+        """Encender cProfile si se pidió y el usuario administra el módulo"""
+        if ENCABEZADO not in request.headers and COOKIE not in request.cookies:
+            return
+        if request.endpoint in EXCLUIR_ENDPOINTS or not current_user.is_authenticated or not current_user.can_admin(MODULO):
+            return
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            return  # Otra petición del mismo proceso ya se está perfilando
+        g.perfil = perfil
+        g.perfil_inicio = time.perf_counter()
+
+    @app.after_request
+    def end_profile(response):
+        """Apagar cProfile, guardar el perfil e indicar su id en el encabezado de la respuesta"""
+        perfil = g.pop("perfil", None)
+        if perfil is None:
+            return response
+        perfil.disable()
+        try:
+            response.headers[ENCABEZADO] = save_profile(current_app.redis, perfil, time.perf_counter() - g.perfil_inicio)
+        except redis.exceptions.RedisError as error:
+            current_app.logger.warning("Sin Redis para guardar el perfil: %s", error)
+        return response
+
+    @app.teardown_request
+    def discard_profile(error=None):
+        """Si la petición falló antes de after_request, apagar cProfile"""
+        perfil = g.pop("perfil", None)
+        if perfil is not None:
+            perfil.disable()
@@ -0,0 +1,126 @@
+"""
+Colas de tareas en el fondo
+
+Las tareas se separan en colas por su clase y el worker las consume en orden de prioridad,
+así un refrescar de todas las autoridades no retrasa la creación de un PDF que espera un usuario.
+
+- INTERACTIVAS: Las que lanza un usuario y espera su resultado
+- REPORTES: Elaboración de gráficas, reportes y envíos por correo electrónico
+- MASIVAS: Rastreos de los depósitos
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import rq
+
+COLA_INTERACTIVAS = "interactivas"
+COLA_REPORTES = "reportes"
+COLA_MASIVAS = "masivas"
+
+# En orden de prioridad, el worker consume la primera antes que las siguientes
+COLAS = (COLA_INTERACTIVAS, COLA_REPORTES, COLA_MASIVAS)
+
+# Cola de cada tarea, las que no estén aquí van a INTERACTIVAS
+RUTAS = {
+    "bitacoras.tasks.crear_particiones": COLA_MASIVAS,
+    "cid_procedimientos.tasks.crear_pdf": COLA_INTERACTIVAS,
+    "edictos.tasks.refrescar": COLA_MASIVAS,
+    "glosas.tasks.refrescar": COLA_MASIVAS,
+    "listas_de_acuerdos.tasks.enviar_reporte": COLA_REPORTES,
+    "listas_de_acuerdos.tasks.refrescar": COLA_MASIVAS,
+    "rep_graficas.tasks.elaborar": COLA_REPORTES,
+    "rep_reportes.tasks.elaborar": COLA_REPORTES,
+    "sentencias.tasks.enviar_reporte": COLA_REPORTES,
+    "sentencias.tasks.refrescar": COLA_MASIVAS,
+}
+
+# Tiempo límite en segundos de cada cola
+TIEMPOS_LIMITES = {
+    COLA_INTERACTIVAS: 1920,
+    COLA_REPORTES: 3840,
+    COLA_MASIVAS: 3840,
+}
+
+PREFIJO = "plataforma_web.blueprints."
+MUESTRA_TERMINADAS = 50
+
+
+def queue_name(task_queue: str, cola: str):
+    """Nombre de la cola en Redis, la interactiva conserva el nombre original de TASK_QUEUE"""
+    if cola == COLA_INTERACTIVAS:
+        return task_queue
+    return f"{task_queue}_{cola}"
+
+
+def task_route(nombre: str):
+    """Cola que le corresponde a una tarea, el nombre puede venir con o sin el prefijo"""
+    if nombre.startswith(PREFIJO):
+        nombre = nombre[len(PREFIJO) :]
+    return RUTAS.get(nombre, COLA_INTERACTIVAS)
+
+
+def seconds_since(tiempo: datetime):
+    """Segundos desde un tiempo UTC de RQ, que según su versión puede venir con o sin zona horaria"""
+    if tiempo.tzinfo is None:
+        return (datetime.utcnow() - tiempo).total_seconds()
+    return (datetime.now(timezone.utc) - tiempo).total_seconds()
+
+
+class TaskQueues:
+    """Colas de tareas con el ruteo por tarea"""
+
+    def __init__(self, task_queue: str, connection):
+        self.connection = connection
+        self.queues = OrderedDict()
+        for cola in COLAS:
+            self.queues[cola] = rq.Queue(queue_name(task_queue, cola), connection=connection, default_timeout=TIEMPOS_LIMITES[cola])
+
+    def get_queue(self, cola: str = COLA_INTERACTIVAS):
+        """Obtener la cola por su clase"""
+        return self.queues[cola]
+
+    def in_order(self):
+        """Listado de colas en orden de prioridad, para arrancar el worker"""
+        return list(self.queues.values())
+
+    def enqueue(self, nombre: str, *args, **kwargs):
+        """Encolar la tarea en la cola que le corresponde, el nombre puede venir con o sin el prefijo"""
+        if not nombre.startswith(PREFIJO):
+            nombre = PREFIJO + nombre
+        return self.queues[task_route(nombre)].enqueue(nombre, *args, **kwargs)
+
+    def enqueue_in(self, time_delta, nombre: str, *args, **kwargs):
+        """Encolar la tarea para que arranque después del tiempo dado, requiere el worker con el programador de RQ"""
+        if not nombre.startswith(PREFIJO):
+            nombre = PREFIJO + nombre
+        return self.queues[task_route(nombre)].enqueue_in(time_delta, nombre, *args, **kwargs)
+
+    def stats(self):
+        """Profundidad y tiempos de espera en segundos de cada cola, para dimensionar los workers"""
+        estadisticas = []
+        for cola, queue in self.queues.items():
+            # La espera de la tarea más antigua que aun no arranca
+            espera_maxima = 0
+            primeros = queue.get_job_ids(0, 1)
+            if primeros:
+                job = queue.fetch_job(primeros[0])
+                if job is not None and job.enqueued_at is not None:
+                    espera_maxima = seconds_since(job.enqueued_at)
+            # La espera promedio de las terminadas recientemente, entre que se encolaron y arrancaron
+            esperas = []
+            ids = queue.finished_job_registry.get_job_ids(0, MUESTRA_TERMINADAS - 1)
+            for job in rq.job.Job.fetch_many(ids, connection=self.connection):
+                if job is not None and job.enqueued_at is not None and job.started_at is not None:
+                    esperas.append((job.started_at - job.enqueued_at).total_seconds())
+            estadisticas.append(
+                {
+                    "cola": cola,
+                    "nombre": queue.name,
+                    "en_espera": queue.count,
+                    "en_proceso": queue.started_job_registry.count,
+                    "fallidas": queue.failed_job_registry.count,
+                    "espera_maxima": round(espera_maxima, 1),
+                    "espera_promedio": round(sum(esperas) / len(esperas), 1) if esperas else 0,
+                }
+            )
+        return estadisticas
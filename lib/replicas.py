@@ -0,0 +1,121 @@
+"""
+Réplicas de lectura
+
+Si en SQLALCHEMY_BINDS está la llave "replica", las consultas de lectura de las peticiones GET, de los datatable_json
+y de los bloques con read_replica() van a la réplica. Las escrituras y todo lo que sigue a una escritura en la misma
+sesión van a la base de datos principal. Después de confirmar una escritura, las peticiones del mismo usuario
+leen de la principal durante PRINCIPAL_DESPUES_SEGUNDOS, así el redirect después de new() ve lo que se acaba de guardar.
+Si el retraso de la réplica pasa de RETRASO_MAXIMO_SEGUNDOS o no responde, se lee de la principal.
+"""
+from contextlib import contextmanager
+import time
+
+from flask import current_app, request, session
+from flask_sqlalchemy.session import Session
+import sqlalchemy as sa
+from sqlalchemy import event
+
+LLAVE = "replica"
+PRINCIPAL_DESPUES_SEGUNDOS = 10
+RETRASO_MAXIMO_SEGUNDOS = 5
+VERIFICAR_SEGUNDOS = 10
+
+AUTOMATICA = "automatica"  # Lee de la réplica hasta la primera escritura de la sesión
+FORZADA = "forzada"  # Lee de la réplica aunque la sesión haya escrito
+
+# Retraso de la réplica: tiempo de la última verificación y si está al día
+estado = {"verificado": 0.0, "al_dia": False}
+
+
+def replica_lag(engine):
+    """Segundos de retraso de la réplica, cero si ya aplicó todo lo recibido"""
+    if engine.dialect.name != "postgresql":
+        return 0
+    with engine.connect() as conexion:
+        retraso = conexion.execute(
+            sa.text(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            )
+        ).scalar()
+    return float(retraso or 0)
+
+
+def replica_is_current(engine):
+    """¿La réplica está al día? Se verifica a lo más una vez cada VERIFICAR_SEGUNDOS"""
+    ahora = time.monotonic()
+    if ahora - estado["verificado"] >= VERIFICAR_SEGUNDOS:
+        try:
+            estado["al_dia"] = replica_lag(engine) <= RETRASO_MAXIMO_SEGUNDOS
+        except sa.exc.SQLAlchemyError as error:
+            current_app.logger.warning("Réplica sin responder, se lee de la principal: %s", error)
+            estado["al_dia"] = False
+        estado["verificado"] = ahora
+    return estado["al_dia"]
+
+
+def read_engine():
+    """Motor para lecturas fuera de la sesión, como las de pandas: la réplica si está al día, si no la principal"""
+    db = current_app.extensions["sqlalchemy"]
+    replica = db.engines.get(LLAVE)
+    if replica is not None and replica_is_current(replica):
+        return replica
+    return db.engine
+
+
+class RoutingSession(Session):
+    """Sesión que envía las lecturas a la réplica cuando se puede"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Elegir la réplica para los SELECT si la sesión lo permite, si no la principal"""
+        if bind is None and self.uses_replica() and isinstance(clause, sa.sql.Select) and clause._for_update_arg is None:
+            replica = self._db.engines.get(LLAVE)
+            if replica is not None and replica_is_current(replica):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def uses_replica(self):
+        """¿Esta sesión lee de la réplica?"""
+        modo = self.info.get(LLAVE)
+        if modo == FORZADA:
+            return True
+        return modo == AUTOMATICA and not self.info.get("escrito", False)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def mark_written(session, flush_context):
+    """Después de escribir, la sesión lee de la principal"""
+    session.info["escrito"] = True
+
+
+@contextmanager
+def read_replica():
+    """Bloque cuyas lecturas van a la réplica, para reportes y tareas de sólo lectura"""
+    db = current_app.extensions["sqlalchemy"]
+    anterior = db.session.info.get(LLAVE)
+    db.session.info[LLAVE] = FORZADA
+    try:
+        yield
+    finally:
+        db.session.info[LLAVE] = anterior
+
+
+def init_app(app, db):
+    """Elegir la réplica al comenzar las peticiones y recordar las escrituras al terminarlas"""
+    if LLAVE not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+
+    @app.before_request
+    def route_request():
+        """Las GET y los datatable_json leen de la réplica, salvo que el usuario haya escrito hace poco"""
+        if session.get("principal_hasta", 0) > time.time():
+            return
+        if request.method == "GET" or (request.endpoint or "").endswith(".datatable_json"):
+            db.session.info[LLAVE] = AUTOMATICA
+
+    @app.after_request
+    def remember_write(response):
+        """Si la petición escribió, las siguientes del usuario leen de la principal por unos segundos"""
+        if db.session.info.get("escrito", False):
+            session["principal_hasta"] = time.time() + PRINCIPAL_DESPUES_SEGUNDOS
+        return response
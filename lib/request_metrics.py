@@ -0,0 +1,112 @@
+"""
+Métricas de las peticiones
+
+Mientras se atiende una petición se cuentan las consultas a la base de datos, se suma su tiempo y se recuerda
+la más lenta. A los usuarios que administran el módulo MODULO se les entregan en los encabezados Server-Timing,
+que se ven en las herramientas de desarrollo del navegador, y X-Query-Count. Las peticiones que tardan más de
+PETICION_LENTA_MILISEGUNDOS se anotan en el registro con la consulta más lenta normalizada.
+Sólo se toman dos lecturas del reloj por consulta, así que puede quedar encendido en producción.
+"""
+import re
+import threading
+import time
+
+from flask import current_app, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MODULO = "MODULOS"
+PETICION_LENTA_MILISEGUNDOS = 2000
+SQL_LIMITE = 1000  # Caracteres de la consulta normalizada en el registro
+
+LITERALES_REGEXP = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PARAMETROS_REGEXP = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+")
+LISTAS_REGEXP = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+ESPACIOS_REGEXP = re.compile(r"\s+")
+
+medicion = threading.local()
+
+
+def normalize_sql(sql: str):
+    """Consulta sin literales ni espacios repetidos, las listas de valores se reducen a (?...)"""
+    sql = LITERALES_REGEXP.sub("?", sql)
+    sql = PARAMETROS_REGEXP.sub("?", sql)
+    sql = LISTAS_REGEXP.sub("(?...)", sql)
+    return ESPACIOS_REGEXP.sub(" ", sql).strip()[:SQL_LIMITE]
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query(conn, cursor, statement, parameters, context, executemany):
+    """Tomar la hora de inicio de la consulta mientras haya una petición midiéndose"""
+    if getattr(medicion, "actual", None) is not None:
+        conn.info.setdefault("peticion_inicios", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def end_query(conn, cursor, statement, parameters, context, executemany):
+    """Sumar la consulta a la petición y recordar si es la más lenta"""
+    actual = getattr(medicion, "actual", None)
+    if actual is None or not conn.info.get("peticion_inicios"):
+        return
+    duracion = time.perf_counter() - conn.info["peticion_inicios"].pop()
+    actual["consultas"] += 1
+    actual["tiempo"] += duracion
+    if duracion > actual["lenta_duracion"]:
+        actual["lenta_duracion"] = duracion
+        actual["lenta_sql"] = statement
+
+
+def server_timing(muestra: dict):
+    """Valor del encabezado Server-Timing, las duraciones en milisegundos"""
+    return (
+        f'db;dur={muestra["db"]:.1f};desc="{muestra["consultas"]} consultas", '
+        f'db-lenta;dur={muestra["lenta"]:.1f}, '
+        f'total;dur={muestra["total"]:.1f}'
+    )
+
+
+def init_app(app):
+    """Medir las consultas de cada petición"""
+
+    @app.before_request
+    def start_request():
+        """Comenzar la medición, salvo en los archivos estáticos"""
+        if request.endpoint == "static":
+            return
+        medicion.actual = {"consultas": 0, "tiempo": 0.0, "lenta_duracion": 0.0, "lenta_sql": "", "inicio": time.perf_counter()}
+
+    @app.after_request
+    def end_request(response):
+        """Terminar la medición, agregar los encabezados para los administradores y anotar si fue lenta"""
+        actual = getattr(medicion, "actual", None)
+        if actual is None:
+            return response
+        medicion.actual = None
+        muestra = {
+            "consultas": actual["consultas"],
+            "db": actual["tiempo"] * 1000,
+            "lenta": actual["lenta_duracion"] * 1000,
+            "total": (time.perf_counter() - actual["inicio"]) * 1000,
+        }
+        if current_user.is_authenticated and current_user.can_admin(MODULO):
+            response.headers["Server-Timing"] = server_timing(muestra)
+            response.headers["X-Query-Count"] = str(muestra["consultas"])
+        lenta_milisegundos = current_app.config.get("PETICION_LENTA_MILISEGUNDOS", PETICION_LENTA_MILISEGUNDOS)
+        if lenta_milisegundos and muestra["total"] >= lenta_milisegundos:
+            current_app.logger.warning(
+                "Petición lenta %s %s: %.0f ms, %d consultas en %.0f ms, la más lenta de %.0f ms: %s",
+                request.method,
+                request.path,
+                muestra["total"],
+                muestra["consultas"],
+                muestra["db"],
+                muestra["lenta"],
+                normalize_sql(actual["lenta_sql"]),
+            )
+        return response
+
+    @app.teardown_request
+    def discard_request(error=None):
+        """Si la petición falló antes de after_request, descartar la medición"""
+        medicion.actual = None
@@ -25,6 +25,16 @@ def safe_string(input_str, max_len=250):
     return (final[:max_len] + "...") if len(final) > max_len else final
 
 
+def safe_phrase(input_str, max_len=256):
+    """Safe frase para búsqueda de texto completo, conserva acentos, comillas y guiones"""
+    if not isinstance(input_str, str):
+        return ""
+    new_string = re.sub(r'[^\w"\s-]+', " ", input_str)
+    removed_multiple_spaces = re.sub(r"\s+", " ", new_string)
+    final = removed_multiple_spaces.strip()
+    return final[:max_len]
+
+
 def safe_message(input_str, max_len=250):
     """Safe message"""
     message = str(input_str)
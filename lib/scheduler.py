@@ -0,0 +1,255 @@
+"""
+Programador de tareas
+
+Sustituye al cron externo que llamaba a la línea de comandos. Cada programa declara su expresión cron,
+su ventana para repartir las tareas, el desfase aleatorio, cuántas ejecuciones pueden estar al mismo tiempo
+y si debe recuperar la ejecución perdida cuando el programador estuvo detenido.
+
+En Redis se guarda la última ejecución, las tareas lanzadas y el historial de cada programa,
+y un candado para que sólo un programador lance las tareas aunque haya varios arrancados.
+"""
+from datetime import datetime, timedelta
+import json
+import os
+import random
+import socket
+
+import rq
+
+from lib.cron import Cron
+from plataforma_web.blueprints.autoridades.models import Autoridad
+from plataforma_web.blueprints.distritos.models import Distrito
+from plataforma_web.blueprints.rep_graficas.models import RepGrafica
+
+PREFIJO = "programador"
+CANDADO_SEGUNDOS = 90
+TOLERANCIA_SEGUNDOS = 300  # Después de este retraso una ejecución se considera perdida
+HISTORIAL_LIMITE = 100
+TERMINADOS = ("finished", "failed", "stopped", "canceled")
+
+
+def autoridades_con_directorio(columna: str):
+    """Argumentos de refrescar para cada autoridad jurisdiccional con directorio en la columna dada"""
+    autoridades = Autoridad.query.join(Distrito).filter(Distrito.es_distrito_judicial == True).filter(Autoridad.es_jurisdiccional == True)
+    autoridades = autoridades.filter(getattr(Autoridad, columna) != "").filter(getattr(Autoridad, columna) != None)
+    autoridades = autoridades.filter(Autoridad.estatus == "A").order_by(Autoridad.clave).all()
+    return [{"autoridad_id": autoridad.id, "usuario_id": None} for autoridad in autoridades]
+
+
+def rep_graficas_activas():
+    """Argumentos de elaborar para cada gráfica activa"""
+    return [{"rep_grafica_id": rep_grafica.id} for rep_grafica in RepGrafica.query.filter_by(estatus="A").order_by(RepGrafica.id).all()]
+
+
+class Programa:
+    """Programa de una tarea"""
+
+    def __init__(self, nombre, tarea, cron, argumentos=None, ventana=0, desfase=0, concurrencia=1, recuperar=True):
+        self.nombre = nombre
+        self.tarea = tarea
+        self.cron = Cron(cron)
+        self.argumentos = argumentos  # Función que entrega el listado de kwargs, una tarea por cada uno
+        self.ventana = ventana  # Segundos en los que se reparten las tareas
+        self.desfase = desfase  # Segundos al azar que se agregan a cada tarea
+        self.concurrencia = concurrencia  # Ejecuciones que pueden estar sin terminar al mismo tiempo
+        self.recuperar = recuperar  # Lanzar la ejecución perdida al volver a arrancar
+
+    def kwargs_list(self):
+        """Listado de kwargs, uno por cada tarea a lanzar"""
+        if self.argumentos is None:
+            return [{}]
+        return self.argumentos()
+
+    def __repr__(self):
+        """Representación"""
+        return f"<Programa {self.nombre}>"
+
+
+# Las tareas huérfanas por tiempo excedido o worker caído se terminan seguido para no bloquear a los usuarios
+# Los refrescar se reparten en la noche, uno después del otro, para no saturar al depósito ni a la base de datos
+PROGRAMAS = [
+    Programa(
+        nombre="tareas_reconciliar",
+        tarea="tareas.tasks.reconciliar",
+        cron="*/10 * * * *",
+        recuperar=False,
+    ),
+    Programa(
+        nombre="listas_de_acuerdos_refrescar",
+        tarea="listas_de_acuerdos.tasks.refrescar",
+        cron="0 0 * * *",
+        argumentos=lambda: autoridades_con_directorio("directorio_listas_de_acuerdos"),
+        ventana=5400,
+        desfase=60,
+    ),
+    Programa(
+        nombre="sentencias_refrescar",
+        tarea="sentencias.tasks.refrescar",
+        cron="30 1 * * *",
+        argumentos=lambda: autoridades_con_directorio("directorio_sentencias"),
+        ventana=3600,
+        desfase=60,
+    ),
+    Programa(
+        nombre="edictos_refrescar",
+        tarea="edictos.tasks.refrescar",
+        cron="30 2 * * *",
+        argumentos=lambda: autoridades_con_directorio("directorio_edictos"),
+        ventana=3600,
+        desfase=60,
+    ),
+    Programa(
+        nombre="glosas_refrescar",
+        tarea="glosas.tasks.refrescar",
+        cron="30 3 * * *",
+        argumentos=lambda: autoridades_con_directorio("directorio_glosas"),
+        ventana=3600,
+        desfase=60,
+    ),
+    Programa(
+        nombre="rep_graficas_elaborar",
+        tarea="rep_graficas.tasks.elaborar",
+        cron="30 4 * * *",
+        argumentos=rep_graficas_activas,
+        ventana=1800,
+        desfase=60,
+    ),
+    Programa(
+        nombre="bitacoras_drenar_auditoria",
+        tarea="bitacoras.tasks.drenar_auditoria",
+        cron="* * * * *",
+        recuperar=False,
+    ),
+    Programa(
+        nombre="bitacoras_crear_particiones",
+        tarea="bitacoras.tasks.crear_particiones",
+        cron="0 5 1 * *",
+    ),
+    Programa(
+        nombre="listas_de_acuerdos_enviar_reporte",
+        tarea="listas_de_acuerdos.tasks.enviar_reporte",
+        cron="0 7 * * 1-5",
+        desfase=120,
+    ),
+    Programa(
+        nombre="sentencias_enviar_reporte",
+        tarea="sentencias.tasks.enviar_reporte",
+        cron="5 7 * * 1-5",
+        desfase=120,
+    ),
+]
+
+
+class Scheduler:
+    """Programador que lanza las tareas de los programas a las colas"""
+
+    def __init__(self, task_queues, connection, programas=None):
+        self.task_queues = task_queues
+        self.connection = connection
+        self.programas = {programa.nombre: programa for programa in (programas if programas is not None else PROGRAMAS)}
+        self.identidad = f"{socket.gethostname()}:{os.getpid()}"
+
+    def key(self, programa: Programa, sufijo: str):
+        """Llave en Redis"""
+        return f"{PREFIJO}:{programa.nombre}:{sufijo}"
+
+    def acquire_lock(self):
+        """Tomar o renovar el candado, entrega verdadero si este programador es el que lanza las tareas"""
+        llave = f"{PREFIJO}:candado"
+        if self.connection.set(llave, self.identidad, nx=True, ex=CANDADO_SEGUNDOS):
+            return True
+        dueno = self.connection.get(llave)
+        if dueno is not None and dueno.decode() == self.identidad:
+            self.connection.expire(llave, CANDADO_SEGUNDOS)
+            return True
+        return False
+
+    def last_run(self, programa: Programa):
+        """Tiempo de la última ejecución programada"""
+        valor = self.connection.get(self.key(programa, "ultima"))
+        if valor is None:
+            return None
+        return datetime.fromisoformat(valor.decode())
+
+    def next_run(self, programa: Programa, ahora: datetime = None):
+        """Tiempo de la siguiente ejecución"""
+        ultima = self.last_run(programa)
+        if ultima is None:
+            ultima = ahora if ahora is not None else datetime.now()
+        return programa.cron.next_after(ultima)
+
+    def running_jobs(self, programa: Programa):
+        """Cantidad de ejecuciones que tienen tareas sin terminar"""
+        llave = self.key(programa, "ejecuciones")
+        sin_terminar = 0
+        for ejecucion in self.connection.lrange(llave, 0, -1):
+            ids = json.loads(ejecucion)
+            estados = [job.get_status() if job is not None else "finished" for job in rq.job.Job.fetch_many(ids, connection=self.connection)]
+            if all(estado in TERMINADOS for estado in estados):
+                self.connection.lrem(llave, 1, ejecucion)
+            else:
+                sin_terminar += 1
+        return sin_terminar
+
+    def record(self, programa: Programa, programado: datetime, resultado: str, cantidad: int = 0):
+        """Agregar al historial"""
+        llave = self.key(programa, "historial")
+        renglon = {
+            "programado": programado.isoformat(timespec="minutes"),
+            "lanzado": datetime.now().isoformat(timespec="seconds"),
+            "resultado": resultado,
+            "cantidad": cantidad,
+        }
+        self.connection.lpush(llave, json.dumps(renglon))
+        self.connection.ltrim(llave, 0, HISTORIAL_LIMITE - 1)
+
+    def history(self, programa: Programa):
+        """Historial del programa, del más reciente al más antiguo"""
+        return [json.loads(renglon) for renglon in self.connection.lrange(self.key(programa, "historial"), 0, -1)]
+
+    def launch(self, programa: Programa, programado: datetime):
+        """Lanzar las tareas del programa repartidas en su ventana, entrega la cantidad o None si se omitió"""
+        if self.running_jobs(programa) >= programa.concurrencia:
+            self.record(programa, programado, "OMITIDO POR CONCURRENCIA")
+            return None
+        kwargs_list = programa.kwargs_list()
+        paso = programa.ventana / len(kwargs_list) if kwargs_list else 0
+        ids = []
+        for numero, kwargs in enumerate(kwargs_list):
+            segundos = int(numero * paso + random.uniform(0, programa.desfase))
+            if segundos > 0:
+                job = self.task_queues.enqueue_in(timedelta(seconds=segundos), programa.tarea, **kwargs)
+            else:
+                job = self.task_queues.enqueue(programa.tarea, **kwargs)
+            ids.append(job.id)
+        if ids:
+            self.connection.rpush(self.key(programa, "ejecuciones"), json.dumps(ids))
+        self.record(programa, programado, "LANZADO", len(ids))
+        return len(ids)
+
+    def tick(self, ahora: datetime = None):
+        """Revisar los programas y lanzar los que ya les toca, entrega los nombres de los lanzados"""
+        if ahora is None:
+            ahora = datetime.now()
+        lanzados = []
+        if not self.acquire_lock():
+            return lanzados
+        for programa in self.programas.values():
+            ultima = self.last_run(programa)
+            if ultima is None:
+                # Primera vez, se empieza a contar desde ahora
+                self.connection.set(self.key(programa, "ultima"), ahora.isoformat())
+                continue
+            siguiente = programa.cron.next_after(ultima)
+            if siguiente > ahora:
+                continue
+            # Las ejecuciones perdidas se juntan en una sola
+            while programa.cron.next_after(siguiente) <= ahora:
+                siguiente = programa.cron.next_after(siguiente)
+            self.connection.set(self.key(programa, "ultima"), siguiente.isoformat())
+            if (ahora - siguiente).total_seconds() > TOLERANCIA_SEGUNDOS and not programa.recuperar:
+                self.record(programa, siguiente, "PERDIDO")
+                continue
+            if self.launch(programa, siguiente) is not None:
+                lanzados.append(programa.nombre)
+        return lanzados
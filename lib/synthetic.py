@@ -0,0 +1,332 @@
+"""
+Datos sintéticos
+
+Genera autoridades con años de listas de acuerdos, acuerdos, sentencias, edictos, glosas, audiencias y ubicaciones
+de expedientes, un usuario por autoridad con sus bitácoras y entradas y salidas, y el árbol de archivos PDF que
+les corresponde en el depósito. Las fechas se cuentan hacia atrás desde la fecha de referencia hoy, así la misma
+semilla con la misma fecha de referencia genera siempre los mismos renglones sobre una base de datos vacía; sólo
+cambian el creado de los catálogos que se insertan y la sal de la contraseña de los usuarios.
+Los ids se asignan aquí para enlazar los renglones sin consultarlos; en PostgreSQL se cargan con COPY y al final
+se ajustan las secuencias, en las demás bases de datos con INSERT por lotes. No pasa por el ORM, así que los
+eventos de las sesiones, como el índice de expedientes, no se enteran.
+"""
+from datetime import date, datetime, time, timedelta
+import csv
+import io
+import os
+import random
+from urllib.parse import quote
+
+import sqlalchemy as sa
+
+from lib.partitions import create_partition, is_partitioned, month_start
+from plataforma_web.extensions import db, pwd_context
+
+LOTE = 50000  # Renglones por COPY o INSERT
+CLAVE_PREFIJO = "SIN"
+CONTRASENA = "sinteticos"
+
+# Renglones por autoridad y por año, los acuerdos son por lista y las bitácoras y entradas y salidas por usuario
+VOLUMENES = {
+    "listas_de_acuerdos": 240,
+    "acuerdos_por_lista": 20,
+    "sentencias": 300,
+    "edictos": 150,
+    "glosas": 40,
+    "audiencias": 800,
+    "ubicaciones_expedientes": 400,
+    "bitacoras": 1000,
+    "entradas_salidas": 250,
+}
+
+# Subdirectorios del depósito, los mismos que usan las tareas refrescar
+SUBDIRECTORIOS = {
+    "edictos": "Edictos",
+    "glosas": "Glosas",
+    "listas_de_acuerdos": "Listas de Acuerdos",
+    "sentencias": "Sentencias",
+}
+GLOSAS_METADATOS = "glosas-metadatos.csv"
+
+# El PDF válido más pequeño, una página en blanco
+PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+def public_url(deposito: str, nombre: str):
+    """URL pública de un archivo del depósito, como la entrega Google Cloud Storage"""
+    return f"https://storage.googleapis.com/{deposito}/{quote(nombre)}"
+
+
+def write_pdf(raiz: str, nombre: str):
+    """Escribir el PDF en el árbol local del depósito"""
+    ruta = os.path.join(raiz, nombre)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "wb") as puntero:
+        puntero.write(PDF)
+
+
+class TableWriter:
+    """Escribe los renglones de una tabla por lotes y les asigna ids consecutivos"""
+
+    def __init__(self, conexion, tabla: str, columnas: list):
+        self.conexion = conexion
+        self.tabla = db.metadata.tables[tabla]
+        self.columnas = ["id"] + columnas
+        self.es_postgresql = conexion.dialect.name == "postgresql"
+        self.siguiente_id = (conexion.execute(sa.select(sa.func.max(self.tabla.c.id))).scalar() or 0) + 1
+        self.renglones = []
+        self.contador = 0
+
+    def add(self, *valores):
+        """Agregar un renglón con los valores en el orden de las columnas, entrega su id"""
+        renglon_id = self.siguiente_id
+        self.siguiente_id += 1
+        self.renglones.append((renglon_id,) + valores)
+        if len(self.renglones) >= LOTE:
+            self.flush()
+        return renglon_id
+
+    def flush(self):
+        """Escribir los renglones pendientes"""
+        if not self.renglones:
+            return
+        if self.es_postgresql:
+            bufer = io.StringIO()
+            csv.writer(bufer, quoting=csv.QUOTE_NONNUMERIC).writerows(self.renglones)
+            bufer.seek(0)
+            cursor = self.conexion.connection.dbapi_connection.cursor()
+            cursor.copy_expert(f"COPY {self.tabla.name} ({', '.join(self.columnas)}) FROM STDIN WITH CSV", bufer)
+            cursor.close()
+        else:
+            self.conexion.execute(self.tabla.insert(), [dict(zip(self.columnas, renglon)) for renglon in self.renglones])
+        self.contador += len(self.renglones)
+        self.renglones = []
+
+    def close(self):
+        """Escribir lo pendiente y adelantar la secuencia de los ids, entrega cuántos renglones escribió"""
+        self.flush()
+        if self.es_postgresql and self.contador:
+            self.conexion.execute(sa.text(f"SELECT setval('{self.tabla.name}_id_seq', {self.siguiente_id - 1})"))
+        return self.contador
+
+
+def catalog_id(conexion, tabla: str, valores: dict):
+    """Id del renglón del catálogo con esos valores, si no existe se inserta"""
+    catalogo = db.metadata.tables[tabla]
+    consulta = sa.select(catalogo.c.id).where(*[catalogo.c[columna] == valor for columna, valor in valores.items()])
+    renglon_id = conexion.execute(consulta).scalar()
+    if renglon_id is None:
+        renglon_id = conexion.execute(catalogo.insert().values(**valores)).inserted_primary_key[0]
+    return renglon_id
+
+
+def business_days(desde: date, hasta: date):
+    """Días de lunes a viernes del periodo"""
+    dias = []
+    dia = desde
+    while dia <= hasta:
+        if dia.weekday() < 5:
+            dias.append(dia)
+        dia += timedelta(days=1)
+    return dias
+
+
+def generate(
+    conexion,
+    autoridades: int,
+    anos: int,
+    semilla: int,
+    deposito: str,
+    raiz: str = None,
+    archivos: int = 0,
+    volumenes: dict = None,
+    hoy: date = None,
+    avisar=None,
+):
+    """Generar los datos sintéticos y los archivos de las primeras autoridades, entrega los renglones por tabla y los ids de las autoridades"""
+    azar = random.Random(semilla)
+    volumenes = {**VOLUMENES, **(volumenes or {})}
+    avisar = avisar or (lambda mensaje: None)
+    hoy = hoy or date.today()
+    desde = hoy - timedelta(days=365 * anos)
+    dias = business_days(desde, hoy)
+    dias_por_ano = len(dias) / anos
+    segundos = int((datetime.combine(hoy, time()) - datetime.combine(desde, time())).total_seconds())
+
+    def cantidad(volumen: str):
+        return volumenes[volumen] * anos
+
+    def expediente():
+        return f"{azar.randint(1, 3000)}/{azar.randint(hoy.year - anos - 5, hoy.year)}"
+
+    def momento():
+        return datetime.combine(desde, time()) + timedelta(seconds=azar.randrange(segundos))
+
+    # Catálogos, se reutilizan si ya existen
+    materia_id = catalog_id(conexion, "materias", {"nombre": "SINTETICA"})
+    materia_tipo_juicio_id = catalog_id(conexion, "materias_tipos_juicios", {"materia_id": materia_id, "descripcion": "ORDINARIO SINTETICO"})
+    distrito_id = catalog_id(
+        conexion,
+        "distritos",
+        {"nombre": "DISTRITO JUDICIAL SINTETICO", "nombre_corto": "Sintético", "es_distrito_judicial": True},
+    )
+    modulos_ids = [renglon.id for renglon in conexion.execute(sa.select(db.metadata.tables["modulos"].c.id).order_by("id"))]
+    if not modulos_ids:
+        modulos_ids = [catalog_id(conexion, "modulos", {"nombre": "SINTETICOS", "nombre_corto": "Sintéticos", "icono": "fa-solid fa-flask", "ruta": "/", "en_navegacion": False})]
+
+    # Autoridades y un usuario de cada una
+    autoridades_escritor = TableWriter(
+        conexion,
+        "autoridades",
+        [
+            "distrito_id",
+            "materia_id",
+            "clave",
+            "descripcion",
+            "descripcion_corta",
+            "es_jurisdiccional",
+            "es_notaria",
+            "organo_jurisdiccional",
+            "audiencia_categoria",
+            "limite_dias_listas_de_acuerdos",
+            "directorio_edictos",
+            "directorio_glosas",
+            "directorio_listas_de_acuerdos",
+            "directorio_sentencias",
+        ],
+    )
+    usuarios_escritor = TableWriter(conexion, "usuarios", ["autoridad_id", "email", "contrasena", "nombres", "apellido_paterno", "workspace"])
+    contrasena = pwd_context.hash(CONTRASENA)
+    autoridades_ids, usuarios_ids, directorios = [], [], []
+    for _ in range(autoridades):
+        numero = autoridades_escritor.siguiente_id
+        directorio = f"Sinteticos/Juzgado {numero:04d}"
+        autoridad_id = autoridades_escritor.add(
+            distrito_id,
+            materia_id,
+            f"{CLAVE_PREFIJO}-{numero:04d}",
+            f"JUZGADO SINTETICO {numero}",
+            f"JUZGADO SINTETICO {numero}",
+            True,
+            False,
+            "JUZGADO DE PRIMERA INSTANCIA",
+            "CIVIL FAMILIAR MERCANTIL LETRADO TCYA",
+            0,
+            directorio,
+            directorio,
+            directorio,
+            directorio,
+        )
+        autoridades_ids.append(autoridad_id)
+        directorios.append(directorio)
+        usuarios_ids.append(usuarios_escritor.add(autoridad_id, f"sintetico{numero:04d}@pjecz.gob.mx", contrasena, "USUARIO", f"SINTETICO {numero}", "EXTERNO"))
+    contadores = {"autoridades": autoridades_escritor.close(), "usuarios": usuarios_escritor.close()}
+
+    # Registros de cada autoridad, las primeras también con sus archivos
+    listas_escritor = TableWriter(conexion, "listas_de_acuerdos", ["autoridad_id", "fecha", "descripcion", "archivo", "url"])
+    acuerdos_escritor = TableWriter(
+        conexion,
+        "listas_de_acuerdos_acuerdos",
+        ["lista_de_acuerdo_id", "folio", "expediente", "actor", "demandado", "tipo_acuerdo", "tipo_juicio", "referencia"],
+    )
+    sentencias_escritor = TableWriter(
+        conexion,
+        "sentencias",
+        ["autoridad_id", "materia_tipo_juicio_id", "sentencia", "expediente", "fecha", "es_perspectiva_genero", "archivo", "url"],
+    )
+    edictos_escritor = TableWriter(conexion, "edictos", ["autoridad_id", "fecha", "descripcion", "expediente", "numero_publicacion", "archivo", "url"])
+    glosas_escritor = TableWriter(conexion, "glosas", ["autoridad_id", "fecha", "tipo_juicio", "descripcion", "expediente", "archivo", "url"])
+    audiencias_escritor = TableWriter(conexion, "audiencias", ["autoridad_id", "tiempo", "tipo_audiencia", "expediente", "actores", "demandados"])
+    ubicaciones_escritor = TableWriter(conexion, "ubicaciones_expedientes", ["autoridad_id", "expediente", "ubicacion"])
+    metadatos = []
+    for indice, (autoridad_id, directorio) in enumerate(zip(autoridades_ids, directorios)):
+        con_archivos = raiz is not None and indice < archivos
+
+        def archivar(modulo: str, archivo: str):
+            nombre = f"{SUBDIRECTORIOS[modulo]}/{directorio}/{archivo}"
+            if con_archivos:
+                write_pdf(raiz, nombre)
+            return archivo, public_url(deposito, nombre)
+
+        probabilidad = min(1.0, volumenes["listas_de_acuerdos"] / dias_por_ano)
+        for dia in dias:
+            if azar.random() >= probabilidad:
+                continue
+            lista_id = listas_escritor.add(autoridad_id, dia, "LISTA DE ACUERDOS", *archivar("listas_de_acuerdos", f"{dia.isoformat()}-LISTA-DE-ACUERDOS.pdf"))
+            for referencia in range(1, volumenes["acuerdos_por_lista"] + 1):
+                acuerdos_escritor.add(
+                    lista_id,
+                    f"{referencia}/{dia.year}",
+                    expediente(),
+                    f"ACTOR {azar.randint(1, 50000)}",
+                    f"DEMANDADO {azar.randint(1, 50000)}",
+                    "ACUERDO",
+                    "ORDINARIO",
+                    referencia,
+                )
+        for numero in range(1, cantidad("sentencias") + 1):
+            dia, exp, genero = azar.choice(dias), expediente(), azar.random() < 0.1
+            sentencia = f"{numero}/{dia.year}"
+            archivo = f"{dia.isoformat()}-{sentencia.replace('/', '-')}-{exp.replace('/', '-')}{'-G' if genero else ''}.pdf"
+            sentencias_escritor.add(autoridad_id, materia_tipo_juicio_id, sentencia, exp, dia, genero, *archivar("sentencias", archivo))
+        for numero in range(1, cantidad("edictos") + 1):
+            dia, exp = azar.choice(dias), expediente()
+            publicacion = f"{numero}/{dia.year}"
+            archivo = f"{dia.isoformat()}-{exp.replace('/', '-')}-{publicacion.replace('/', '-')}-EDICTO.pdf"
+            edictos_escritor.add(autoridad_id, dia, "EDICTO", exp, publicacion, *archivar("edictos", archivo))
+        for numero in range(1, cantidad("glosas") + 1):
+            dia, exp = azar.choice(dias), expediente()
+            archivo = f"{dia.isoformat()}-{exp.replace('/', '-')}-{numero}.pdf"
+            glosas_escritor.add(autoridad_id, dia, "ND", "SIN DESCRIPCION", exp, *archivar("glosas", archivo))
+            if con_archivos:
+                metadatos.append({"archivo": archivo, "fecha": dia.isoformat(), "expediente": exp, "tipo_juicio": "ND"})
+        for _ in range(cantidad("audiencias")):
+            dia = azar.choice(dias)
+            tiempo = datetime.combine(dia, time(hour=azar.randint(8, 14), minute=azar.choice((0, 30))))
+            audiencias_escritor.add(autoridad_id, tiempo, "AUDIENCIA", expediente(), f"ACTOR {azar.randint(1, 50000)}", f"DEMANDADO {azar.randint(1, 50000)}")
+        for _ in range(volumenes["ubicaciones_expedientes"]):
+            ubicaciones_escritor.add(autoridad_id, expediente(), azar.choice(("ARCHIVO", "JUZGADO")))
+        if (indice + 1) % 100 == 0:
+            avisar(f"{indice + 1} autoridades")
+    contadores["listas_de_acuerdos"] = listas_escritor.close()
+    contadores["listas_de_acuerdos_acuerdos"] = acuerdos_escritor.close()
+    contadores["sentencias"] = sentencias_escritor.close()
+    contadores["edictos"] = edictos_escritor.close()
+    contadores["glosas"] = glosas_escritor.close()
+    contadores["audiencias"] = audiencias_escritor.close()
+    contadores["ubicaciones_expedientes"] = ubicaciones_escritor.close()
+
+    # Bitácoras y entradas y salidas, en PostgreSQL con las particiones de sus meses
+    if conexion.dialect.name == "postgresql":
+        for tabla in ("bitacoras", "entradas_salidas"):
+            if is_partitioned(conexion, tabla):
+                mes = month_start(desde)
+                while mes <= hoy:
+                    create_partition(conexion, tabla, mes)
+                    mes = month_start(mes, 1)
+    bitacoras_escritor = TableWriter(conexion, "bitacoras", ["modulo_id", "usuario_id", "descripcion", "url", "creado"])
+    entradas_salidas_escritor = TableWriter(conexion, "entradas_salidas", ["usuario_id", "tipo", "direccion_ip", "creado"])
+    for usuario_id in usuarios_ids:
+        for _ in range(cantidad("bitacoras")):
+            bitacoras_escritor.add(azar.choice(modulos_ids), usuario_id, "Operación sintética", "/", momento())
+        for _ in range(cantidad("entradas_salidas")):
+            entradas_salidas_escritor.add(usuario_id, azar.choice(("INGRESO", "SALIO")), f"10.0.{azar.randint(0, 255)}.{azar.randint(1, 254)}", momento())
+    contadores["bitacoras"] = bitacoras_escritor.close()
+    contadores["entradas_salidas"] = entradas_salidas_escritor.close()
+
+    # Metadatos de las glosas, como los lee la tarea refrescar
+    if raiz is not None:
+        os.makedirs(raiz, exist_ok=True)
+        with open(os.path.join(raiz, GLOSAS_METADATOS), "w", encoding="utf8", newline="") as puntero:
+            escritor = csv.DictWriter(puntero, fieldnames=["archivo", "fecha", "expediente", "tipo_juicio"])
+            escritor.writeheader()
+            escritor.writerows(metadatos)
+
+    return contadores, autoridades_ids
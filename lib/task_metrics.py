@@ -0,0 +1,153 @@
+"""
+Métricas de las tareas en el fondo
+
+El decorador measure_task mide cada ejecución: duración, consultas a la base de datos,
+renglones procesados, llamadas al depósito y memoria máxima del proceso.
+Las muestras se guardan en Redis en un conjunto ordenado por tiempo por cada tarea,
+para calcular las medianas y percentiles 95 del panel de tareas.
+"""
+from functools import wraps
+import json
+import math
+import resource
+import threading
+import time
+
+from flask import current_app
+import redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PREFIJO = "tareas_metricas"
+MODULOS_PREFIJO = "plataforma_web.blueprints."
+RETENER_SEGUNDOS = 30 * 24 * 60 * 60
+RETENER_MUESTRAS = 2000
+
+medicion = threading.local()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    """Contar las consultas mientras haya una tarea midiéndose"""
+    if getattr(medicion, "actual", None) is not None:
+        medicion.actual["consultas"] += 1
+
+
+def count_task_rows(cantidad: int = 1):
+    """Sumar renglones procesados a la tarea que se está midiendo"""
+    if getattr(medicion, "actual", None) is not None:
+        medicion.actual["renglones"] += cantidad
+
+
+def count_storage_calls(cantidad: int = 1):
+    """Sumar llamadas al depósito a la tarea que se está midiendo"""
+    if getattr(medicion, "actual", None) is not None:
+        medicion.actual["almacenamiento"] += cantidad
+
+
+def task_name(funcion):
+    """Nombre de la tarea como se lanza, por ejemplo listas_de_acuerdos.tasks.refrescar"""
+    modulo = funcion.__module__
+    if modulo.startswith(MODULOS_PREFIJO):
+        modulo = modulo[len(MODULOS_PREFIJO) :]
+    return f"{modulo}.{funcion.__name__}"
+
+
+def save_sample(connection, nombre: str, muestra: dict):
+    """Guardar la muestra en Redis y descartar las antiguas"""
+    llave = f"{PREFIJO}:{nombre}"
+    tubo = connection.pipeline()
+    tubo.zadd(llave, {json.dumps(muestra): muestra["tiempo"]})
+    tubo.zremrangebyscore(llave, "-inf", muestra["tiempo"] - RETENER_SEGUNDOS)
+    tubo.zremrangebyrank(llave, 0, -RETENER_MUESTRAS - 1)
+    tubo.sadd(f"{PREFIJO}:nombres", nombre)
+    tubo.execute()
+
+
+def measure_task(funcion):
+    """Decorador que mide la ejecución de una tarea"""
+    nombre = task_name(funcion)
+
+    @wraps(funcion)
+    def decorated_function(*args, **kwargs):
+        medicion.actual = {"consultas": 0, "renglones": 0, "almacenamiento": 0}
+        inicio = time.perf_counter()
+        exito = False
+        try:
+            resultado = funcion(*args, **kwargs)
+            exito = True
+            return resultado
+        finally:
+            muestra = {
+                "tiempo": time.time(),
+                "duracion": round(time.perf_counter() - inicio, 3),
+                "consultas": medicion.actual["consultas"],
+                "renglones": medicion.actual["renglones"],
+                "almacenamiento": medicion.actual["almacenamiento"],
+                "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                "autoridad_id": kwargs.get("autoridad_id"),
+                "exito": exito,
+            }
+            medicion.actual = None
+            try:
+                save_sample(current_app.redis, nombre, muestra)
+            except redis.exceptions.RedisError:
+                pass  # Las métricas no deben detener la tarea
+
+    return decorated_function
+
+
+def percentile(valores: list, porcentaje: int):
+    """Percentil por el rango más cercano, los valores deben venir ordenados"""
+    if not valores:
+        return 0
+    indice = min(len(valores), max(1, math.ceil(porcentaje / 100 * len(valores)))) - 1
+    return valores[indice]
+
+
+def summarize(muestras: list):
+    """Resumen de un listado de muestras"""
+    duraciones = sorted(muestra["duracion"] for muestra in muestras)
+    cantidad = len(muestras)
+    return {
+        "cantidad": cantidad,
+        "fallidas": sum(1 for muestra in muestras if not muestra["exito"]),
+        "p50": percentile(duraciones, 50),
+        "p95": percentile(duraciones, 95),
+        "maxima": duraciones[-1] if duraciones else 0,
+        "consultas": round(sum(muestra["consultas"] for muestra in muestras) / cantidad, 1) if cantidad else 0,
+        "renglones": round(sum(muestra["renglones"] for muestra in muestras) / cantidad, 1) if cantidad else 0,
+        "almacenamiento": round(sum(muestra["almacenamiento"] for muestra in muestras) / cantidad, 1) if cantidad else 0,
+        "rss_mb": round(max((muestra["rss_kb"] for muestra in muestras), default=0) / 1024, 1),
+    }
+
+
+def get_samples(connection, nombre: str, desde_segundos: int = RETENER_SEGUNDOS):
+    """Muestras de una tarea en los últimos segundos dados"""
+    llave = f"{PREFIJO}:{nombre}"
+    return [json.loads(renglon) for renglon in connection.zrangebyscore(llave, time.time() - desde_segundos, "+inf")]
+
+
+def task_stats(connection, desde_segundos: int = RETENER_SEGUNDOS):
+    """Resumen por cada tarea, de la más lenta a la más rápida por su percentil 95"""
+    resumenes = []
+    for nombre in sorted(valor.decode() for valor in connection.smembers(f"{PREFIJO}:nombres")):
+        muestras = get_samples(connection, nombre, desde_segundos)
+        if muestras:
+            resumen = summarize(muestras)
+            resumen["nombre"] = nombre
+            resumenes.append(resumen)
+    return sorted(resumenes, key=lambda resumen: resumen["p95"], reverse=True)
+
+
+def task_stats_by_autoridad(connection, nombre: str, desde_segundos: int = RETENER_SEGUNDOS):
+    """Resumen de una tarea por cada autoridad, de la más lenta a la más rápida por su percentil 95"""
+    grupos = {}
+    for muestra in get_samples(connection, nombre, desde_segundos):
+        grupos.setdefault(muestra["autoridad_id"], []).append(muestra)
+    resumenes = []
+    for autoridad_id, muestras in grupos.items():
+        resumen = summarize(muestras)
+        resumen["autoridad_id"] = autoridad_id
+        resumenes.append(resumen)
+    return sorted(resumenes, key=lambda resumen: resumen["p95"], reverse=True)
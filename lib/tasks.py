@@ -1,9 +1,40 @@
 """
 Tasks
 """
+from datetime import datetime, timedelta
+
+import redis
 from rq import get_current_job
+from plataforma_web.extensions import db, socketio
 from plataforma_web.blueprints.tareas.models import Tarea
 
+EVENTO_PROGRESO = "tarea_progreso"
+RECONCILIAR_MINUTOS = 2  # Las tareas más recientes se respetan, pueden estar por entrar al registro de iniciadas
+
+
+def user_room(usuario_id: int):
+    """Sala de Socket.IO del usuario, a donde se publica el progreso de sus tareas"""
+    return f"usuario_{usuario_id}"
+
+
+def task_progress_data(tarea: Tarea, progress: int):
+    """Datos del progreso de la tarea para el navegador"""
+    return {
+        "id": tarea.id,
+        "nombre": tarea.nombre,
+        "descripcion": tarea.descripcion,
+        "progreso": progress,
+        "ha_terminado": tarea.ha_terminado,
+    }
+
+
+def publish_task_progress(tarea: Tarea, progress: int):
+    """Publicar el progreso de la tarea al navegador del usuario por medio de Redis"""
+    try:
+        socketio.emit(EVENTO_PROGRESO, task_progress_data(tarea, progress), to=user_room(tarea.usuario_id))
+    except redis.exceptions.RedisError:
+        pass  # El progreso en el navegador no debe detener la tarea
+
 
 def set_task_progress(progress: int, mensaje: str = None):
     """Cambiar el progreso de la tarea"""
@@ -18,6 +49,7 @@ def set_task_progress(progress: int, mensaje: str = None):
             if mensaje is not None:
                 tarea.descripcion = mensaje
             tarea.save()
+            publish_task_progress(tarea, progress)
 
 
 def set_task_error(mensaje: str):
@@ -31,4 +63,23 @@ def set_task_error(mensaje: str):
             tarea.ha_terminado = True
             tarea.descripcion = mensaje
             tarea.save()
+            publish_task_progress(tarea, 100)
     return mensaje
+
+
+def reconcile_tasks(task_queues, minutos: int = RECONCILIAR_MINUTOS):
+    """Terminar en una sola sentencia las tareas sin terminar que ya no están en espera ni en proceso en RQ"""
+    vigentes = set()
+    for queue in task_queues.in_order():
+        queue.started_job_registry.cleanup()  # Pasa a fallidas las de workers caídos o que excedieron su tiempo
+        vigentes.update(queue.get_job_ids())
+        vigentes.update(queue.started_job_registry.get_job_ids())
+        vigentes.update(queue.scheduled_job_registry.get_job_ids())
+        vigentes.update(queue.deferred_job_registry.get_job_ids())
+    limite = datetime.now() - timedelta(minutes=minutos)
+    consulta = db.session.query(Tarea.id).filter(Tarea.ha_terminado == False).filter(Tarea.creado < limite)
+    huerfanas = [tarea_id for (tarea_id,) in consulta.all() if tarea_id not in vigentes]
+    if huerfanas:
+        Tarea.query.filter(Tarea.id.in_(huerfanas)).update({"ha_terminado": True}, synchronize_session=False)
+        db.session.commit()
+    return len(huerfanas)
@@ -0,0 +1,281 @@
+"""
+Captura y reproducción del tráfico
+
+Con TRAFICO_DIRECTORIO configurado, cada petición se anota como un renglón JSON en un archivo por día y por proceso:
+tiempo, método, ruta, endpoint, parámetros, formulario, archivos subidos (sólo nombre y tamaño), la clase del usuario
+(sus roles), el estado de la respuesta y su duración. Los valores de los campos sensibles se reemplazan por OCULTO.
+Sin TRAFICO_DIRECTORIO sólo se revisa esa configuración.
+
+Para reproducir, los renglones se ordenan por tiempo y se envían con el cliente de pruebas de Flask o a un servidor
+local por HTTP con el token CSRF de la sesión, respetando los intervalos grabados divididos entre la velocidad, o tan
+rápido como se pueda con velocidad cero; al final se resumen por endpoint las latencias de las respuestas sin error.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import glob
+from io import BytesIO
+import json
+import os
+import re
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from flask import current_app, g, request
+from flask_login import current_user
+
+from lib.task_metrics import percentile
+
+CAMPOS_SENSIBLES = ("contrasena", "password", "csrf_token", "token", "secret", "clave_secreta")
+OCULTO = "*"
+VALOR_LIMITE = 256  # Caracteres de cada valor anotado
+ANONIMO = ""
+METODOS_LECTURA = ("GET", "HEAD")
+ENDPOINT_LECTURA_SUFIJO = "json"  # Los POST de datatable_json y demás JSON sólo leen
+CSRF_CAMPO = "csrf_token"
+CSRF_META = re.compile(r'<meta name="csrf-token" content="([^"]*)"')
+ESTADO_ERROR = 400  # Las respuestas con este estado o mayor son errores y no cuentan en las latencias
+
+escritura = threading.Lock()
+bitacoras = {}  # Archivo abierto por ruta
+
+
+def sanitize(campos: dict):
+    """Valores de los campos, uno o una lista si se repite, con los sensibles ocultos y los largos recortados"""
+    limpios = {}
+    for campo, valores in campos.items():
+        if any(sensible in campo.lower() for sensible in CAMPOS_SENSIBLES):
+            valores = [OCULTO] * len(valores)
+        else:
+            valores = [valor[:VALOR_LIMITE] for valor in valores]
+        limpios[campo] = valores[0] if len(valores) == 1 else valores
+    return limpios
+
+
+def uploads():
+    """Archivos subidos, sólo la extensión del nombre y el tamaño"""
+    archivos = {}
+    for campo, archivo in request.files.items():
+        archivo.stream.seek(0, os.SEEK_END)
+        archivos[campo] = {"extension": os.path.splitext(archivo.filename or "")[1].lower(), "tamano": archivo.stream.tell()}
+        archivo.stream.seek(0)
+    return archivos
+
+
+def role_class():
+    """Clase del usuario, sus roles activos en orden alfabético unidos con +"""
+    if not current_user.is_authenticated:
+        return ANONIMO
+    return "+".join(sorted(usuario_rol.rol.nombre for usuario_rol in current_user.usuarios_roles if usuario_rol.estatus == "A"))
+
+
+def write_entry(directorio: str, entrada: dict):
+    """Agregar el renglón al archivo del día de este proceso"""
+    ruta = os.path.join(directorio, f"trafico-{date.today().isoformat()}-{os.getpid()}.jsonl")
+    with escritura:
+        if ruta not in bitacoras:
+            for puntero in bitacoras.values():
+                puntero.close()  # El del día anterior
+            bitacoras.clear()
+            os.makedirs(directorio, exist_ok=True)
+            bitacoras[ruta] = open(ruta, "a", encoding="utf8")  # pylint: disable=consider-using-with
+        bitacoras[ruta].write(json.dumps(entrada, separators=(",", ":"), ensure_ascii=False) + "\n")
+        bitacoras[ruta].flush()
+
+
+def read_entries(rutas: list):
+    """Renglones de los archivos o directorios, ordenados por tiempo"""
+    archivos = []
+    for ruta in rutas:
+        archivos.extend(sorted(glob.glob(os.path.join(ruta, "trafico-*.jsonl"))) if os.path.isdir(ruta) else [ruta])
+    entradas = []
+    for archivo in archivos:
+        with open(archivo, encoding="utf8") as puntero:
+            entradas.extend(json.loads(renglon) for renglon in puntero if renglon.strip())
+    return sorted(entradas, key=lambda entrada: entrada["t"])
+
+
+def is_read_only(entrada: dict):
+    """¿La petición sólo lee? Los GET y los POST a endpoints que entregan JSON"""
+    return entrada["m"] in METODOS_LECTURA or (entrada["m"] == "POST" and (entrada["e"] or "").endswith(ENDPOINT_LECTURA_SUFIJO))
+
+
+class TestClientSender:
+    """Envía las peticiones con el cliente de pruebas de Flask, con la sesión de un usuario de la misma clase"""
+
+    def __init__(self, app, usuarios_ids: dict):
+        self.app = app
+        self.usuarios_ids = usuarios_ids  # Clase del usuario -> id del usuario
+        self.clientes = threading.local()
+
+    def client(self, clase: str):
+        """Cliente de este hilo para la clase del usuario"""
+        if not hasattr(self.clientes, "por_clase"):
+            self.clientes.por_clase = {}
+        if clase not in self.clientes.por_clase:
+            cliente = self.app.test_client()
+            usuario_id = self.usuarios_ids.get(clase)
+            if usuario_id is not None:
+                with cliente.session_transaction() as sesion:
+                    sesion["_user_id"] = str(usuario_id)
+                    sesion["_fresh"] = True
+            self.clientes.por_clase[clase] = cliente
+        return self.clientes.por_clase[clase]
+
+    def __call__(self, entrada: dict):
+        """Enviar la petición, entrega el estado de la respuesta"""
+        datos = dict(entrada.get("f", {}))
+        for campo, archivo in entrada.get("u", {}).items():
+            datos[campo] = (BytesIO(b"\0" * archivo["tamano"]), f"reproducido{archivo['extension']}")
+        respuesta = self.client(entrada["r"]).open(entrada["p"], method=entrada["m"], query_string=entrada.get("q"), data=datos or None)
+        respuesta.close()
+        return respuesta.status_code
+
+
+class HttpSender:
+    """Envía las peticiones por HTTP a un servidor, como un gunicorn local, con la galleta de una sesión iniciada"""
+
+    def __init__(self, base_url: str, galleta: str = None, csrf: str = None):
+        self.base_url = base_url.rstrip("/")
+        self.galletas = dict(parte.strip().split("=", 1) for parte in (galleta or "").split(";") if "=" in parte)
+        self.csrf = csrf
+        self.candado = threading.Lock()
+
+    def cookie(self):
+        """Encabezado Cookie con las galletas de la sesión"""
+        return "; ".join(f"{nombre}={valor}" for nombre, valor in self.galletas.items())
+
+    def token(self):
+        """Token CSRF de la sesión, si no se dio se toma del meta csrf-token de la página de inicio"""
+        with self.candado:
+            if self.csrf is None:
+                peticion = Request(self.base_url + "/")
+                if self.galletas:
+                    peticion.add_header("Cookie", self.cookie())
+                with urlopen(peticion) as respuesta:
+                    # Si el servidor guarda el token en una sesión nueva, se usa su galleta
+                    for galleta in respuesta.headers.get_all("Set-Cookie") or []:
+                        nombre, valor = galleta.split(";", 1)[0].strip().split("=", 1)
+                        self.galletas[nombre] = valor
+                    encontrado = CSRF_META.search(respuesta.read().decode("utf8", errors="replace"))
+                self.csrf = encontrado.group(1) if encontrado else ""
+            return self.csrf
+
+    def __call__(self, entrada: dict):
+        """Enviar la petición, entrega el estado de la respuesta; las que suben archivos no se envían"""
+        if entrada.get("u"):
+            return None
+        url = self.base_url + entrada["p"]
+        if entrada.get("q"):
+            url += "?" + urlencode(entrada["q"], doseq=True)
+        cuerpo = None
+        encabezados = {}
+        if entrada["m"] not in METODOS_LECTURA:
+            token = self.token()
+            encabezados["X-CSRFToken"] = token
+            if entrada.get("f"):
+                # El csrf_token grabado está oculto, Flask-WTF lo revisa antes que el encabezado
+                formulario = {campo: (token if campo == CSRF_CAMPO else valor) for campo, valor in entrada["f"].items()}
+                cuerpo = urlencode(formulario, doseq=True).encode()
+        elif entrada.get("f"):
+            cuerpo = urlencode(entrada["f"], doseq=True).encode()
+        if self.galletas:
+            encabezados["Cookie"] = self.cookie()
+        peticion = Request(url, data=cuerpo, headers=encabezados, method=entrada["m"])
+        try:
+            with urlopen(peticion) as respuesta:
+                respuesta.read()
+                return respuesta.status
+        except HTTPError as error:
+            return error.code
+
+
+def replay(entradas: list, enviar, hilos: int = 4, velocidad: float = 1.0):
+    """Reproducir las peticiones, entrega por cada una el endpoint, el estado y los milisegundos"""
+    resultados = []
+    candado = threading.Lock()
+
+    def ejecutar(entrada):
+        inicio = time.perf_counter()
+        estado = enviar(entrada)
+        milisegundos = (time.perf_counter() - inicio) * 1000
+        with candado:
+            resultados.append((entrada["e"] or entrada["p"], estado, milisegundos))
+
+    if not entradas:
+        return resultados
+    primero = entradas[0]["t"]
+    comienzo = time.perf_counter()
+    futuros = []
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        for entrada in entradas:
+            if velocidad > 0:
+                espera = (entrada["t"] - primero) / velocidad - (time.perf_counter() - comienzo)
+                if espera > 0:
+                    time.sleep(espera)
+            futuros.append(ejecutor.submit(ejecutar, entrada))
+    for futuro in futuros:
+        futuro.result()  # Levantar los errores de los envíos
+    return resultados
+
+
+def report(resultados: list):
+    """Latencias por endpoint en milisegundos de las respuestas sin error, del más lento al más rápido por su percentil 95"""
+    por_endpoint = {}
+    for endpoint, estado, milisegundos in resultados:
+        por_endpoint.setdefault(endpoint, []).append((estado, milisegundos))
+    resumenes = []
+    for endpoint, muestras in por_endpoint.items():
+        duraciones = sorted(milisegundos for estado, milisegundos in muestras if estado is not None and estado < ESTADO_ERROR)
+        resumenes.append(
+            {
+                "endpoint": endpoint,
+                "cantidad": len(duraciones),
+                "omitidas": sum(1 for estado, _ in muestras if estado is None),
+                "errores": sum(1 for estado, _ in muestras if estado is not None and estado >= ESTADO_ERROR),
+                "p50": round(percentile(duraciones, 50), 1),
+                "p95": round(percentile(duraciones, 95), 1),
+                "p99": round(percentile(duraciones, 99), 1),
+                "maxima": round(duraciones[-1], 1) if duraciones else 0,
+            }
+        )
+    return sorted(resumenes, key=lambda resumen: resumen["p95"], reverse=True)
+
+
+def init_app(app):
+    """Anotar las peticiones si está configurado TRAFICO_DIRECTORIO"""
+
+    @app.before_request
+    def start_capture():
+        """Tomar la hora de inicio"""
+        if current_app.config.get("TRAFICO_DIRECTORIO") and request.endpoint != "static":
+            g.trafico_inicio = (time.time(), time.perf_counter())
+
+    @app.after_request
+    def capture(response):
+        """Anotar la petición"""
+        inicio = g.pop("trafico_inicio", None)
+        if inicio is None:
+            return response
+        entrada = {
+            "t": round(inicio[0], 3),
+            "m": request.method,
+            "p": request.path,
+            "e": request.endpoint,
+            "r": role_class(),
+            "s": response.status_code,
+            "d": round((time.perf_counter() - inicio[1]) * 1000, 1),
+        }
+        if request.args:
+            entrada["q"] = sanitize(request.args.to_dict(flat=False))
+        if request.form:
+            entrada["f"] = sanitize(request.form.to_dict(flat=False))
+        if request.files:
+            entrada["u"] = uploads()
+        try:
+            write_entry(current_app.config["TRAFICO_DIRECTORIO"], entrada)
+        except OSError as error:
+            current_app.logger.warning("No se pudo anotar el tráfico: %s", error)
+        return response
@@ -0,0 +1,69 @@
+"""
+Búsqueda aproximada de nombres con trigramas
+
+En PostgreSQL los nombres tienen índices GIN con gin_trgm_ops de pg_trgm, que sirven tanto para LIKE '%...%' como para
+el operador <% de similitud por palabra, así una búsqueda en ventanilla no recorre la tabla completa. Los resultados
+se ordenan del más al menos parecido y se descartan los que no llegan a UMBRAL. Los nombres se guardan normalizados
+con safe_string (mayúsculas, sin acentos), por eso lo que se busca se normaliza igual.
+En otras bases de datos, como SQLite en desarrollo, se busca con LIKE sin ordenar por similitud.
+"""
+from sqlalchemy import DDL, event
+
+from lib.safe_string import safe_string
+from plataforma_web.extensions import db
+
+EXTENSION_SQL = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+UMBRAL = 0.5  # Similitud mínima por palabra, de 0 a 1
+
+
+def trigram_index(nombre: str, expresion: str):
+    """Índice GIN de trigramas sobre una columna o una expresión, sólo en PostgreSQL"""
+    return db.Index(nombre, db.text(f"({expresion}) gin_trgm_ops"), postgresql_using="gin", info={"dialecto": "postgresql"}).ddl_if(dialect="postgresql")
+
+
+def is_postgresql():
+    """¿La base de datos es PostgreSQL?"""
+    return db.engine.dialect.name == "postgresql"
+
+
+def normalize(texto: str):
+    """Normalizar lo que se busca igual que los nombres guardados"""
+    return safe_string(texto)
+
+
+def filter_similar(consulta, columna, texto: str):
+    """Filtrar por los nombres que contienen o se parecen al texto"""
+    texto = normalize(texto)
+    if is_postgresql():
+        return consulta.filter(db.or_(columna.like(f"%{texto}%"), db.literal(texto).op("<%")(columna)))
+    return consulta.filter(columna.like(f"%{texto}%"))
+
+
+def order_by_similarity(consulta, columna, texto: str):
+    """Ordenar del nombre más al menos parecido al texto"""
+    if is_postgresql():
+        return consulta.order_by(db.func.word_similarity(normalize(texto), columna).desc())
+    return consulta
+
+
+def set_threshold(dbapi_connection, connection_record):
+    """Fijar la similitud mínima del operador <% en cada conexión nueva"""
+    # Fuera de una transacción, si no el rollback del pool al devolver la conexión deshace el SET
+    autocommit = dbapi_connection.autocommit
+    dbapi_connection.autocommit = True
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET pg_trgm.word_similarity_threshold = {UMBRAL}")
+    cursor.close()
+    dbapi_connection.autocommit = autocommit
+
+
+def init_app(app, db):
+    """Fijar la similitud mínima en los motores de PostgreSQL, el principal y la réplica"""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "postgresql":
+                event.listen(engine, "connect", set_threshold)
+
+
+# Al crear las tablas en PostgreSQL primero se crea la extensión
+event.listen(db.metadata, "before_create", DDL(EXTENSION_SQL).execute_if(dialect="postgresql"))
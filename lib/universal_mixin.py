@@ -1,6 +1,12 @@
 """
 UniversalMixin define las columnas y métodos comunes de todos los modelos
+
+Fuera de bulk() cada save, delete y recover confirma su propia transacción, o con commit=False sólo hace flush
+para tener el id y lo confirma el siguiente save, como el de la bitácora. Dentro de bulk() se juntan en la sesión,
+se hace flush cada LOTE registros y se confirma una sola vez al salir, así los escuchas de after_commit, como
+la invalidación de los catálogos, se ejecutan una vez por lote y no una vez por registro.
 """
+from contextlib import contextmanager
 import os
 import re
 from sqlalchemy.sql import func
@@ -10,6 +16,27 @@ from plataforma_web.extensions import db
 hashids = Hashids(salt=os.environ.get("SALT", "Esta es una muy mala cadena aleatoria"), min_length=8)
 hashid_regexp = re.compile("[0-9a-zA-Z]{8}")
 
+LOTE = 500  # Registros por flush dentro de bulk()
+BULK = "bulk"  # Llave en session.info de la unidad de trabajo abierta
+
+
+@contextmanager
+def bulk(lote: int = LOTE):
+    """Juntar los save, delete y recover del bloque y confirmarlos una sola vez, si hay un error se deshacen"""
+    sesion = db.session
+    if BULK in sesion.info:
+        yield  # Dentro de otra unidad de trabajo, la de afuera confirma
+        return
+    sesion.info[BULK] = {"lote": lote, "pendientes": 0}
+    try:
+        yield
+        sesion.commit()
+    except Exception:
+        sesion.rollback()
+        raise
+    finally:
+        sesion.info.pop(BULK, None)
+
 
 class UniversalMixin(object):
     """Columnas y métodos comunes a todas las tablas"""
@@ -18,24 +45,33 @@ class UniversalMixin(object):
     modificado = db.Column(db.DateTime, onupdate=func.now(), server_default=func.now())
     estatus = db.Column(db.String(1), server_default="A", nullable=False)
 
-    def delete(self):
+    def delete(self, commit: bool = True):
         """Eliminar registro"""
         if self.estatus == "A":
             self.estatus = "B"
-            return self.save()
+            return self.save(commit)
         return None
 
-    def recover(self):
+    def recover(self, commit: bool = True):
         """Recuperar registro"""
         if self.estatus == "B":
             self.estatus = "A"
-            return self.save()
+            return self.save(commit)
         return None
 
-    def save(self):
-        """Guardar registro"""
+    def save(self, commit: bool = True):
+        """Guardar registro, sin confirmar si commit es falso (sólo flush) o si está dentro de bulk()"""
         db.session.add(self)
-        db.session.commit()
+        unidad = db.session.info.get(BULK)
+        if unidad is not None:
+            unidad["pendientes"] += 1
+            if unidad["pendientes"] >= unidad["lote"]:
+                db.session.flush()
+                unidad["pendientes"] = 0
+        elif commit:
+            db.session.commit()
+        else:
+            db.session.flush()
         return self
 
     def encode_id(self):
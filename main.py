@@ -2,9 +2,10 @@
 Google Cloud App Engine toma main.py
 """
 from plataforma_web import app
+from plataforma_web.extensions import socketio
 
 app = app.create_app()
 
 
 if __name__ == '__main__':
-    app.run()
+    socketio.run(app)
@@ -3,8 +3,10 @@ Flask App
 """
 from flask import Flask
 from redis import Redis
-import rq
-from plataforma_web.extensions import csrf, db, login_manager, moment
+from lib import audit, profiler, replicas, request_metrics, traffic, trigrams
+from lib.identities import load_identity
+from lib.queues import COLA_INTERACTIVAS, TaskQueues
+from plataforma_web.extensions import csrf, db, login_manager, moment, socketio
 
 
 from plataforma_web.blueprints.abogados.views import abogados
@@ -19,6 +21,7 @@ from plataforma_web.blueprints.distritos.views import distritos
 from plataforma_web.blueprints.edictos.views import edictos
 from plataforma_web.blueprints.entradas_salidas.views import entradas_salidas
 from plataforma_web.blueprints.epocas.views import epocas
+from plataforma_web.blueprints.expedientes_registros.views import expedientes_registros
 from plataforma_web.blueprints.funcionarios.views import funcionarios
 from plataforma_web.blueprints.glosas.views import glosas
 from plataforma_web.blueprints.listas_de_acuerdos.views import listas_de_acuerdos
@@ -47,7 +50,6 @@ from plataforma_web.blueprints.usuarios.views import usuarios
 from plataforma_web.blueprints.usuarios_roles.views import usuarios_roles
 from plataforma_web.blueprints.ventanillas.views import ventanillas
 
-from plataforma_web.blueprints.usuarios.models import Usuario
 
 
 def create_app():
@@ -58,9 +60,12 @@ def create_app():
     app.config.from_object("config.settings")
     # Cargar la configuración para desarrollo en instance/settings.py
     app.config.from_pyfile("settings.py", silent=True)
+    # Cargar la configuración del archivo en PLATAFORMA_WEB_SETTINGS, como la de las pruebas de rendimiento
+    app.config.from_envvar("PLATAFORMA_WEB_SETTINGS", silent=True)
     # Redis
     app.redis = Redis.from_url(app.config["REDIS_URL"])
-    app.task_queue = rq.Queue(app.config["TASK_QUEUE"], connection=app.redis, default_timeout=1920)
+    app.task_queues = TaskQueues(app.config["TASK_QUEUE"], connection=app.redis)
+    app.task_queue = app.task_queues.get_queue(COLA_INTERACTIVAS)
     # Cargar los blueprints
     app.register_blueprint(abogados)
     app.register_blueprint(audiencias)
@@ -74,6 +79,7 @@ def create_app():
     app.register_blueprint(edictos)
     app.register_blueprint(entradas_salidas)
     app.register_blueprint(epocas)
+    app.register_blueprint(expedientes_registros)
     app.register_blueprint(funcionarios)
     app.register_blueprint(glosas)
     app.register_blueprint(listas_de_acuerdos)
@@ -103,7 +109,7 @@ def create_app():
     app.register_blueprint(ventanillas)
     # Cargar las extensiones
     extensions(app)
-    authentication(Usuario)
+    authentication()
     # Entregar app
     return app
 
@@ -112,14 +118,21 @@ def extensions(app):
     """Incorporar las extensiones"""
     csrf.init_app(app)
     db.init_app(app)
+    request_metrics.init_app(app)
+    profiler.init_app(app)
+    traffic.init_app(app)
+    replicas.init_app(app, db)
+    trigrams.init_app(app, db)
+    audit.init_app(app)
     login_manager.init_app(app)
     moment.init_app(app)
+    socketio.init_app(app, message_queue=app.config["REDIS_URL"])
 
 
-def authentication(user_model):
+def authentication():
     """Inicializar Flask-Login"""
     login_manager.login_view = "usuarios.login"
 
     @login_manager.user_loader
     def load_user(uid):
-        return user_model.query.get(uid)
+        return load_identity(uid)
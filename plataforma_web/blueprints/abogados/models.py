@@ -2,6 +2,7 @@
 Abogados, modelos
 """
 from plataforma_web.extensions import db
+from lib.trigrams import trigram_index
 from lib.universal_mixin import UniversalMixin
 
 
@@ -20,6 +21,9 @@ class Abogado(db.Model, UniversalMixin):
     libro = db.Column(db.String(24), nullable=False)
     nombre = db.Column(db.String(256), nullable=False)
 
+    # Índices
+    __table_args__ = (trigram_index("ix_abogados_nombre_trgm", "nombre"),)
+
     def __repr__(self):
         """ Representación """
         return f"<Abogado {self.nombre}>"
@@ -5,14 +5,13 @@ import json
 from flask import Blueprint, flash, redirect, request, render_template, url_for
 from flask_login import current_user, login_required
 
-from lib import datatables
+from lib import datatables, trigrams
 from lib.safe_string import safe_string, safe_message
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.abogados.models import Abogado
 from plataforma_web.blueprints.abogados.forms import AbogadoForm, AbogadoSearchForm
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 abogados = Blueprint("abogados", __name__, template_folder="templates")
@@ -107,7 +106,8 @@ def datatable_json():
     if "libro" in request.form:
         consulta = consulta.filter_by(libro=safe_string(request.form["libro"]))
     if "nombre" in request.form:
-        consulta = consulta.filter(Abogado.nombre.like("%" + safe_string(request.form["nombre"]) + "%"))
+        consulta = trigrams.filter_similar(consulta, Abogado.nombre, request.form["nombre"])
+        consulta = trigrams.order_by_similarity(consulta, Abogado.nombre, request.form["nombre"])
     registros = consulta.order_by(Abogado.id.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -147,9 +147,9 @@ def new():
             libro=safe_string(form.libro.data),
             fecha=form.fecha.data,
         )
-        abogado.save()
+        abogado.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo abogado registrado {abogado.nombre} con número {abogado.numero}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -171,9 +171,9 @@ def edit(abogado_id):
         abogado.nombre = safe_string(form.nombre.data)
         abogado.libro = safe_string(form.libro.data)
         abogado.fecha = form.fecha.data
-        abogado.save()
+        abogado.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado abogado registrado {abogado.nombre}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -194,9 +194,9 @@ def delete(abogado_id):
     """Eliminar Abogado"""
     abogado = Abogado.query.get_or_404(abogado_id)
     if abogado.estatus == "A":
-        abogado.delete()
+        abogado.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado abogado registrado {abogado.nombre}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -212,9 +212,9 @@ def recover(abogado_id):
     """Recuperar Abogado"""
     abogado = Abogado.query.get_or_404(abogado_id)
     if abogado.estatus == "B":
-        abogado.recover()
+        abogado.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado abogado registrado {abogado.nombre}"),
             url=url_for("abogados.detail", abogado_id=abogado.id),
@@ -59,6 +59,11 @@ class Audiencia(db.Model, UniversalMixin):
     # delitos
     origen = db.Column(db.String(256), nullable=False, default="", server_default="")
 
+    # Índices, los parciales sólo con los activos que son los que consultan los listados
+    __table_args__ = (
+        db.Index("ix_audiencias_autoridad_tiempo_activos", autoridad_id, tiempo.desc(), postgresql_where=db.text("estatus = 'A'"), sqlite_where=db.text("estatus = 'A'")),
+    )
+
     def __repr__(self):
         """Representación"""
         return "<Audiencia>"
@@ -1,11 +1,12 @@
 """
 Audiencias, vistas
 """
+from datetime import date, timedelta
 import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
-from lib import datatables
+from lib import agenda, catalogs, datatables
 from lib.safe_string import safe_expediente, safe_message, safe_string
 from lib.time_utc import combine_to_utc, decombine_to_local, join_for_message
 from plataforma_web.blueprints.usuarios.decorators import permission_required
@@ -14,8 +15,6 @@ from plataforma_web.blueprints.audiencias.models import Audiencia
 from plataforma_web.blueprints.audiencias.forms import AudienciaGenericaForm, AudienciaMapoForm, AudienciaDipeForm, AudienciaSapeForm
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.distritos.models import Distrito
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 audiencias = Blueprint("audiencias", __name__, template_folder="templates")
@@ -103,18 +102,18 @@ def list_distritos():
     """Listado de Distritos"""
     return render_template(
         "audiencias/list_distritos.jinja2",
-        distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
+        distritos=catalogs.distritos_judiciales(),
     )
 
 
 @audiencias.route("/audiencias/distrito/<int:distrito_id>")
 def list_autoridades(distrito_id):
     """Listado de Autoridades de un distrito"""
-    distrito = Distrito.query.get_or_404(distrito_id)
+    distrito = catalogs.get_or_404("distritos", distrito_id)
     return render_template(
         "audiencias/list_autoridades.jinja2",
         distrito=distrito,
-        autoridades=Autoridad.query.filter(Autoridad.distrito == distrito).filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+        autoridades=catalogs.autoridades_jurisdiccionales(distrito_id=distrito.id),
     )
 
 
@@ -165,9 +164,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     registros = consulta.order_by(Audiencia.tiempo.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -209,9 +208,9 @@ def datatable_json_admin():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     registros = consulta.order_by(Audiencia.creado.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
@@ -243,6 +242,17 @@ def datatable_json_admin():
     return datatables.output(draw, total, data)
 
 
+@audiencias.route("/audiencias/calendario_json")
+def calendar_json():
+    """Audiencias activas de una autoridad desde una fecha y antes de otra, por columnas, para las vistas de semana y mes"""
+    autoridad = catalogs.get_autoridad(request.args.get("autoridad_id", current_user.autoridad_id, type=int))
+    if autoridad is None:
+        autoridad = current_user.autoridad
+    desde = request.args.get("desde", agenda.week_start(date.today()), type=date.fromisoformat)
+    hasta = request.args.get("hasta", desde + timedelta(days=7), type=date.fromisoformat)
+    return agenda.get_range(autoridad, desde, hasta)
+
+
 @audiencias.route("/audiencias/<int:audiencia_id>")
 def detail(audiencia_id):
     """Detalle de una Audiencia"""
@@ -317,11 +327,11 @@ def new_generica():
             actores=safe_string(form.actores.data),
             demandados=safe_string(form.demandados.data),
         )
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencia en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -377,11 +387,11 @@ def new_mapo():
             causa_penal=safe_string(form.causa_penal.data),
             delitos=safe_string(form.delitos.data),
         )
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencia en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -446,11 +456,11 @@ def new_dipe():
             expediente_origen=safe_string(form.expediente_origen.data),
             imputados=safe_string(form.imputados.data),
         )
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencia en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -516,11 +526,11 @@ def new_sape():
             delitos=safe_string(form.delitos.data),
             origen=safe_string(form.origen.data),
         )
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva audiencia en {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -612,11 +622,11 @@ def edit_generica(audiencia_id):
         audiencia.expediente = expediente
         audiencia.actores = safe_string(form.actores.data)
         audiencia.demandados = safe_string(form.demandados.data)
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -682,11 +692,11 @@ def edit_mapo(audiencia_id):
         audiencia.caracter = safe_string(form.caracter.data)
         audiencia.causa_penal = safe_string(form.causa_penal.data)
         audiencia.delitos = safe_string(form.delitos.data)
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -762,11 +772,11 @@ def edit_dipe(audiencia_id):
         audiencia.toca = safe_string(form.toca.data)
         audiencia.expediente_origen = safe_string(form.expediente_origen.data)
         audiencia.imputados = safe_string(form.imputados.data)
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -845,11 +855,11 @@ def edit_sape(audiencia_id):
         audiencia.expediente_origen = safe_string(form.expediente_origen.data)
         audiencia.delitos = safe_string(form.delitos.data)
         audiencia.origen = safe_string(form.origen.data)
-        audiencia.save()
+        audiencia.save(commit=False)
 
         # Registrar en bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada la audiencia de {autoridad.clave} para {tiempo_mensaje}"),
             url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -882,9 +892,9 @@ def delete(audiencia_id):
     audiencia = Audiencia.query.get_or_404(audiencia_id)
     if audiencia.estatus == "A":
         if current_user.can_admin("AUDIENCIAS") or current_user.autoridad_id == audiencia.autoridad_id:
-            audiencia.delete()
+            audiencia.delete(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message("Eliminada la audiencia"),
                 url=url_for("audiencias.detail", audiencia_id=audiencia.id),
@@ -903,9 +913,9 @@ def recover(audiencia_id):
     audiencia = Audiencia.query.get_or_404(audiencia_id)
     if audiencia.estatus == "B":
         if current_user.can_admin("AUDIENCIAS") or current_user.autoridad_id == audiencia.autoridad_id:
-            audiencia.recover()
+            audiencia.recover(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message("Recuperada la audiencia"),
                 url=url_for("audiencias.detail", audiencia_id=audiencia.id),
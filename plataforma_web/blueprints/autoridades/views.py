@@ -14,7 +14,6 @@ from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.autoridades.forms import AutoridadEditForm, AutoridadNewForm
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.edictos.models import Edicto
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
 from plataforma_web.blueprints.sentencias.models import Sentencia
@@ -260,9 +259,9 @@ def new():
             directorio_glosas=directorio_glosas,
             limite_dias_listas_de_acuerdos=limite_dias_listas_de_acuerdos,
         )
-        autoridad.save()
+        autoridad.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -294,9 +293,9 @@ def edit(autoridad_id):
         autoridad.directorio_edictos = form.directorio_edictos.data.strip()
         autoridad.directorio_glosas = form.directorio_glosas.data.strip()
         autoridad.limite_dias_listas_de_acuerdos = form.limite_dias_listas_de_acuerdos.data
-        autoridad.save()
+        autoridad.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -327,9 +326,9 @@ def delete(autoridad_id):
     """Eliminar Autoridad"""
     autoridad = Autoridad.query.get_or_404(autoridad_id)
     if autoridad.estatus == "A":
-        autoridad.delete()
+        autoridad.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminada autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
@@ -346,9 +345,9 @@ def recover(autoridad_id):
     """Recuperar Autoridad"""
     autoridad = Autoridad.query.get_or_404(autoridad_id)
     if autoridad.estatus == "B":
-        autoridad.recover()
+        autoridad.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperada autoridad {autoridad.clave}"),
             url=url_for("autoridades.detail", autoridad_id=autoridad.id),
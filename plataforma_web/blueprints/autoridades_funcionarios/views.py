@@ -10,7 +10,6 @@ from plataforma_web.blueprints.usuarios.decorators import permission_required
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.funcionarios.models import Funcionario
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.autoridades_funcionarios.models import AutoridadFuncionario
 from plataforma_web.blueprints.autoridades_funcionarios.forms import AutoridadFuncionarioForm, AutoridadFuncionarioWithAutoridadForm, AutoridadFuncionarioWithFuncionarioForm
@@ -76,9 +75,9 @@ def new():
             funcionario=funcionario,
             descripcion=descripcion,
         )
-        autoridad_funcionario.save()
+        autoridad_funcionario.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo autoridad-funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
@@ -110,9 +109,9 @@ def new_with_autoridad(autoridad_id):
             funcionario=funcionario,
             descripcion=descripcion,
         )
-        autoridad_funcionario.save()
+        autoridad_funcionario.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo autoridad-funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
@@ -146,9 +145,9 @@ def new_with_funcionario(funcionario_id):
             funcionario=funcionario,
             descripcion=descripcion,
         )
-        autoridad_funcionario.save()
+        autoridad_funcionario.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo autoridad-funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
@@ -171,9 +170,9 @@ def delete(autoridad_funcionario_id):
     """Eliminar Autoridad-Funcionario"""
     autoridad_funcionario = AutoridadFuncionario.query.get_or_404(autoridad_funcionario_id)
     if autoridad_funcionario.estatus == "A":
-        autoridad_funcionario.delete()
+        autoridad_funcionario.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado autoridad-funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
@@ -190,9 +189,9 @@ def recover(autoridad_funcionario_id):
     """Recuperar Autoridad-Funcionario"""
     autoridad_funcionario = AutoridadFuncionario.query.get_or_404(autoridad_funcionario_id)
     if autoridad_funcionario.estatus == "B":
-        autoridad_funcionario.recover()
+        autoridad_funcionario.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado autoridad-funcionario {autoridad_funcionario.descripcion}"),
             url=url_for("autoridades_funcionarios.detail", autoridad_funcionario_id=autoridad_funcionario.id),
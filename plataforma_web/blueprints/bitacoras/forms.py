@@ -0,0 +1,14 @@
+"""
+Bitácoras, formularios
+"""
+from flask_wtf import FlaskForm
+from wtforms import DateField, SubmitField
+from wtforms.validators import Optional
+
+
+class BitacoraSearchForm(FlaskForm):
+    """Formulario para buscar Bitácoras"""
+
+    fecha_desde = DateField("Fecha desde", validators=[Optional()])
+    fecha_hasta = DateField("Fecha hasta", validators=[Optional()])
+    buscar = SubmitField("Buscar")
@@ -2,13 +2,14 @@
 Bitácoras, modelos
 """
 from plataforma_web.extensions import db
+from lib import audit, catalogs
 from lib.universal_mixin import UniversalMixin
 
 
 class Bitacora(db.Model, UniversalMixin):
     """Bitacora"""
 
-    # Nombre de la tabla
+    # Nombre de la tabla, en PostgreSQL se particiona por mes de creado con plataforma_web particiones convertir
     __tablename__ = "bitacoras"
 
     # Clave primaria
@@ -24,6 +25,26 @@ class Bitacora(db.Model, UniversalMixin):
     descripcion = db.Column(db.String(256), nullable=False)
     url = db.Column(db.String(512), nullable=False, default="", server_default="")
 
+    # Índices, el listado y los reportes ordenan y filtran por tiempo de creación
+    __table_args__ = (
+        db.Index("ix_bitacoras_creado", db.text("creado DESC")),
+        db.Index("ix_bitacoras_modulo_creado", modulo_id, db.text("creado DESC")),
+    )
+
+    @property
+    def modulo_nombre(self):
+        """Nombre del módulo"""
+        return self.modulo.nombre if self.modulo is not None else None
+
+    @modulo_nombre.setter
+    def modulo_nombre(self, nombre):
+        """Asignar el módulo por su nombre, sin consultar la base de datos"""
+        self.modulo_id = catalogs.modulo_id(nombre)
+
+    def save(self, commit: bool = True):
+        """Guardar por medio del registro de auditoría, sin confirmar otra transacción en la petición"""
+        return audit.record(self, commit)
+
     def __repr__(self):
         """Representación"""
         return f"<Bitacora {self.creado} {self.descripcion}>"
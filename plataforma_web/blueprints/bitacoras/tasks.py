@@ -0,0 +1,50 @@
+"""
+Bitácoras, tareas para ejecutar en el fondo
+
+- crear_particiones: Crear las particiones de los meses siguientes de bitácoras y entradas y salidas
+- drenar_auditoria: Escribir en la base de datos los eventos de auditoría que esperan en Redis
+"""
+import logging
+
+from lib import audit, partitions
+from lib.task_metrics import measure_task
+from plataforma_web.app import create_app
+from plataforma_web.extensions import db
+
+bitacora = logging.getLogger(__name__)
+bitacora.setLevel(logging.INFO)
+formato = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+empunadura = logging.FileHandler("bitacoras.log")
+empunadura.setFormatter(formato)
+bitacora.addHandler(empunadura)
+
+app = create_app()
+app.app_context().push()
+
+
+@measure_task
+def crear_particiones():
+    """Crear las particiones de los meses siguientes de bitácoras y entradas y salidas"""
+    if db.engine.dialect.name != "postgresql":
+        return "Las particiones sólo son para PostgreSQL."
+    tablas = []
+    for tabla in partitions.TABLAS:
+        with db.engine.begin() as conexion:
+            if partitions.is_partitioned(conexion, tabla):
+                partitions.create_future_partitions(conexion, tabla)
+                tablas.append(tabla)
+    mensaje = f"Particiones de {partitions.MESES_ADELANTE} meses adelante revisadas en {', '.join(tablas) or 'ninguna tabla'}."
+    bitacora.info(mensaje)
+    return mensaje
+
+
+@measure_task
+def drenar_auditoria():
+    """Escribir en la base de datos los eventos de auditoría que esperan en Redis"""
+    total = 0
+    while True:
+        cantidad = audit.drain()
+        total += cantidad
+        if cantidad < audit.LOTE:
+            break
+    return f"Se escribieron {total} eventos de auditoría."
@@ -1,11 +1,15 @@
 """
 Bitácoras, vistas
 """
-from flask import Blueprint, render_template, url_for
+import json
+
+from flask import Blueprint, render_template, request, url_for
 from flask_login import login_required
 
 from lib import datatables
+from lib.partitions import filter_created, recent_start
 
+from plataforma_web.blueprints.bitacoras.forms import BitacoraSearchForm
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.decorators import permission_required
@@ -20,7 +24,32 @@ bitacoras = Blueprint("bitacoras", __name__, template_folder="templates")
 @permission_required(MODULO, Permiso.VER)
 def list_active():
     """Listado de bitácoras"""
-    return render_template("bitacoras/list.jinja2")
+    fecha_desde = recent_start().isoformat()
+    return render_template(
+        "bitacoras/list.jinja2",
+        filtros=json.dumps({"fecha_desde": fecha_desde}),
+        titulo="Bitácoras desde " + fecha_desde,
+    )
+
+
+@bitacoras.route("/bitacoras/buscar", methods=["GET", "POST"])
+@login_required
+@permission_required(MODULO, Permiso.VER)
+def search():
+    """Buscar Bitácoras por periodo"""
+    form_search = BitacoraSearchForm()
+    if form_search.validate_on_submit():
+        busqueda = {"fecha_desde": (form_search.fecha_desde.data or recent_start()).strftime("%Y-%m-%d")}
+        titulos = ["desde " + busqueda["fecha_desde"]]
+        if form_search.fecha_hasta.data:
+            busqueda["fecha_hasta"] = form_search.fecha_hasta.data.strftime("%Y-%m-%d")
+            titulos.append("hasta " + busqueda["fecha_hasta"])
+        return render_template(
+            "bitacoras/list.jinja2",
+            filtros=json.dumps(busqueda),
+            titulo="Bitácoras " + " ".join(titulos),
+        )
+    return render_template("bitacoras/search.jinja2", form=form_search)
 
 
 @bitacoras.route("/bitacoras/datatable_json", methods=["GET", "POST"])
@@ -31,7 +60,7 @@ def datatable_json():
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = datatables.get_parameters()
     # Consultar
-    consulta = Bitacora.query
+    consulta = filter_created(Bitacora.query, Bitacora.creado, request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     registros = consulta.order_by(Bitacora.creado.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar un listado de diccionarios
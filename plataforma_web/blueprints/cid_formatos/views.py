@@ -17,7 +17,6 @@ from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.cid_formatos.forms import CIDFormatoForm
 from plataforma_web.blueprints.cid_formatos.models import CIDFormato
 from plataforma_web.blueprints.cid_procedimientos.models import CIDProcedimiento
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 cid_formatos = Blueprint("cid_formatos", __name__, template_folder="templates")
@@ -114,10 +113,10 @@ def new(cid_procedimiento_id):
             # Actualizar el registro con el nombre de archivo y la URL
             cid_formato.archivo = archivo_nombre_original
             cid_formato.url = url
-            cid_formato.save()
+            cid_formato.save(commit=False)
             # Registrar la acción en la bitácora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo formato {cid_formato.descripcion}"),
                 url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -138,9 +137,9 @@ def edit(cid_formato_id):
     form = CIDFormatoForm()
     if form.validate_on_submit():
         cid_formato.descripcion = safe_string(form.descripcion.data)
-        cid_formato.save()
+        cid_formato.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado el formato {cid_formato.descripcion}"),
             url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -159,9 +158,9 @@ def delete(cid_formato_id):
     """Eliminar CID Formato"""
     cid_formato = CIDFormato.query.get_or_404(cid_formato_id)
     if cid_formato.estatus == "A":
-        cid_formato.delete()
+        cid_formato.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado el formato {cid_formato.descripcion}"),
             url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -177,9 +176,9 @@ def recover(cid_formato_id):
     """Recuperar CID Formato"""
     cid_formato = CIDFormato.query.get_or_404(cid_formato_id)
     if cid_formato.estatus == "B":
-        cid_formato.recover()
+        cid_formato.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado el formato {cid_formato.descripcion}"),
             url=url_for("cid_formatos.detail", cid_formato_id=cid_formato.id),
@@ -18,6 +18,7 @@ import sendgrid
 from sendgrid.helpers.mail import Email, To, Content, Mail
 
 from lib.tasks import set_task_progress, set_task_error
+from lib.task_metrics import count_storage_calls, measure_task
 from plataforma_web.app import create_app
 from plataforma_web.blueprints.cid_procedimientos.models import CIDProcedimiento
 from plataforma_web.blueprints.cid_formatos.models import CIDFormato
@@ -38,6 +39,7 @@ DEPOSITO_DIR = "cid_procedimientos"
 TEMPLATES_DIR = "plataforma_web/blueprints/cid_procedimientos/templates/cid_procedimientos"
 
 
+@measure_task
 def crear_pdf(cid_procedimiento_id: int, usuario_id: int = None, accept_reject_url: str = ""):
     """Crear PDF"""
 
@@ -193,6 +195,7 @@ def crear_pdf(cid_procedimiento_id: int, usuario_id: int = None, accept_reject_u
         bucket = storage_client.bucket(cloud_stotage_deposito)
         blob = bucket.blob(DEPOSITO_DIR + "/" + archivo)
         blob.upload_from_string(pdf, content_type="application/pdf")
+        count_storage_calls()
         url = blob.public_url
 
     # Eliminar archivos temporales
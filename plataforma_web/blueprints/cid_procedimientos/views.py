@@ -14,7 +14,6 @@ from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.cid_procedimientos.forms import CIDProcedimientoForm, CIDProcedimientoAcceptRejectForm
 from plataforma_web.blueprints.cid_procedimientos.models import CIDProcedimiento
 from plataforma_web.blueprints.cid_formatos.models import CIDFormato
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.models import Usuario
 
@@ -174,9 +173,9 @@ def new():
             archivo="",
             url="",
         )
-        cid_procedimiento.save()
+        cid_procedimiento.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Procedimiento {cid_procedimiento.titulo_procedimiento}"),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -251,9 +250,9 @@ def edit(cid_procedimiento_id):
         cid_procedimiento.aprobo_puesto = form.aprobo_puesto.data
         cid_procedimiento.aprobo_email = aprobo_email
         cid_procedimiento.control_cambios = control_cambios
-        cid_procedimiento.save()
+        cid_procedimiento.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado Procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -468,21 +467,21 @@ def accept_reject(cid_procedimiento_id):
             nuevo.firma = ""
             nuevo.archivo = ""
             nuevo.url = ""
-            nuevo.save()
+            nuevo.save(commit=False)
             # Actualizar el anterior
             if original.seguimiento == "ELABORADO":
                 # Cambiar el seguimiento posterior del procedimiento elaborado
                 anterior = CIDProcedimiento.query.get(cid_procedimiento_id)
                 anterior.seguimiento_posterior = "EN REVISION"
-                anterior.save()
+                anterior.save(commit=False)
             if original.seguimiento == "REVISADO":
                 # Cambiar el seguimiento posterior del procedimiento revisado
                 anterior = CIDProcedimiento.query.get(cid_procedimiento_id)
                 anterior.seguimiento_posterior = "EN AUTORIZACION"
-                anterior.save()
+                anterior.save(commit=False)
             # Bitacora
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Aceptado el Procedimiento {nuevo.titulo_procedimiento}."),
                 url=url_for("cid_procedimientos.detail", cid_procedimiento_id=nuevo.id),
@@ -522,9 +521,9 @@ def delete(cid_procedimiento_id):
             cid_procedimiento.seguimiento = "CANCELADO POR REVISOR"
         elif cid_procedimiento.seguimiento == "EN AUTORIZACION":
             cid_procedimiento.seguimiento = "CANCELADO POR AUTORIZADOR"
-        cid_procedimiento.delete()
+        cid_procedimiento.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado Procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -550,9 +549,9 @@ def recover(cid_procedimiento_id):
             cid_procedimiento.seguimiento = "EN REVISION"
         elif cid_procedimiento.seguimiento == "CANCELADO POR AUTORIZADOR":
             cid_procedimiento.seguimiento = "EN AUTORIZACION"
-        cid_procedimiento.recover()
+        cid_procedimiento.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Procedimiento {cid_procedimiento.titulo_procedimiento}."),
             url=url_for("cid_procedimientos.detail", cid_procedimiento_id=cid_procedimiento.id),
@@ -9,7 +9,6 @@ from lib.safe_string import safe_message
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.distritos.forms import DistritoForm
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
@@ -62,9 +61,9 @@ def new():
     form = DistritoForm()
     if form.validate_on_submit():
         distrito = Distrito(nombre=form.nombre.data)
-        distrito.save()
+        distrito.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo distrito {distrito.nombre}"),
             url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -83,9 +82,9 @@ def edit(distrito_id):
     form = DistritoForm()
     if form.validate_on_submit():
         distrito.nombre = form.nombre.data
-        distrito.save()
+        distrito.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado distrito {distrito.nombre}"),
             url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -103,9 +102,9 @@ def delete(distrito_id):
     """Eliminar Distrito"""
     distrito = Distrito.query.get_or_404(distrito_id)
     if distrito.estatus == "A":
-        distrito.delete()
+        distrito.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado distrito {distrito.nombre}"),
             url=url_for("distritos.detail", distrito_id=distrito.id),
@@ -122,9 +121,9 @@ def recover(distrito_id):
     """Recuperar Distrito"""
     distrito = Distrito.query.get_or_404(distrito_id)
     if distrito.estatus == "B":
-        distrito.recover()
+        distrito.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado distrito {distrito.nombre}"),
             url=url_for("distritos.detail", distrito_id=distrito.id),
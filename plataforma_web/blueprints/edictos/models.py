@@ -28,6 +28,11 @@ class Edicto(db.Model, UniversalMixin):
     archivo = db.Column(db.String(256), nullable=False, default="", server_default="")
     url = db.Column(db.String(512), nullable=False, default="", server_default="")
 
+    # Índices, los parciales sólo con los activos que son los que consultan los listados
+    __table_args__ = (
+        db.Index("ix_edictos_autoridad_fecha_activos", autoridad_id, fecha.desc(), postgresql_where=db.text("estatus = 'A'"), sqlite_where=db.text("estatus = 'A'")),
+    )
+
     def __repr__(self):
         """Representación"""
         return f"<Edicto {self.descripcion}>"
@@ -12,6 +12,9 @@ from google.cloud import storage
 from hashids import Hashids
 from rq import get_current_job
 from lib.safe_string import safe_string
+from lib.tasks import publish_task_progress
+from lib.task_metrics import count_storage_calls, count_task_rows, measure_task
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 from plataforma_web.blueprints.autoridades.models import Autoridad
@@ -45,6 +48,7 @@ def set_task_progress(progress: int, mensaje: str = None):
             if mensaje is not None:
                 tarea.descripcion = mensaje
             tarea.save()
+            publish_task_progress(tarea, progress)
 
 
 def set_task_error(mensaje: str):
@@ -58,11 +62,13 @@ def set_task_error(mensaje: str):
             tarea.ha_terminado = True
             tarea.descripcion = mensaje
             tarea.save()
+            publish_task_progress(tarea, 100)
     bitacora.error(mensaje)
     bitacora.info("Termina")
     return mensaje
 
 
+@measure_task
 def refrescar(autoridad_id: int, usuario_id: int = None):
     """Rastrear los edictos para agregar las que no tiene y dar de baja las que no existen en la BD"""
     bitacora.info("Inicia")
@@ -98,8 +104,11 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     deposito = os.environ.get("CLOUD_STORAGE_DEPOSITO", "pjecz-pruebas")
     bucket = storage.Client().get_bucket(deposito)
     subdirectorio = f"{SUBDIRECTORIO}/{autoridad.directorio_edictos}"
-    blobs = list(bucket.list_blobs(prefix=subdirectorio))
+    blobs_iterador = bucket.list_blobs(prefix=subdirectorio)
+    blobs = list(blobs_iterador)
+    count_storage_calls(1 + blobs_iterador.page_number)
     total_en_deposito = len(blobs)
+    count_task_rows(total_en_deposito)
     if total_en_deposito == 0:
         return set_task_error(f"No existe o no hay archivos en {subdirectorio}")
     bitacora.info("- Tiene %d archivos en el depósito", total_en_deposito)
@@ -119,104 +128,107 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     contador_insertados = 0
     contador_presentes = 0
 
-    # Bucle por los archivos en el depósito
-    for blob in blobs:
-
-        # Saltar si no es un archivo PDF
-        ruta = Path(blob.name)
-        if ruta.suffix.lower() != ".pdf":
-            continue
-
-        # Saltar y quitar de la lista si se encuentra en la consulta
-        esta_en_bd = False
-        for indice, edicto in enumerate(edictos):
-            if blob.public_url == edicto.url:
-                edictos.pop(indice)
-                esta_en_bd = True
-                break
-        if esta_en_bd:
-            contador_presentes += 1
-            continue
-
-        # A partir de aquí tenemos un archivo que no está en la base de datos
-        # El nombre del archivo para un edicto debe ser como
-        # AAAA-MM-DD-EEEE-EEEE-NUMP-NUMP-DESCRIPCION-BLA-BLA-IDHASED.pdf
-
-        # Separar elementos del nombre del archivo
-        nombre_sin_extension = ruta.name[:-4]
-        elementos = re.sub(letras_digitos_regex, "-", nombre_sin_extension).strip("-").split("-")
-
-        # Tomar la fecha
-        try:
-            ano = int(elementos.pop(0))
-            mes = int(elementos.pop(0))
-            dia = int(elementos.pop(0))
-            fecha = date(ano, mes, dia)
-        except (IndexError, ValueError):
-            bitacora.warning("X Fecha incorrecta: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Descartar fechas en el futuro o muy en el pasado
-        if not limite_dt <= datetime(year=fecha.year, month=fecha.month, day=fecha.day) <= hoy_dt:
-            bitacora.warning("X Fecha fuera de rango: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Tomar el expediente
-        try:
-            numero = int(elementos[0])
-            ano = int(elementos[1])
-            expediente = str(numero) + "/" + str(ano)
-            elementos.pop(0)
-            elementos.pop(0)
-        except (IndexError, ValueError):
-            expediente = None
-
-        # Tomar el número publicación
-        try:
-            numero = int(elementos[0])
-            ano = int(elementos[1])
-            numero_publicacion = str(numero) + "/" + str(ano)
-            elementos.pop(0)
-            elementos.pop(0)
-        except (IndexError, ValueError):
-            numero_publicacion = None
-
-        # Tomar la descripción, sin el hash del id de estar presente
-        if len(elementos) > 1:
-            if re.match(hashid_regexp, elementos[-1]) is None:
-                descripcion = safe_string(" ".join(elementos))
-            else:
-                decodificado = hashids.decode(elementos[-1])
-                if isinstance(decodificado, tuple) and len(decodificado) > 0:
-                    descripcion = safe_string(" ".join(elementos[:-1]))
-                else:
+    # Insertar y dar de baja en una sola transacción
+    with bulk():
+
+        # Bucle por los archivos en el depósito
+        for blob in blobs:
+
+            # Saltar si no es un archivo PDF
+            ruta = Path(blob.name)
+            if ruta.suffix.lower() != ".pdf":
+                continue
+
+            # Saltar y quitar de la lista si se encuentra en la consulta
+            esta_en_bd = False
+            for indice, edicto in enumerate(edictos):
+                if blob.public_url == edicto.url:
+                    edictos.pop(indice)
+                    esta_en_bd = True
+                    break
+            if esta_en_bd:
+                contador_presentes += 1
+                continue
+
+            # A partir de aquí tenemos un archivo que no está en la base de datos
+            # El nombre del archivo para un edicto debe ser como
+            # AAAA-MM-DD-EEEE-EEEE-NUMP-NUMP-DESCRIPCION-BLA-BLA-IDHASED.pdf
+
+            # Separar elementos del nombre del archivo
+            nombre_sin_extension = ruta.name[:-4]
+            elementos = re.sub(letras_digitos_regex, "-", nombre_sin_extension).strip("-").split("-")
+
+            # Tomar la fecha
+            try:
+                ano = int(elementos.pop(0))
+                mes = int(elementos.pop(0))
+                dia = int(elementos.pop(0))
+                fecha = date(ano, mes, dia)
+            except (IndexError, ValueError):
+                bitacora.warning("X Fecha incorrecta: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Descartar fechas en el futuro o muy en el pasado
+            if not limite_dt <= datetime(year=fecha.year, month=fecha.month, day=fecha.day) <= hoy_dt:
+                bitacora.warning("X Fecha fuera de rango: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Tomar el expediente
+            try:
+                numero = int(elementos[0])
+                ano = int(elementos[1])
+                expediente = str(numero) + "/" + str(ano)
+                elementos.pop(0)
+                elementos.pop(0)
+            except (IndexError, ValueError):
+                expediente = None
+
+            # Tomar el número publicación
+            try:
+                numero = int(elementos[0])
+                ano = int(elementos[1])
+                numero_publicacion = str(numero) + "/" + str(ano)
+                elementos.pop(0)
+                elementos.pop(0)
+            except (IndexError, ValueError):
+                numero_publicacion = None
+
+            # Tomar la descripción, sin el hash del id de estar presente
+            if len(elementos) > 1:
+                if re.match(hashid_regexp, elementos[-1]) is None:
                     descripcion = safe_string(" ".join(elementos))
-        else:
-            descripcion = "SIN DESCRIPCION"
-
-        # Insertar
-        tiempo_local = blob.time_created.astimezone(tzlocal())
-        Edicto(
-            creado=tiempo_local,
-            modificado=tiempo_local,
-            autoridad=autoridad,
-            fecha=fecha,
-            descripcion=descripcion,
-            expediente=expediente,
-            numero_publicacion=numero_publicacion,
-            archivo=ruta.name,
-            url=blob.public_url,
-        ).save()
-        contador_insertados += 1
-
-    # Los registros que no se encontraron serán dados de baja
-    contador_borrados = 0
-    for edicto in edictos:
-        if edicto.estatus == "A":
-            edicto.delete()
-            contador_borrados += 1
+                else:
+                    decodificado = hashids.decode(elementos[-1])
+                    if isinstance(decodificado, tuple) and len(decodificado) > 0:
+                        descripcion = safe_string(" ".join(elementos[:-1]))
+                    else:
+                        descripcion = safe_string(" ".join(elementos))
+            else:
+                descripcion = "SIN DESCRIPCION"
+
+            # Insertar
+            tiempo_local = blob.time_created.astimezone(tzlocal())
+            Edicto(
+                creado=tiempo_local,
+                modificado=tiempo_local,
+                autoridad=autoridad,
+                fecha=fecha,
+                descripcion=descripcion,
+                expediente=expediente,
+                numero_publicacion=numero_publicacion,
+                archivo=ruta.name,
+                url=blob.public_url,
+            ).save()
+            contador_insertados += 1
+
+        # Los registros que no se encontraron serán dados de baja
+        contador_borrados = 0
+        for edicto in edictos:
+            if edicto.estatus == "A":
+                edicto.delete()
+                contador_borrados += 1
 
     # Mensaje final
     mensajes = []
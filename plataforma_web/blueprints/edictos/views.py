@@ -11,17 +11,15 @@ from google.cloud import storage
 from werkzeug.datastructures import CombinedMultiDict
 from werkzeug.utils import secure_filename
 
-from lib import datatables
+from lib import catalogs, datatables
 from lib.safe_string import safe_expediente, safe_message, safe_numero_publicacion, safe_string
 from lib.time_to_text import dia_mes_ano, mes_en_palabra
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.edictos.forms import EdictoEditForm, EdictoNewForm, EdictoSearchForm, EdictoSearchAdminForm
 from plataforma_web.blueprints.edictos.models import Edicto
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 edictos = Blueprint("edictos", __name__, template_folder="templates")
@@ -105,18 +103,18 @@ def list_distritos():
     """Listado de Distritos"""
     return render_template(
         "edictos/list_distritos.jinja2",
-        distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
+        distritos=catalogs.distritos_judiciales(),
     )
 
 
 @edictos.route("/edictos/distrito/<int:distrito_id>")
 def list_autoridades(distrito_id):
     """Listado de Autoridades de un distrito"""
-    distrito = Distrito.query.get_or_404(distrito_id)
+    distrito = catalogs.get_or_404("distritos", distrito_id)
     return render_template(
         "edictos/list_autoridades.jinja2",
         distrito=distrito,
-        autoridades=Autoridad.query.filter_by(distrito=distrito).filter_by(es_jurisdiccional=True).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+        autoridades=catalogs.autoridades_jurisdiccionales(distrito_id=distrito.id, con_notarias=True),
     )
 
 
@@ -160,7 +158,7 @@ def search():
     """Buscar Edictos"""
     if current_user.can_admin("EDICTOS"):
         puede_elegir_autoridad = True
-    elif current_user.autoridad.es_jurisdiccional:
+    elif catalogs.get_autoridad(current_user.autoridad_id).es_jurisdiccional:
         puede_elegir_autoridad = False
     else:
         puede_elegir_autoridad = True
@@ -174,13 +172,13 @@ def search():
         fallo_validacion = False
         # Autoridad es un campo obligatorio
         if puede_elegir_autoridad:
-            autoridad = Autoridad.query.get(form_search.autoridad.data)
+            autoridad = catalogs.get_autoridad(form_search.autoridad.data)
             plantilla = "edictos/list_admin.jinja2"
         else:
-            autoridad = current_user.autoridad
+            autoridad = catalogs.get_autoridad(current_user.autoridad_id)
             plantilla = "edictos/list.jinja2"
         busqueda["autoridad_id"] = autoridad.id
-        titulos.append(autoridad.distrito.nombre_corto + ", " + autoridad.descripcion_corta)
+        titulos.append(catalogs.get_distrito(autoridad.distrito_id).nombre_corto + ", " + autoridad.descripcion_corta)
         # Fecha
         if form_search.fecha_desde.data:
             busqueda["fecha_desde"] = form_search.fecha_desde.data.strftime("%Y-%m-%d")
@@ -222,12 +220,13 @@ def search():
         return render_template(
             "edictos/search_admin.jinja2",
             form=form_search,
-            distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
-            autoridades=Autoridad.query.filter_by(es_jurisdiccional=True).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+            distritos=catalogs.distritos_judiciales(),
+            autoridades=catalogs.autoridades_jurisdiccionales(con_notarias=True),
         )
     # Mostrar buscador con la autoridad fija
-    form_search.distrito.data = current_user.autoridad.distrito.nombre
-    form_search.autoridad.data = current_user.autoridad.descripcion
+    autoridad = catalogs.get_autoridad(current_user.autoridad_id)
+    form_search.distrito.data = catalogs.get_distrito(autoridad.distrito_id).nombre
+    form_search.autoridad.data = autoridad.descripcion
     return render_template("edictos/search.jinja2", form=form_search)
 
 
@@ -243,9 +242,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "fecha_desde" in request.form:
         consulta = consulta.filter(Edicto.fecha >= request.form["fecha_desde"])
     if "fecha_hasta" in request.form:
@@ -300,9 +299,9 @@ def datatable_json_admin():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "fecha_desde" in request.form:
         consulta = consulta.filter(Edicto.fecha >= request.form["fecha_desde"])
     if "fecha_hasta" in request.form:
@@ -380,7 +379,7 @@ def new_success(edicto):
         piezas.append(f"número {edicto.numero_publicacion},")
     piezas.append(f"fecha {edicto.fecha.strftime('%Y-%m-%d')} de {edicto.autoridad.clave}")
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(" ".join(piezas)),
         url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -489,7 +488,7 @@ def new():
         # Actualizar el nombre del archivo y el url
         edicto.archivo = archivo_str
         edicto.url = url
-        edicto.save()
+        edicto.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(edicto)
@@ -606,7 +605,7 @@ def new_for_autoridad(autoridad_id):
         # Actualizar el nombre del archivo y el url
         edicto.archivo = archivo_str
         edicto.url = url
-        edicto.save()
+        edicto.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(edicto)
@@ -629,7 +628,7 @@ def edit_success(edicto):
         piezas.append(f"número {edicto.numero_publicacion},")
     piezas.append(f"fecha {edicto.fecha.strftime('%Y-%m-%d')} de {edicto.autoridad.clave}")
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(" ".join(piezas)),
         url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -675,7 +674,7 @@ def edit(edicto_id):
             es_valido = False
 
         if es_valido:
-            edicto.save()
+            edicto.save(commit=False)
             bitacora = edit_success(edicto)
             flash(bitacora.descripcion, "success")
             return redirect(bitacora.url)
@@ -690,7 +689,7 @@ def edit(edicto_id):
 def delete_success(edicto):
     """Mensaje de éxito al eliminar un edicto"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Eliminado edicto de {edicto.autoridad.clave}"),
         url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -710,7 +709,7 @@ def delete(edicto_id):
         if current_user.can_admin("EDICTOS"):
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= edicto.creado.timestamp():
-                edicto.delete()
+                edicto.delete(commit=False)
                 bitacora = delete_success(edicto)
                 flash(bitacora.descripcion, "success")
             else:
@@ -718,7 +717,7 @@ def delete(edicto_id):
         elif current_user.autoridad_id == edicto.autoridad_id:
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_DIAS)
             if limite_dt.timestamp() <= edicto.creado.timestamp():
-                edicto.delete()
+                edicto.delete(commit=False)
                 bitacora = delete_success(edicto)
                 flash(bitacora.descripcion, "success")
             else:
@@ -731,7 +730,7 @@ def delete(edicto_id):
 def recover_success(edicto):
     """Mensaje de éxito al recuperar un edicto"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Recuperado edicto de {edicto.autoridad.clave}"),
         url=url_for("edictos.detail", edicto_id=edicto.id),
@@ -751,7 +750,7 @@ def recover(edicto_id):
         if current_user.can_admin("EDICTOS"):
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= edicto.creado.timestamp():
-                edicto.recover()
+                edicto.recover(commit=False)
                 bitacora = recover_success(edicto)
                 flash(bitacora.descripcion, "success")
             else:
@@ -759,7 +758,7 @@ def recover(edicto_id):
         elif current_user.autoridad_id == edicto.autoridad_id:
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_DIAS)
             if limite_dt.timestamp() <= edicto.creado.timestamp():
-                edicto.recover()
+                edicto.recover(commit=False)
                 bitacora = recover_success(edicto)
                 flash(bitacora.descripcion, "success")
             else:
@@ -0,0 +1,14 @@
+"""
+Entradas-Salidas, formularios
+"""
+from flask_wtf import FlaskForm
+from wtforms import DateField, SubmitField
+from wtforms.validators import Optional
+
+
+class EntradaSalidaSearchForm(FlaskForm):
+    """Formulario para buscar Entradas y Salidas"""
+
+    fecha_desde = DateField("Fecha desde", validators=[Optional()])
+    fecha_hasta = DateField("Fecha hasta", validators=[Optional()])
+    buscar = SubmitField("Buscar")
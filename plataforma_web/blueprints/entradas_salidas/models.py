@@ -3,6 +3,7 @@ Entradas-Salidas, modelos
 """
 from collections import OrderedDict
 from plataforma_web.extensions import db
+from lib import audit
 from lib.universal_mixin import UniversalMixin
 
 
@@ -16,7 +17,7 @@ class EntradaSalida(db.Model, UniversalMixin):
         ]
     )
 
-    # Nombre de la tabla
+    # Nombre de la tabla, en PostgreSQL se particiona por mes de creado con plataforma_web particiones convertir
     __tablename__ = "entradas_salidas"
 
     # Clave primaria
@@ -34,6 +35,10 @@ class EntradaSalida(db.Model, UniversalMixin):
     )
     direccion_ip = db.Column(db.String(64), nullable=False)
 
+    def save(self, commit: bool = True):
+        """Guardar por medio del registro de auditoría, sin confirmar otra transacción en la petición"""
+        return audit.record(self, commit)
+
     def __repr__(self):
         """Representación"""
         return f"<Sesion {self.creado}: {self.tipo}>"
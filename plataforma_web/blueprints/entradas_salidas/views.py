@@ -1,12 +1,16 @@
 """
 Entradas-Salidas, vistas
 """
-from flask import Blueprint, render_template
+import json
+
+from flask import Blueprint, render_template, request
 from flask.helpers import url_for
 from flask_login import login_required
 
 from lib import datatables
+from lib.partitions import filter_created, recent_start
 
+from plataforma_web.blueprints.entradas_salidas.forms import EntradaSalidaSearchForm
 from plataforma_web.blueprints.entradas_salidas.models import EntradaSalida
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.decorators import permission_required
@@ -21,7 +25,32 @@ entradas_salidas = Blueprint("entradas_salidas", __name__, template_folder="temp
 @permission_required(MODULO, Permiso.VER)
 def list_active():
     """Listado de entradas y salidas"""
-    return render_template("entradas_salidas/list.jinja2")
+    fecha_desde = recent_start().isoformat()
+    return render_template(
+        "entradas_salidas/list.jinja2",
+        filtros=json.dumps({"fecha_desde": fecha_desde}),
+        titulo="Entradas y salidas desde " + fecha_desde,
+    )
+
+
+@entradas_salidas.route("/entradas_salidas/buscar", methods=["GET", "POST"])
+@login_required
+@permission_required(MODULO, Permiso.VER)
+def search():
+    """Buscar entradas y salidas por periodo"""
+    form_search = EntradaSalidaSearchForm()
+    if form_search.validate_on_submit():
+        busqueda = {"fecha_desde": (form_search.fecha_desde.data or recent_start()).strftime("%Y-%m-%d")}
+        titulos = ["desde " + busqueda["fecha_desde"]]
+        if form_search.fecha_hasta.data:
+            busqueda["fecha_hasta"] = form_search.fecha_hasta.data.strftime("%Y-%m-%d")
+            titulos.append("hasta " + busqueda["fecha_hasta"])
+        return render_template(
+            "entradas_salidas/list.jinja2",
+            filtros=json.dumps(busqueda),
+            titulo="Entradas y salidas " + " ".join(titulos),
+        )
+    return render_template("entradas_salidas/search.jinja2", form=form_search)
 
 
 @entradas_salidas.route("/entradas_salidas/datatable_json", methods=["GET", "POST"])
@@ -32,7 +61,7 @@ def datatable_json():
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = datatables.get_parameters()
     # Consultar
-    consulta = EntradaSalida.query
+    consulta = filter_created(EntradaSalida.query, EntradaSalida.creado, request.form.get("fecha_desde"), request.form.get("fecha_hasta"))
     registros = consulta.order_by(EntradaSalida.creado.desc()).offset(start).limit(rows_per_page).all()
     total = consulta.count()
     # Elaborar datos para DataTable
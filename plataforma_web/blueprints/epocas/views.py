@@ -10,7 +10,6 @@ from plataforma_web.blueprints.usuarios.decorators import permission_required
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.epocas.models import Epoca
 from plataforma_web.blueprints.epocas.forms import EpocaForm
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 MODULO = "EPOCAS"
@@ -64,9 +63,9 @@ def new():
     form = EpocaForm()
     if form.validate_on_submit():
         epoca = Epoca(nombre=safe_string(form.nombre.data))
-        epoca.save()
+        epoca.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva Epoca {epoca.nombre}"),
             url=url_for("epocas.detail", epoca_id=epoca.id),
@@ -85,9 +84,9 @@ def edit(epoca_id):
     form = EpocaForm()
     if form.validate_on_submit():
         epoca.nombre = safe_string(form.nombre.data)
-        epoca.save()
+        epoca.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada la Epoca {epoca.nombre}"),
             url=url_for("epocas.detail", epoca_id=epoca.id),
@@ -104,9 +103,9 @@ def delete(epoca_id):
     """Eliminar Epoca"""
     epoca = Epoca.query.get_or_404(epoca_id)
     if epoca.estatus == "A":
-        epoca.delete()
+        epoca.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminada la Epoca {epoca.nombre}"),
             url=url_for("epocas.detail", epoca_id=epoca.id),
@@ -122,9 +121,9 @@ def recover(epoca_id):
     """Recuperar Epoca"""
     epoca = Epoca.query.get_or_404(epoca_id)
     if epoca.estatus == "B":
-        epoca.recover()
+        epoca.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado Epoca {epoca.nombre}"),
             url=url_for("epocas.detail", epoca_id=epoca.id),
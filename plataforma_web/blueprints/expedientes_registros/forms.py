@@ -0,0 +1,16 @@
+"""
+Expedientes Registros, formularios
+"""
+from flask_wtf import FlaskForm
+from wtforms import StringField, SubmitField
+from wtforms.validators import DataRequired, Length, Regexp
+
+from lib.safe_string import EXPEDIENTE_REGEXP
+
+
+class ExpedienteRegistroSearchForm(FlaskForm):
+    """Formulario para buscar un expediente en todos los módulos"""
+
+    autoridad = StringField("Autoridad")  # Read only
+    expediente = StringField("Expediente", validators=[DataRequired(), Length(max=16), Regexp(EXPEDIENTE_REGEXP)])
+    buscar = SubmitField("Buscar")
@@ -0,0 +1,35 @@
+"""
+Expedientes Registros, modelos
+"""
+from plataforma_web.extensions import db
+from lib.universal_mixin import UniversalMixin
+
+
+class ExpedienteRegistro(db.Model, UniversalMixin):
+    """ExpedienteRegistro"""
+
+    # Nombre de la tabla
+    __tablename__ = "expedientes_registros"
+
+    # Clave primaria
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Clave foránea
+    autoridad_id = db.Column(db.Integer, db.ForeignKey("autoridades.id"), nullable=False)
+
+    # Columnas
+    expediente = db.Column(db.String(16), nullable=False)  # Normalizado con safe_expediente
+    modulo = db.Column(db.String(64), nullable=False)  # Nombre del módulo del registro, como SENTENCIAS
+    registro_id = db.Column(db.Integer, nullable=False)  # ID del registro en la tabla de ese módulo
+    fecha = db.Column(db.Date, nullable=False)
+    descripcion = db.Column(db.String(256), nullable=False, default="", server_default="")
+
+    # Índices
+    __table_args__ = (
+        db.Index("ix_expedientes_registros_autoridad_expediente", "autoridad_id", "expediente"),
+        db.Index("ix_expedientes_registros_modulo_registro", "modulo", "registro_id", unique=True),
+    )
+
+    def __repr__(self):
+        """Representación"""
+        return f"<ExpedienteRegistro {self.modulo} {self.expediente}>"
@@ -0,0 +1,54 @@
+"""
+Expedientes Registros, vistas
+"""
+from flask import Blueprint, flash, render_template, request
+from flask_login import current_user, login_required
+
+from lib import expedientes
+from lib.safe_string import safe_expediente
+
+from plataforma_web.blueprints.expedientes_registros.forms import ExpedienteRegistroSearchForm
+
+expedientes_registros = Blueprint("expedientes_registros", __name__, template_folder="templates")
+
+
+@expedientes_registros.before_request
+@login_required
+def before_request():
+    """Permiso por defecto"""
+
+
+def visible_modules():
+    """Módulos del índice que puede ver el usuario"""
+    return [modulo for modulo in expedientes.FUENTES if current_user.can_view(modulo)]
+
+
+@expedientes_registros.route("/expedientes_registros/buscar", methods=["GET", "POST"])
+def search():
+    """Buscar un expediente de la autoridad del usuario en todos los módulos"""
+    form_search = ExpedienteRegistroSearchForm()
+    if form_search.validate_on_submit():
+        try:
+            expediente = safe_expediente(form_search.expediente.data)
+        except (IndexError, ValueError):
+            flash("El expediente es incorrecto.", "warning")
+            return render_template("expedientes_registros/search.jinja2", form=form_search)
+        return render_template(
+            "expedientes_registros/list.jinja2",
+            registros=expedientes.lookup(current_user.autoridad_id, expediente, visible_modules()),
+            titulo=f"Expediente {expediente} de {current_user.autoridad.descripcion_corta}",
+        )
+    form_search.autoridad.data = current_user.autoridad.descripcion
+    return render_template("expedientes_registros/search.jinja2", form=form_search)
+
+
+@expedientes_registros.route("/expedientes_registros/buscar_json")
+def search_json():
+    """Registros de todos los módulos de un expediente, por defecto de la autoridad del usuario"""
+    autoridad_id = request.args.get("autoridad_id", current_user.autoridad_id, type=int)
+    expediente = expedientes.normalize(request.args.get("expediente", ""))
+    return {
+        "autoridad_id": autoridad_id,
+        "expediente": expediente,
+        "registros": expedientes.lookup(autoridad_id, expediente, visible_modules()),
+    }
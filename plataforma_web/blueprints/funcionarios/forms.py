@@ -21,3 +21,9 @@ class FuncionarioForm(FlaskForm):
     en_soportes = BooleanField("En soportes", validators=[Optional()])
     en_tesis_jurisprudencias = BooleanField("En tesis y jurisprudencias", validators=[Optional()])
     guardar = SubmitField('Guardar')
+
+
+class FuncionarioSearchForm(FlaskForm):
+    """ Formulario para buscar Funcionarios """
+    nombre = StringField("Nombre", validators=[DataRequired(), Length(max=256)])
+    buscar = SubmitField('Buscar')
@@ -2,8 +2,12 @@
 Funcionarios, modelos
 """
 from plataforma_web.extensions import db
+from lib.trigrams import trigram_index
 from lib.universal_mixin import UniversalMixin
 
+# Nombre completo para buscar, la misma expresión que la del índice de trigramas
+NOMBRE_COMPLETO_SQL = "nombres || ' ' || apellido_paterno || ' ' || coalesce(apellido_materno, '')"
+
 
 class Funcionario(db.Model, UniversalMixin):
     """Funcionario"""
@@ -26,6 +30,9 @@ class Funcionario(db.Model, UniversalMixin):
     en_soportes = db.Column(db.Boolean, nullable=False, default=False)
     en_tesis_jurisprudencias = db.Column(db.Boolean, nullable=False, default=False)
 
+    # Índices
+    __table_args__ = (trigram_index("ix_funcionarios_nombre_completo_trgm", NOMBRE_COMPLETO_SQL),)
+
     # Hijos
     autoridades_funcionarios = db.relationship("AutoridadFuncionario", back_populates="funcionario")
     soportes_tickets = db.relationship("SoporteTicket", back_populates="funcionario", lazy="noload")
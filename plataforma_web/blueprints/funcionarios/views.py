@@ -4,16 +4,18 @@ Funcionarios, vistas
 from flask import Blueprint, flash, redirect, render_template, url_for
 from flask_login import current_user, login_required
 
+from lib import trigrams
 from lib.safe_string import safe_message, safe_string
 
+from plataforma_web.extensions import db
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.usuarios.decorators import permission_required
-from plataforma_web.blueprints.funcionarios.models import Funcionario
-from plataforma_web.blueprints.funcionarios.forms import FuncionarioForm
-from plataforma_web.blueprints.modulos.models import Modulo
+from plataforma_web.blueprints.funcionarios.models import Funcionario, NOMBRE_COMPLETO_SQL
+from plataforma_web.blueprints.funcionarios.forms import FuncionarioForm, FuncionarioSearchForm
 from plataforma_web.blueprints.permisos.models import Permiso
 
 MODULO = "FUNCIONARIOS"
+LIMITE_RESULTADOS = 100
 
 funcionarios = Blueprint("funcionarios", __name__, template_folder="templates")
 
@@ -50,6 +52,26 @@ def list_inactive():
     )
 
 
+@funcionarios.route("/funcionarios/buscar", methods=["GET", "POST"])
+def search():
+    """Buscar Funcionarios por nombre"""
+    form_search = FuncionarioSearchForm()
+    if form_search.validate_on_submit():
+        nombre = safe_string(form_search.nombre.data)
+        if nombre != "":
+            nombre_completo = db.literal_column(f"({NOMBRE_COMPLETO_SQL})")
+            consulta = trigrams.filter_similar(Funcionario.query.filter(Funcionario.estatus == "A"), nombre_completo, nombre)
+            consulta = trigrams.order_by_similarity(consulta, nombre_completo, nombre)
+            return render_template(
+                "funcionarios/list.jinja2",
+                funcionarios=consulta.order_by(Funcionario.nombres).limit(LIMITE_RESULTADOS).all(),
+                titulo=f"Funcionarios con nombre {nombre}",
+                estatus="A",
+            )
+        flash("El nombre a buscar es incorrecto.", "warning")
+    return render_template("funcionarios/search.jinja2", form=form_search)
+
+
 @funcionarios.route("/funcionarios/<int:funcionario_id>")
 def detail(funcionario_id):
     """Detalle de un Funcionario"""
@@ -85,9 +107,9 @@ def new():
                 en_soportes=form.en_soportes.data,
                 en_tesis_jurisprudencias=form.en_tesis_jurisprudencias.data,
             )
-            funcionario.save()
+            funcionario.save(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Nuevo funcionario {funcionario.nombre}"),
                 url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -125,9 +147,9 @@ def edit(funcionario_id):
             funcionario.en_sentencias = form.en_sentencias.data
             funcionario.en_soportes = form.en_soportes.data
             funcionario.en_tesis_jurisprudencias = form.en_tesis_jurisprudencias.data
-            funcionario.save()
+            funcionario.save(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Editado funcionario {funcionario.nombre}"),
                 url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -154,9 +176,9 @@ def delete(funcionario_id):
     """Eliminar Funcionario"""
     funcionario = Funcionario.query.get_or_404(funcionario_id)
     if funcionario.estatus == "A":
-        funcionario.delete()
+        funcionario.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado funcionario {funcionario.nombre}"),
             url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -172,9 +194,9 @@ def recover(funcionario_id):
     """Recuperar Funcionario"""
     funcionario = Funcionario.query.get_or_404(funcionario_id)
     if funcionario.estatus == "B":
-        funcionario.recover()
+        funcionario.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado {funcionario.nombre}"),
             url=url_for("funcionarios.detail", funcionario_id=funcionario.id),
@@ -10,6 +10,9 @@ import csv
 from google.cloud import storage
 from rq import get_current_job
 from lib.safe_string import safe_expediente
+from lib.tasks import publish_task_progress
+from lib.task_metrics import count_storage_calls, count_task_rows, measure_task
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 from plataforma_web.blueprints.autoridades.models import Autoridad
@@ -44,6 +47,7 @@ def set_task_progress(progress: int, mensaje: str = None):
             if mensaje is not None:
                 tarea.descripcion = mensaje
             tarea.save()
+            publish_task_progress(tarea, progress)
 
 
 def set_task_error(mensaje: str):
@@ -57,11 +61,13 @@ def set_task_error(mensaje: str):
             tarea.ha_terminado = True
             tarea.descripcion = mensaje
             tarea.save()
+            publish_task_progress(tarea, 100)
     bitacora.error(mensaje)
     bitacora.info("Termina")
     return mensaje
 
 
+@measure_task
 def refrescar(autoridad_id: int, usuario_id: int = None):
     """Rastrear las glosas para agregar las que no tiene y dar de baja las que no existen en la BD"""
     bitacora.info("Inicia")
@@ -97,8 +103,11 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     deposito = os.environ.get("CLOUD_STORAGE_DEPOSITO", "pjecz-pruebas")
     bucket = storage.Client().get_bucket(deposito)
     subdirectorio = f"{SUBDIRECTORIO}/{autoridad.directorio_glosas}"
-    blobs = list(bucket.list_blobs(prefix=subdirectorio))
+    blobs_iterador = bucket.list_blobs(prefix=subdirectorio)
+    blobs = list(blobs_iterador)
+    count_storage_calls(1 + blobs_iterador.page_number)
     total_en_deposito = len(blobs)
+    count_task_rows(total_en_deposito)
     if total_en_deposito == 0:
         return set_task_error(f"No existe o no hay archivos en {subdirectorio}")
     bitacora.info("- Tiene %d archivos en el depósito", total_en_deposito)
@@ -151,48 +160,51 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     contador_insertados = 0
     contador_presentes = 0
 
-    # Bucle por los archivos en el depósito
-    for blob in blobs:
-
-        # Validar que sea PDF
-        ruta = Path(blob.name)
-        if ruta.suffix.lower() != ".pdf":
-            continue
-
-        # Saltar y quitar de la lista si se encuentra en la consulta
-        esta_en_bd = False
-        for indice, glosa in enumerate(glosas):
-            if blob.public_url == glosa.url:
-                glosas.pop(indice)
-                esta_en_bd = True
-                break
-        if esta_en_bd:
-            contador_presentes += 1
-            continue
-
-        # Insertar
-        if ruta.name in metadatos:
-            encontrado = metadatos[ruta.name]
-            glosa = Glosa(
-                autoridad=autoridad,
-                fecha=encontrado["fecha"],
-                tipo_juicio=encontrado["tipo_juicio"],
-                descripcion="SIN DESCRIPCION",
-                expediente=encontrado["expediente"],
-                archivo=ruta.name,
-                url=blob.public_url,
-            ).save()
-            # bitacora.info("- %s", repr(glosa))
-            contador_insertados += 1
-        else:
-            bitacora.warning("! SIN METADATOS %s", ruta.name)
-
-    # Los registros que no se encontraron serán dados de baja
-    contador_borrados = 0
-    for glosa in glosas:
-        if glosa.estatus == "A":
-            glosa.delete()
-            contador_borrados += 1
+    # Insertar y dar de baja en una sola transacción
+    with bulk():
+
+        # Bucle por los archivos en el depósito
+        for blob in blobs:
+
+            # Validar que sea PDF
+            ruta = Path(blob.name)
+            if ruta.suffix.lower() != ".pdf":
+                continue
+
+            # Saltar y quitar de la lista si se encuentra en la consulta
+            esta_en_bd = False
+            for indice, glosa in enumerate(glosas):
+                if blob.public_url == glosa.url:
+                    glosas.pop(indice)
+                    esta_en_bd = True
+                    break
+            if esta_en_bd:
+                contador_presentes += 1
+                continue
+
+            # Insertar
+            if ruta.name in metadatos:
+                encontrado = metadatos[ruta.name]
+                glosa = Glosa(
+                    autoridad=autoridad,
+                    fecha=encontrado["fecha"],
+                    tipo_juicio=encontrado["tipo_juicio"],
+                    descripcion="SIN DESCRIPCION",
+                    expediente=encontrado["expediente"],
+                    archivo=ruta.name,
+                    url=blob.public_url,
+                ).save()
+                # bitacora.info("- %s", repr(glosa))
+                contador_insertados += 1
+            else:
+                bitacora.warning("! SIN METADATOS %s", ruta.name)
+
+        # Los registros que no se encontraron serán dados de baja
+        contador_borrados = 0
+        for glosa in glosas:
+            if glosa.estatus == "A":
+                glosa.delete()
+                contador_borrados += 1
 
     # Mensaje final
     mensajes = []
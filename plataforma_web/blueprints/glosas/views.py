@@ -11,17 +11,15 @@ from google.cloud import storage
 from werkzeug.datastructures import CombinedMultiDict
 from werkzeug.utils import secure_filename
 
-from lib import datatables
+from lib import catalogs, datatables
 from lib.safe_string import safe_expediente, safe_message, safe_string
 from lib.time_to_text import dia_mes_ano, mes_en_palabra
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.glosas.forms import GlosaEditForm, GlosaNewForm, GlosaSearchForm, GlosaSearchAdminForm
 from plataforma_web.blueprints.glosas.models import Glosa
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 glosas = Blueprint("glosas", __name__, template_folder="templates")
@@ -116,7 +114,7 @@ def list_inactive():
 @glosas.route("/glosas/autoridades")
 def list_autoridades():
     """Listado de Autoridades"""
-    autoridades = Autoridad.query.filter(Autoridad.organo_jurisdiccional.in_(ORGANOS_JURISDICCIONALES)).filter_by(estatus="A").order_by(Autoridad.clave).all()
+    autoridades = catalogs.autoridades_por_organos(ORGANOS_JURISDICCIONALES)
     return render_template("glosas/list_autoridades.jinja2", autoridades=autoridades)
 
 
@@ -174,13 +172,13 @@ def search():
         fallo_validacion = False
         # Autoridad es un campo obligatorio
         if puede_elegir_autoridad:
-            autoridad = Autoridad.query.get(form_search.autoridad.data)
+            autoridad = catalogs.get_autoridad(form_search.autoridad.data)
             plantilla = "glosas/list_admin.jinja2"
         else:
-            autoridad = current_user.autoridad
+            autoridad = catalogs.get_autoridad(current_user.autoridad_id)
             plantilla = "glosas/list.jinja2"
         busqueda["autoridad_id"] = autoridad.id
-        titulos.append(autoridad.distrito.nombre_corto + ", " + autoridad.descripcion_corta)
+        titulos.append(catalogs.get_distrito(autoridad.distrito_id).nombre_corto + ", " + autoridad.descripcion_corta)
         # Fecha
         if form_search.fecha_desde.data:
             busqueda["fecha_desde"] = form_search.fecha_desde.data.strftime("%Y-%m-%d")
@@ -217,12 +215,13 @@ def search():
         return render_template(
             "glosas/search_admin.jinja2",
             form=form_search,
-            distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
-            autoridades=Autoridad.query.filter(Autoridad.organo_jurisdiccional.in_(ORGANOS_JURISDICCIONALES)).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+            distritos=catalogs.distritos_judiciales(),
+            autoridades=catalogs.autoridades_por_organos(ORGANOS_JURISDICCIONALES),
         )
     # Mostrar buscador con la autoridad fija
-    form_search.distrito.data = current_user.autoridad.distrito.nombre
-    form_search.autoridad.data = current_user.autoridad.descripcion
+    autoridad = catalogs.get_autoridad(current_user.autoridad_id)
+    form_search.distrito.data = catalogs.get_distrito(autoridad.distrito_id).nombre
+    form_search.autoridad.data = autoridad.descripcion
     return render_template("glosas/search.jinja2", form=form_search)
 
 
@@ -238,9 +237,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "fecha_desde" in request.form:
         consulta = consulta.filter(Glosa.fecha >= request.form["fecha_desde"])
     if "fecha_hasta" in request.form:
@@ -291,9 +290,9 @@ def datatable_json_admin():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "fecha_desde" in request.form:
         consulta = consulta.filter(Glosa.fecha >= request.form["fecha_desde"])
     if "fecha_hasta" in request.form:
@@ -361,7 +360,7 @@ def detail(glosa_id):
 def new_success(glosa):
     """Mensaje de éxito en nueva glosa"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Nueva glosa con fecha {glosa.fecha}, tipo {glosa.tipo_juicio} y expediente {glosa.expediente}"),
         url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -459,7 +458,7 @@ def new():
         # Actualizar el nombre del archivo y el url
         glosa.archivo = archivo_str
         glosa.url = url
-        glosa.save()
+        glosa.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(glosa)
@@ -565,7 +564,7 @@ def new_for_autoridad(autoridad_id):
         # Actualizar el nombre del archivo y el url
         glosa.archivo = archivo_str
         glosa.url = url
-        glosa.save()
+        glosa.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(glosa)
@@ -582,7 +581,7 @@ def new_for_autoridad(autoridad_id):
 def edit_success(glosa):
     """Mensaje de éxito al editar una glosa"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Editada glosa con fecha {glosa.fecha}, tipo {glosa.tipo_juicio} y expediente {glosa.expediente}"),
         url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -611,7 +610,7 @@ def edit(glosa_id):
             flash("El expediente es incorrecto.", "warning")
             es_valido = False
         if es_valido:
-            glosa.save()
+            glosa.save(commit=False)
             bitacora = edit_success(glosa)
             flash(bitacora.descripcion, "success")
             return redirect(bitacora.url)
@@ -625,7 +624,7 @@ def edit(glosa_id):
 def delete_success(glosa):
     """Mensaje de éxito al eliminar una glosa"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Eliminada glosa con fecha {glosa.fecha}, tipo {glosa.tipo_juicio} y expediente {glosa.expediente}"),
         url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -645,7 +644,7 @@ def delete(glosa_id):
         if current_user.can_admin("GLOSAS"):
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= glosa.creado.timestamp():
-                glosa.delete()
+                glosa.delete(commit=False)
                 bitacora = delete_success(glosa)
                 flash(bitacora.descripcion, "success")
             else:
@@ -653,7 +652,7 @@ def delete(glosa_id):
         elif current_user.autoridad_id == glosa.autoridad_id:
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_DIAS)
             if limite_dt.timestamp() <= glosa.creado.timestamp():
-                glosa.delete()
+                glosa.delete(commit=False)
                 bitacora = delete_success(glosa)
                 flash(bitacora.descripcion, "success")
             else:
@@ -666,7 +665,7 @@ def delete(glosa_id):
 def recover_success(glosa):
     """Mensaje de éxito al recuperar una glosa"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Recuperada glosa con fecha {glosa.fecha}, tipo {glosa.tipo_juicio} y expediente {glosa.expediente}"),
         url=url_for("glosas.detail", glosa_id=glosa.id),
@@ -686,7 +685,7 @@ def recover(glosa_id):
         if current_user.can_admin("GLOSAS"):
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= glosa.creado.timestamp():
-                glosa.recover()
+                glosa.recover(commit=False)
                 bitacora = recover_success(glosa)
                 flash(bitacora.descripcion, "success")
             else:
@@ -694,7 +693,7 @@ def recover(glosa_id):
         elif current_user.autoridad_id == glosa.autoridad_id:
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_DIAS)
             if limite_dt.timestamp() <= glosa.creado.timestamp():
-                glosa.recover()
+                glosa.recover(commit=False)
                 bitacora = recover_success(glosa)
                 flash(bitacora.descripcion, "success")
             else:
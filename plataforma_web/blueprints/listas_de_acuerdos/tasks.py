@@ -18,8 +18,11 @@ import pandas as pd
 import sendgrid
 from sendgrid.helpers.mail import Email, To, Content, Mail
 
+from lib.replicas import read_engine, read_replica
 from lib.safe_string import safe_string
 from lib.tasks import set_task_progress, set_task_error
+from lib.task_metrics import count_storage_calls, count_task_rows, measure_task
+from lib.universal_mixin import bulk
 from plataforma_web.app import create_app
 from plataforma_web.extensions import db
 from plataforma_web.blueprints.autoridades.models import Autoridad
@@ -43,6 +46,7 @@ locale.setlocale(locale.LC_TIME, "es_MX")
 SUBDIRECTORIO = "Listas de Acuerdos"
 
 
+@measure_task
 def refrescar(autoridad_id: int, usuario_id: int = None):
     """Rastrear las listas de acuerdos para agregar las que no tiene y dar de baja las que no existen en la BD"""
     bitacora.info("Inicia")
@@ -78,8 +82,11 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     deposito = os.environ.get("CLOUD_STORAGE_DEPOSITO", "pjecz-pruebas")
     bucket = storage.Client().get_bucket(deposito)
     subdirectorio = f"{SUBDIRECTORIO}/{autoridad.directorio_listas_de_acuerdos}"
-    blobs = list(bucket.list_blobs(prefix=subdirectorio))
+    blobs_iterador = bucket.list_blobs(prefix=subdirectorio)
+    blobs = list(blobs_iterador)
+    count_storage_calls(1 + blobs_iterador.page_number)
     total_en_deposito = len(blobs)
+    count_task_rows(total_en_deposito)
     if total_en_deposito == 0:
         return set_task_error(f"No existe o no hay archivos en {subdirectorio}")
     bitacora.info("- Tiene %d archivos en el depósito", total_en_deposito)
@@ -99,82 +106,85 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     contador_insertados = 0
     contador_presentes = 0
 
-    # Bucle por los archivos en el depósito
-    for blob in blobs:
-
-        # Validar que sea PDF
-        ruta = Path(blob.name)
-        if ruta.suffix.lower() != ".pdf":
-            continue
-
-        # Saltar y quitar de la lista si se encuentra en la consulta
-        esta_en_bd = False
-        for indice, lista_de_acuerdo in enumerate(listas_de_acuerdos):
-            if blob.public_url == lista_de_acuerdo.url:
-                listas_de_acuerdos.pop(indice)
-                esta_en_bd = True
-                break
-        if esta_en_bd:
-            contador_presentes += 1
-            continue
-
-        # A partir de aquí tenemos un archivo que no está en la base de datos
-        # El nombre del archivo para una lista de acuerdos debe ser como
-        # AAAA-MM-DD-LISTA-DE-ACUERDOS-IDHASED.pdf
-
-        # Separar elementos del nombre del archivo
-        nombre_sin_extension = ruta.name[:-4]
-        elementos = re.sub(letras_digitos_regex, "-", nombre_sin_extension).strip("-").split("-")
-
-        # Tomar la fecha
-        try:
-            ano = int(elementos[0])
-            mes = int(elementos[1])
-            dia = int(elementos[2])
-            fecha = date(ano, mes, dia)
-        except (IndexError, ValueError):
-            bitacora.warning("X Fecha incorrecta: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Descartar fechas en el futuro o muy en el pasado
-        if not limite_dt <= datetime(year=fecha.year, month=fecha.month, day=fecha.day) <= hoy_dt:
-            bitacora.warning("X Fecha fuera de rango: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Tomar la descripción, sin el hash del id de estar presente
-        if len(elementos) > 3:
-            if re.match(hashid_regexp, elementos[-1]) is None:
-                descripcion = safe_string(" ".join(elementos[3:]))
-            else:
-                decodificado = hashids.decode(elementos[-1])
-                if isinstance(decodificado, tuple) and len(decodificado) > 0:
-                    descripcion = safe_string(" ".join(elementos[3:-1]))
-                else:
+    # Insertar y dar de baja en una sola transacción
+    with bulk():
+
+        # Bucle por los archivos en el depósito
+        for blob in blobs:
+
+            # Validar que sea PDF
+            ruta = Path(blob.name)
+            if ruta.suffix.lower() != ".pdf":
+                continue
+
+            # Saltar y quitar de la lista si se encuentra en la consulta
+            esta_en_bd = False
+            for indice, lista_de_acuerdo in enumerate(listas_de_acuerdos):
+                if blob.public_url == lista_de_acuerdo.url:
+                    listas_de_acuerdos.pop(indice)
+                    esta_en_bd = True
+                    break
+            if esta_en_bd:
+                contador_presentes += 1
+                continue
+
+            # A partir de aquí tenemos un archivo que no está en la base de datos
+            # El nombre del archivo para una lista de acuerdos debe ser como
+            # AAAA-MM-DD-LISTA-DE-ACUERDOS-IDHASED.pdf
+
+            # Separar elementos del nombre del archivo
+            nombre_sin_extension = ruta.name[:-4]
+            elementos = re.sub(letras_digitos_regex, "-", nombre_sin_extension).strip("-").split("-")
+
+            # Tomar la fecha
+            try:
+                ano = int(elementos[0])
+                mes = int(elementos[1])
+                dia = int(elementos[2])
+                fecha = date(ano, mes, dia)
+            except (IndexError, ValueError):
+                bitacora.warning("X Fecha incorrecta: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Descartar fechas en el futuro o muy en el pasado
+            if not limite_dt <= datetime(year=fecha.year, month=fecha.month, day=fecha.day) <= hoy_dt:
+                bitacora.warning("X Fecha fuera de rango: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Tomar la descripción, sin el hash del id de estar presente
+            if len(elementos) > 3:
+                if re.match(hashid_regexp, elementos[-1]) is None:
                     descripcion = safe_string(" ".join(elementos[3:]))
-        else:
-            descripcion = "LISTA DE ACUERDOS"
-
-        # Insertar si no está
-        tiempo_local = blob.time_created.astimezone(tzlocal())
-        ListaDeAcuerdo(
-            creado=tiempo_local,
-            modificado=tiempo_local,
-            autoridad=autoridad,
-            fecha=fecha,
-            descripcion=descripcion,
-            archivo=ruta.name,
-            url=blob.public_url,
-        ).save()
-        contador_insertados += 1
-
-    # Los registros que no se encontraron serán dados de baja
-    contador_borrados = 0
-    for lista_de_acuerdo in listas_de_acuerdos:
-        if lista_de_acuerdo.estatus == "A":
-            lista_de_acuerdo.delete()
-            contador_borrados += 1
+                else:
+                    decodificado = hashids.decode(elementos[-1])
+                    if isinstance(decodificado, tuple) and len(decodificado) > 0:
+                        descripcion = safe_string(" ".join(elementos[3:-1]))
+                    else:
+                        descripcion = safe_string(" ".join(elementos[3:]))
+            else:
+                descripcion = "LISTA DE ACUERDOS"
+
+            # Insertar si no está
+            tiempo_local = blob.time_created.astimezone(tzlocal())
+            ListaDeAcuerdo(
+                creado=tiempo_local,
+                modificado=tiempo_local,
+                autoridad=autoridad,
+                fecha=fecha,
+                descripcion=descripcion,
+                archivo=ruta.name,
+                url=blob.public_url,
+            ).save()
+            contador_insertados += 1
+
+        # Los registros que no se encontraron serán dados de baja
+        contador_borrados = 0
+        for lista_de_acuerdo in listas_de_acuerdos:
+            if lista_de_acuerdo.estatus == "A":
+                lista_de_acuerdo.delete()
+                contador_borrados += 1
 
     # Mensaje final
     mensajes = []
@@ -199,6 +209,8 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     return mensaje_final
 
 
+@measure_task
+@read_replica()
 def enviar_reporte(fecha: date = None):
     """Enviar via correo electronico el reporte de listas de acuerdos"""
 
@@ -217,7 +229,7 @@ def enviar_reporte(fecha: date = None):
 
     # Distritos
     distritos_select = db.session.query(Distrito.id, Distrito.nombre).filter(Distrito.es_distrito_judicial == True).filter(Distrito.estatus == "A").statement
-    distritos = pd.read_sql_query(sql=distritos_select, con=db.engine)
+    distritos = pd.read_sql_query(sql=distritos_select, con=read_engine())
     total = 0
     for distrito_index, distrito_row in distritos.iterrows():
 
@@ -231,7 +243,7 @@ def enviar_reporte(fecha: date = None):
             .order_by(Autoridad.clave)
             .statement
         )
-        autoridades = pd.read_sql_query(sql=autoridades_select, con=db.engine)
+        autoridades = pd.read_sql_query(sql=autoridades_select, con=read_engine())
 
         # Listas de acuerdos
         listas_de_acuerdos_select = (
@@ -243,7 +255,7 @@ def enviar_reporte(fecha: date = None):
             .order_by(Autoridad.clave, ListaDeAcuerdo.creado)
             .statement
         )
-        listas_de_acuerdos = pd.read_sql_query(sql=listas_de_acuerdos_select, con=db.engine)
+        listas_de_acuerdos = pd.read_sql_query(sql=listas_de_acuerdos_select, con=read_engine())
         listas_de_acuerdos.columns = ["clave2", "fecha", "url"]
 
         # Reporte
@@ -11,18 +11,16 @@ from google.cloud import storage
 from werkzeug.datastructures import CombinedMultiDict
 from werkzeug.utils import secure_filename
 
-from lib import datatables
+from lib import catalogs, datatables
 from lib.safe_string import safe_message, safe_string
 from lib.time_to_text import dia_mes_ano, mes_en_palabra
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.listas_de_acuerdos.forms import ListaDeAcuerdoNewForm, ListaDeAcuerdoEditForm, ListaDeAcuerdoSearchForm, ListaDeAcuerdoSearchAdminForm
 from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
 from plataforma_web.blueprints.listas_de_acuerdos_acuerdos.models import ListaDeAcuerdoAcuerdo
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 listas_de_acuerdos = Blueprint("listas_de_acuerdos", __name__, template_folder="templates")
@@ -106,18 +104,18 @@ def list_distritos():
     """Listado de Distritos"""
     return render_template(
         "listas_de_acuerdos/list_distritos.jinja2",
-        distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
+        distritos=catalogs.distritos_judiciales(),
     )
 
 
 @listas_de_acuerdos.route("/listas_de_acuerdos/distrito/<int:distrito_id>")
 def list_autoridades(distrito_id):
     """Listado de Autoridades de un distrito"""
-    distrito = Distrito.query.get_or_404(distrito_id)
+    distrito = catalogs.get_or_404("distritos", distrito_id)
     return render_template(
         "listas_de_acuerdos/list_autoridades.jinja2",
         distrito=distrito,
-        autoridades=Autoridad.query.filter(Autoridad.distrito == distrito).filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+        autoridades=catalogs.autoridades_jurisdiccionales(distrito_id=distrito.id),
     )
 
 
@@ -161,7 +159,7 @@ def search():
     """Buscar Lista de Acuerdos"""
     if current_user.can_admin("LISTAS DE ACUERDOS"):
         puede_elegir_autoridad = True
-    elif current_user.autoridad.es_jurisdiccional:
+    elif catalogs.get_autoridad(current_user.autoridad_id).es_jurisdiccional:
         puede_elegir_autoridad = False
     else:
         puede_elegir_autoridad = True
@@ -175,13 +173,13 @@ def search():
         fallo_validacion = False
         # Autoridad es un campo obligatorio
         if puede_elegir_autoridad:
-            autoridad = Autoridad.query.get(form_search.autoridad.data)
+            autoridad = catalogs.get_autoridad(form_search.autoridad.data)
             plantilla = "listas_de_acuerdos/list_admin.jinja2"
         else:
-            autoridad = current_user.autoridad
+            autoridad = catalogs.get_autoridad(current_user.autoridad_id)
             plantilla = "listas_de_acuerdos/list.jinja2"
         busqueda["autoridad_id"] = autoridad.id
-        titulos.append(autoridad.distrito.nombre_corto + ", " + autoridad.descripcion_corta)
+        titulos.append(catalogs.get_distrito(autoridad.distrito_id).nombre_corto + ", " + autoridad.descripcion_corta)
         # Fecha
         if form_search.fecha_desde.data:
             busqueda["fecha_desde"] = form_search.fecha_desde.data.strftime("%Y-%m-%d")
@@ -201,12 +199,13 @@ def search():
         return render_template(
             "listas_de_acuerdos/search_admin.jinja2",
             form=form_search,
-            distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
-            autoridades=Autoridad.query.filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+            distritos=catalogs.distritos_judiciales(),
+            autoridades=catalogs.autoridades_jurisdiccionales(),
         )
     # Mostrar buscador con la autoridad fija
-    form_search.distrito.data = current_user.autoridad.distrito.nombre
-    form_search.autoridad.data = current_user.autoridad.descripcion
+    autoridad = catalogs.get_autoridad(current_user.autoridad_id)
+    form_search.distrito.data = catalogs.get_distrito(autoridad.distrito_id).nombre
+    form_search.autoridad.data = autoridad.descripcion
     return render_template("listas_de_acuerdos/search.jinja2", form=form_search)
 
 
@@ -222,9 +221,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "fecha_desde" in request.form:
         consulta = consulta.filter(ListaDeAcuerdo.fecha >= request.form["fecha_desde"])
     if "fecha_hasta" in request.form:
@@ -262,9 +261,9 @@ def datatable_json_admin():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "fecha_desde" in request.form:
         consulta = consulta.filter(ListaDeAcuerdo.fecha >= request.form["fecha_desde"])
     if "fecha_hasta" in request.form:
@@ -328,7 +327,7 @@ def new_success(lista_de_acuerdo, anterior_borrada):
         mensaje = "Nueva "
     mensaje = mensaje + f"lista de acuerdos del {lista_de_acuerdo.fecha.strftime('%Y-%m-%d')} de {lista_de_acuerdo.autoridad.clave}"
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(mensaje),
         url=url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
@@ -429,7 +428,7 @@ def new():
         # Actualizar el nombre del archivo y el url
         lista_de_acuerdo.archivo = archivo_str
         lista_de_acuerdo.url = url
-        lista_de_acuerdo.save()
+        lista_de_acuerdo.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(lista_de_acuerdo, anterior_borrada)
@@ -532,7 +531,7 @@ def new_for_autoridad(autoridad_id):
         # Actualizar el nombre del archivo y el url
         lista_de_acuerdo.archivo = archivo_str
         lista_de_acuerdo.url = url
-        lista_de_acuerdo.save()
+        lista_de_acuerdo.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(lista_de_acuerdo, anterior_borrada)
@@ -556,9 +555,9 @@ def edit(lista_de_acuerdo_id):
     if form.validate_on_submit():
         lista_de_acuerdo.fecha = form.fecha.data
         lista_de_acuerdo.descripcion = safe_string(form.descripcion.data)
-        lista_de_acuerdo.save()
+        lista_de_acuerdo.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada la lista de acuerdos del {lista_de_acuerdo.fecha.strftime('%Y-%m-%d')} de {lista_de_acuerdo.autoridad.clave}"),
             url=url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
@@ -574,7 +573,7 @@ def edit(lista_de_acuerdo_id):
 def delete_success(lista_de_acuerdo):
     """Mensaje de éxito al eliminar una lista de acuerdos"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Eliminada la lista de acuerdos del {lista_de_acuerdo.fecha.strftime('%Y-%m-%d')} de {lista_de_acuerdo.autoridad.clave}"),
         url=url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
@@ -594,13 +593,13 @@ def delete(lista_de_acuerdo_id):
             hoy_dt = datetime.datetime(year=hoy.year, month=hoy.month, day=hoy.day)
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= lista_de_acuerdo.creado.timestamp():
-                lista_de_acuerdo.delete()
+                lista_de_acuerdo.delete(commit=False)
                 bitacora = delete_success(lista_de_acuerdo)
                 flash(bitacora.descripcion, "success")
             else:
                 flash(f"No tiene permiso para eliminar si fue creado hace {LIMITE_ADMINISTRADORES_DIAS} días o más.", "warning")
         elif current_user.autoridad_id == lista_de_acuerdo.autoridad_id and lista_de_acuerdo.fecha == datetime.date.today():
-            lista_de_acuerdo.delete()
+            lista_de_acuerdo.delete(commit=False)
             bitacora = delete_success(lista_de_acuerdo)
             flash(bitacora.descripcion, "success")
         else:
@@ -611,7 +610,7 @@ def delete(lista_de_acuerdo_id):
 def recover_success(lista_de_acuerdo):
     """Mensaje de éxito al recuperar una lista de acuerdos"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Recuperada la lista de acuerdos del {lista_de_acuerdo.fecha.strftime('%Y-%m-%d')} de {lista_de_acuerdo.autoridad.clave}"),
         url=url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
@@ -634,13 +633,13 @@ def recover(lista_de_acuerdo_id):
                 hoy_dt = datetime.datetime(year=hoy.year, month=hoy.month, day=hoy.day)
                 limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
                 if limite_dt.timestamp() <= lista_de_acuerdo.creado.timestamp():
-                    lista_de_acuerdo.recover()
+                    lista_de_acuerdo.recover(commit=False)
                     bitacora = recover_success(lista_de_acuerdo)
                     flash(bitacora.descripcion, "success")
                 else:
                     flash(f"No tiene permiso para recuperar si fue creado hace {LIMITE_ADMINISTRADORES_DIAS} días o más.", "warning")
             elif current_user.autoridad_id == lista_de_acuerdo.autoridad_id and lista_de_acuerdo.fecha == datetime.date.today():
-                lista_de_acuerdo.recover()
+                lista_de_acuerdo.recover(commit=False)
                 bitacora = recover_success(lista_de_acuerdo)
                 flash(bitacora.descripcion, "success")
             else:
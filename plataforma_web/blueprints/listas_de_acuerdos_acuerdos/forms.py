@@ -2,7 +2,7 @@
 Listas de Acuerdos Acuerdos, formularios
 """
 from flask_wtf import FlaskForm
-from wtforms import IntegerField, StringField, SubmitField
+from wtforms import DateField, IntegerField, SelectField, StringField, SubmitField
 from wtforms.validators import DataRequired, Length, Optional, Regexp
 
 from lib.safe_string import EXPEDIENTE_REGEXP, FOLIO_REGEXP
@@ -24,6 +24,9 @@ class ListaDeAcuerdoAcuerdoForm(FlaskForm):
 class ListaDeAcuerdoAcuerdoSearchForm(FlaskForm):
     """Formulario para buscar acuerdos"""
 
+    autoridad = SelectField("Autoridad", coerce=int, validators=[Optional()])  # Las opciones se agregan en la vista
+    fecha_desde = DateField("Fecha desde", validators=[Optional()])
+    fecha_hasta = DateField("Fecha hasta", validators=[Optional()])
     folio = StringField("Folio", validators=[Optional(), Length(max=16), Regexp(FOLIO_REGEXP)])
     expediente = StringField("Expediente", validators=[Optional(), Length(max=16), Regexp(EXPEDIENTE_REGEXP)])
     actor = StringField("Actor", validators=[Optional(), Length(max=256)])
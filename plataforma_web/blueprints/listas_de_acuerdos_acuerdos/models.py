@@ -2,6 +2,7 @@
 Listas de Acuerdos Datos, modelos
 """
 from plataforma_web.extensions import db
+from lib.trigrams import trigram_index
 from lib.universal_mixin import UniversalMixin
 
 
@@ -27,6 +28,16 @@ class ListaDeAcuerdoAcuerdo(db.Model, UniversalMixin):
     tipo_juicio = db.Column(db.String(256), nullable=False, default="", server_default="")
     referencia = db.Column(db.Integer(), nullable=False)
 
+    # Índices, en PostgreSQL los de trigramas para buscar por actor y demandado
+    __table_args__ = (
+        db.Index("ix_listas_de_acuerdos_acuerdos_folio", folio),
+        db.Index("ix_listas_de_acuerdos_acuerdos_expediente", expediente),
+        db.Index("ix_listas_de_acuerdos_acuerdos_tipo_acuerdo", tipo_acuerdo),
+        db.Index("ix_listas_de_acuerdos_acuerdos_tipo_juicio", tipo_juicio),
+        trigram_index("ix_listas_de_acuerdos_acuerdos_actor_trgm", "actor"),
+        trigram_index("ix_listas_de_acuerdos_acuerdos_demandado_trgm", "demandado"),
+    )
+
     def __repr__(self):
         """Representación"""
         return "<ListaDeAcuerdoAcuerdo>"
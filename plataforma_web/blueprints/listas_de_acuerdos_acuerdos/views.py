@@ -4,8 +4,9 @@ Listas de Acuerdos Acuerdos, vistas
 import json
 from flask import Blueprint, flash, redirect, request, render_template, url_for
 from flask_login import current_user, login_required
+from sqlalchemy.orm import contains_eager
 
-from lib import datatables
+from lib import catalogs, datatables, trigrams
 from lib.safe_string import safe_expediente, safe_message, safe_numero_publicacion, safe_string
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
@@ -13,7 +14,6 @@ from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
 from plataforma_web.blueprints.listas_de_acuerdos_acuerdos.models import ListaDeAcuerdoAcuerdo
 from plataforma_web.blueprints.listas_de_acuerdos_acuerdos.forms import ListaDeAcuerdoAcuerdoForm, ListaDeAcuerdoAcuerdoSearchForm
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 listas_de_acuerdos_acuerdos = Blueprint("listas_de_acuerdos_acuerdos", __name__, template_folder="templates")
@@ -55,26 +55,53 @@ def list_inactive():
 def search():
     """Buscar Acuerdos"""
     form_search = ListaDeAcuerdoAcuerdoSearchForm()
+    form_search.autoridad.choices = [(0, "Todas")] + [(autoridad.id, f"{autoridad.clave} - {autoridad.descripcion_corta}") for autoridad in catalogs.autoridades_jurisdiccionales()]
     if form_search.validate_on_submit():
         busqueda = {"estatus": "A"}
         titulos = []
         fallo_validacion = False
+        # autoridad
+        if form_search.autoridad.data:
+            autoridad = catalogs.get_autoridad(form_search.autoridad.data)
+            if autoridad is not None:
+                busqueda["autoridad_id"] = autoridad.id
+                titulos.append(autoridad.clave)
+        # fecha_desde y fecha_hasta
+        if form_search.fecha_desde.data:
+            busqueda["fecha_desde"] = form_search.fecha_desde.data.strftime("%Y-%m-%d")
+            titulos.append("desde " + busqueda["fecha_desde"])
+        if form_search.fecha_hasta.data:
+            busqueda["fecha_hasta"] = form_search.fecha_hasta.data.strftime("%Y-%m-%d")
+            titulos.append("hasta " + busqueda["fecha_hasta"])
         # folio
+        if form_search.folio.data:
+            try:
+                busqueda["folio"] = safe_numero_publicacion(form_search.folio.data)
+                titulos.append("folio " + busqueda["folio"])
+            except (IndexError, ValueError):
+                flash("Folio incorrecto.", "warning")
+                fallo_validacion = True
         # expediente
-        # actor
-        # demandado
-        # tipo_acuerdo
-        # tipo_juicio
+        if form_search.expediente.data:
+            try:
+                busqueda["expediente"] = safe_expediente(form_search.expediente.data)
+                titulos.append("expediente " + busqueda["expediente"])
+            except (IndexError, ValueError):
+                flash("Expediente incorrecto.", "warning")
+                fallo_validacion = True
+        # actor, demandado, tipo_acuerdo y tipo_juicio
+        for campo, etiqueta in (("actor", "actor"), ("demandado", "demandado"), ("tipo_acuerdo", "tipo de acuerdo"), ("tipo_juicio", "tipo de juicio")):
+            valor = safe_string(getattr(form_search, campo).data)
+            if valor != "":
+                busqueda[campo] = valor
+                titulos.append(f"{etiqueta} {valor}")
         # Mostrar resultados
-        if current_user.can_admin("LISTAS DE ACUERDOS"):
-            plantilla = "listas_de_acuerdos/list_admin.jinja2"
-        else:
-            plantilla = "listas_de_acuerdos/list.jinja2"
         if not fallo_validacion:
             return render_template(
-                plantilla,
+                "listas_de_acuerdos_acuerdos/list.jinja2",
                 filtros=json.dumps(busqueda),
-                titulo="Acuerdos con " + ", ".join(titulos),
+                titulo="Acuerdos con " + ", ".join(titulos) if titulos else "Todos los Acuerdos",
+                estatus="A",
             )
     # Mostrar formulario para buscar
     return render_template(
@@ -83,30 +110,60 @@ def search():
     )
 
 
+def filter_acuerdos(consulta):
+    """Filtrar los acuerdos con los parámetros del datatable, junto con su lista de acuerdos"""
+    consulta = consulta.join(ListaDeAcuerdoAcuerdo.lista_de_acuerdo).options(contains_eager(ListaDeAcuerdoAcuerdo.lista_de_acuerdo))
+    if "estatus" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.estatus == request.form["estatus"])
+    else:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.estatus == "A")
+    if "autoridad_id" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdo.autoridad_id == request.form["autoridad_id"])
+    if "fecha_desde" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdo.fecha >= request.form["fecha_desde"])
+    if "fecha_hasta" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdo.fecha <= request.form["fecha_hasta"])
+    if "folio" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.folio == request.form["folio"])
+    if "expediente" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.expediente == request.form["expediente"])
+    if "actor" in request.form:
+        consulta = trigrams.filter_similar(consulta, ListaDeAcuerdoAcuerdo.actor, request.form["actor"])
+    if "demandado" in request.form:
+        consulta = trigrams.filter_similar(consulta, ListaDeAcuerdoAcuerdo.demandado, request.form["demandado"])
+    if "tipo_acuerdo" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.tipo_acuerdo == safe_string(request.form["tipo_acuerdo"]))
+    if "tipo_juicio" in request.form:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.tipo_juicio == safe_string(request.form["tipo_juicio"]))
+    return consulta
+
+
+def page_acuerdos(consulta, start, rows_per_page):
+    """Página de acuerdos del más al menos reciente, después del id anterior si lo hay, con un renglón de más"""
+    cursor = datatables.get_cursor()
+    consulta = consulta.order_by(ListaDeAcuerdoAcuerdo.id.desc())
+    if cursor is not None:
+        consulta = consulta.filter(ListaDeAcuerdoAcuerdo.id < cursor)
+    else:
+        consulta = consulta.offset(start)
+    return consulta.limit(rows_per_page + 1).all()
+
+
 @listas_de_acuerdos_acuerdos.route("/listas_de_acuerdos/acuerdos/datatable_json", methods=["GET", "POST"])
 def datatable_json():
     """DataTable JSON para Acuerdos"""
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = datatables.get_parameters()
     # Consultar
-    consulta = ListaDeAcuerdoAcuerdo.query
-    if "estatus" in request.form:
-        consulta = consulta.filter_by(estatus=request.form["estatus"])
-    else:
-        consulta = consulta.filter_by(estatus="A")
-    # folio
-    # expediente
-    # actor
-    # demandado
-    # tipo_acuerdo
-    # tipo_juicio
-    registros = consulta.order_by(ListaDeAcuerdoAcuerdo.creado.desc()).offset(start).limit(rows_per_page).all()
-    total = consulta.count()
+    registros = page_acuerdos(filter_acuerdos(ListaDeAcuerdoAcuerdo.query), start, rows_per_page)
     # Elaborar datos para DataTable
     data = []
     for acuerdo in registros:
         data.append(
             {
+                "id": acuerdo.id,
+                "fecha": acuerdo.lista_de_acuerdo.fecha.strftime("%Y-%m-%d"),
+                "autoridad": catalogs.get_autoridad(acuerdo.lista_de_acuerdo.autoridad_id).clave,
                 "detalle": {
                     "referencia": acuerdo.referencia,
                     "url": url_for("listas_de_acuerdos_acuerdos.detail", lista_de_acuerdo_acuerdo_id=acuerdo.id),
@@ -118,7 +175,7 @@ def datatable_json():
             }
         )
     # Entregar JSON
-    return datatables.output(draw, total, data)
+    return datatables.output_keyset(draw, start, rows_per_page, data)
 
 
 @listas_de_acuerdos_acuerdos.route("/listas_de_acuerdos/acuerdos/datatable_json_admin", methods=["GET", "POST"])
@@ -128,25 +185,16 @@ def datatable_json_admin():
     # Tomar parámetros de Datatables
     draw, start, rows_per_page = datatables.get_parameters()
     # Consultar
-    consulta = ListaDeAcuerdoAcuerdo.query
-    if "estatus" in request.form:
-        consulta = consulta.filter_by(estatus=request.form["estatus"])
-    else:
-        consulta = consulta.filter_by(estatus="A")
-    # folio
-    # expediente
-    # actor
-    # demandado
-    # tipo_acuerdo
-    # tipo_juicio
-    registros = consulta.order_by(ListaDeAcuerdoAcuerdo.creado.desc()).offset(start).limit(rows_per_page).all()
-    total = consulta.count()
+    registros = page_acuerdos(filter_acuerdos(ListaDeAcuerdoAcuerdo.query), start, rows_per_page)
     # Elaborar datos para DataTable
     data = []
     for acuerdo in registros:
         data.append(
             {
+                "id": acuerdo.id,
                 "creado": acuerdo.creado.strftime("%Y-%m-%d %H:%M:%S"),
+                "fecha": acuerdo.lista_de_acuerdo.fecha.strftime("%Y-%m-%d"),
+                "autoridad": catalogs.get_autoridad(acuerdo.lista_de_acuerdo.autoridad_id).clave,
                 "detalle": {
                     "referencia": acuerdo.referencia,
                     "url": url_for("listas_de_acuerdos_acuerdos.detail", lista_de_acuerdo_acuerdo_id=acuerdo.id),
@@ -158,7 +206,7 @@ def datatable_json_admin():
             }
         )
     # Entregar JSON
-    return datatables.output(draw, total, data)
+    return datatables.output_keyset(draw, start, rows_per_page, data)
 
 
 @listas_de_acuerdos_acuerdos.route("/listas_de_acuerdos/acuerdos/<int:lista_de_acuerdo_acuerdo_id>")
@@ -201,11 +249,11 @@ def new(lista_de_acuerdo_id):
             tipo_juicio=safe_string(form.tipo_juicio.data),
             referencia=form.referencia.data,
         )
-        acuerdo.save()
+        acuerdo.save(commit=False)
 
         # Agregar evento a la bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo acuerdo {acuerdo.referencia} de {acuerdo.lista_de_acuerdo.autoridad.clave} del {acuerdo.lista_de_acuerdo.fecha.strftime('%Y-%m-%d')}."),
             url=url_for("listas_de_acuerdos_acuerdos.detail", lista_de_acuerdo_acuerdo_id=acuerdo.id),
@@ -246,11 +294,11 @@ def edit(lista_de_acuerdo_acuerdo_id):
         acuerdo.tipo_acuerdo = safe_string(form.tipo_acuerdo.data)
         acuerdo.tipo_juicio = safe_string(form.tipo_juicio.data)
         acuerdo.referencia = form.referencia.data
-        acuerdo.save()
+        acuerdo.save(commit=False)
 
         # Agregar evento a la bitácora e ir al detalle
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado acuerdo {acuerdo.referencia} de {acuerdo.lista_de_acuerdo.autoridad.clave} del {acuerdo.lista_de_acuerdo.fecha.strftime('%Y-%m-%d')}."),
             url=url_for("listas_de_acuerdos_acuerdos.detail", lista_de_acuerdo_acuerdo_id=acuerdo.id),
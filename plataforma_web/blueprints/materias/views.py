@@ -12,7 +12,6 @@ from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.materias.models import Materia
 from plataforma_web.blueprints.materias.forms import MateriaForm
 from plataforma_web.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 materias = Blueprint("materias", __name__, template_folder="templates")
@@ -69,9 +68,9 @@ def new():
     form = MateriaForm()
     if form.validate_on_submit():
         materia = Materia(nombre=safe_string(form.nombre.data))
-        materia.save()
+        materia.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nueva materia {materia.nombre}"),
             url=url_for("materias.detail", materia_id=materia.id),
@@ -90,9 +89,9 @@ def edit(materia_id):
     form = MateriaForm()
     if form.validate_on_submit():
         materia.nombre = safe_string(form.nombre.data)
-        materia.save()
+        materia.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editada materia {materia.nombre}"),
             url=url_for("materias.detail", materia_id=materia.id),
@@ -110,9 +109,9 @@ def delete(materia_id):
     """Eliminar Materia"""
     materia = Materia.query.get_or_404(materia_id)
     if materia.estatus == "A":
-        materia.delete()
+        materia.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminada materia {materia.nombre}"),
             url=url_for("materias.detail", materia_id=materia.id),
@@ -128,9 +127,9 @@ def recover(materia_id):
     """Recuperar Materia"""
     materia = Materia.query.get_or_404(materia_id)
     if materia.estatus == "B":
-        materia.recover()
+        materia.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperada materia {materia.nombre}"),
             url=url_for("materias.detail", materia_id=materia.id),
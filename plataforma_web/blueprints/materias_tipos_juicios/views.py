@@ -10,7 +10,6 @@ from plataforma_web.blueprints.usuarios.decorators import permission_required
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
 from plataforma_web.blueprints.materias_tipos_juicios.forms import MateriaTipoJuicioForm
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 materias_tipos_juicios = Blueprint("materias_tipos_juicios", __name__, template_folder="templates")
@@ -68,9 +67,9 @@ def new():
             materia=form.materia.data,
             descripcion=safe_string(form.descripcion.data),
         )
-        materia_tipo_juicio.save()
+        materia_tipo_juicio.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo Tipo de Juicio {materia_tipo_juicio.descripcion} en {materia_tipo_juicio.materia.nombre}"),
             url=url_for("materias_tipos_juicios.detail", materia_tipo_juicio_id=materia_tipo_juicio.id),
@@ -90,9 +89,9 @@ def edit(materia_tipo_juicio_id):
     if form.validate_on_submit():
         materia_tipo_juicio.materia = form.materia.data
         materia_tipo_juicio.descripcion = safe_string(form.descripcion.data)
-        materia_tipo_juicio.save()
+        materia_tipo_juicio.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado el tipo de juicio {materia_tipo_juicio.descripcion} en {materia_tipo_juicio.materia.nombre}"),
             url=url_for("materias_tipos_juicios.detail", materia_tipo_juicio_id=materia_tipo_juicio.id),
@@ -111,9 +110,9 @@ def delete(materia_tipo_juicio_id):
     """Eliminar Materia Tipo de Juicio"""
     materia_tipo_juicio = MateriaTipoJuicio.query.get_or_404(materia_tipo_juicio_id)
     if materia_tipo_juicio.estatus == "A":
-        materia_tipo_juicio.delete()
+        materia_tipo_juicio.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado el tipo de juicio {materia_tipo_juicio.descripcion} de {materia_tipo_juicio.materia.nombre}"),
             url=url_for("materias_tipos_juicios.detail", materia_tipo_juicio_id=materia_tipo_juicio.id),
@@ -129,9 +128,9 @@ def recover(materia_tipo_juicio_id):
     """Recuperar Materia Tipo de Juicio"""
     materia_tipo_juicio = MateriaTipoJuicio.query.get_or_404(materia_tipo_juicio_id)
     if materia_tipo_juicio.estatus == "B":
-        materia_tipo_juicio.recover()
+        materia_tipo_juicio.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado el tipo de juicio {materia_tipo_juicio.descripcion} de {materia_tipo_juicio.materia.nombre}"),
             url=url_for("materias_tipos_juicios.detail", materia_tipo_juicio_id=materia_tipo_juicio.id),
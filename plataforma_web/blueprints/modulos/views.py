@@ -1,9 +1,10 @@
 """
 Modulos, vistas
 """
-from flask import Blueprint, flash, redirect, render_template, url_for
+from flask import Blueprint, abort, current_app, flash, make_response, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
+from lib import profiler
 from lib.safe_string import safe_message, safe_string
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
@@ -67,9 +68,9 @@ def new():
             ruta=form.ruta.data,
             en_navegacion=form.en_navegacion.data == 1,
         )
-        modulo.save()
+        modulo.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo módulo {modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=modulo.id),
@@ -92,9 +93,9 @@ def edit(modulo_id):
         modulo.icono = form.icono.data
         modulo.ruta = form.ruta.data
         modulo.en_navegacion = form.en_navegacion.data == 1
-        modulo.save()
+        modulo.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado módulo {modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=modulo.id),
@@ -119,9 +120,9 @@ def delete(modulo_id):
     """Eliminar Modulo"""
     modulo = Modulo.query.get_or_404(modulo_id)
     if modulo.estatus == "A":
-        modulo.delete()
+        modulo.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado módulo {modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=modulo.id),
@@ -138,9 +139,9 @@ def recover(modulo_id):
     """Recuperar Modulo"""
     modulo = Modulo.query.get_or_404(modulo_id)
     if modulo.estatus == "B":
-        modulo.recover()
+        modulo.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado módulo {modulo.nombre}"),
             url=url_for("modulos.detail", modulo_id=modulo.id),
@@ -149,3 +150,66 @@ def recover(modulo_id):
         flash(bitacora.descripcion, "success")
         return redirect(bitacora.url)
     return redirect(url_for("modulos.detail", modulo_id=modulo.id))
+
+
+@modulos.route("/modulos/perfiles")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def profiles():
+    """Perfiles de las peticiones, del más reciente al más antiguo"""
+    return render_template(
+        "modulos/profiles.jinja2",
+        perfiles=profiler.profiles(current_app.redis),
+        encendido=profiler.COOKIE in request.cookies,
+        retener_minutos=profiler.RETENER_SEGUNDOS // 60,
+        titulo="Perfiles de peticiones",
+    )
+
+
+@modulos.route("/modulos/perfiles/encender")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def profiles_on():
+    """Perfilar las peticiones de este navegador durante unos minutos"""
+    bitacora = Bitacora(
+        modulo_nombre=MODULO,
+        usuario=current_user,
+        descripcion=safe_message(f"Encendido el perfilador por {profiler.COOKIE_SEGUNDOS // 60} minutos"),
+        url=url_for("modulos.profiles"),
+    )
+    bitacora.save()
+    flash(bitacora.descripcion, "success")
+    respuesta = make_response(redirect(bitacora.url))
+    respuesta.set_cookie(profiler.COOKIE, "1", max_age=profiler.COOKIE_SEGUNDOS, httponly=True, samesite="Lax")
+    return respuesta
+
+
+@modulos.route("/modulos/perfiles/apagar")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def profiles_off():
+    """Dejar de perfilar las peticiones de este navegador"""
+    flash("Apagado el perfilador", "success")
+    respuesta = make_response(redirect(url_for("modulos.profiles")))
+    respuesta.delete_cookie(profiler.COOKIE)
+    return respuesta
+
+
+@modulos.route("/modulos/perfiles/<perfil_id>")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def profile_detail(perfil_id):
+    """Detalle de un perfil con las funciones de mayor tiempo"""
+    perfil = profiler.profile_summary(current_app.redis, perfil_id)
+    if perfil is None:
+        abort(404)
+    return render_template("modulos/profile_detail.jinja2", perfil=perfil, titulo=f"Perfil de {perfil['ruta']}")
+
+
+@modulos.route("/modulos/perfiles/<perfil_id>/descargar")
+@permission_required(MODULO, Permiso.ADMINISTRAR)
+def profile_download(perfil_id):
+    """Descargar las estadísticas del perfil para abrirlas con snakeviz o pstats"""
+    estadisticas = profiler.profile_stats(current_app.redis, perfil_id)
+    if estadisticas is None:
+        abort(404)
+    respuesta = make_response(estadisticas)
+    respuesta.headers["Content-Type"] = "application/octet-stream"
+    respuesta.headers["Content-Disposition"] = f"attachment; filename=perfil-{perfil_id}.prof"
+    return respuesta
@@ -3,6 +3,7 @@ Peritos, modelos
 """
 from collections import OrderedDict
 from plataforma_web.extensions import db
+from lib.trigrams import trigram_index
 from lib.universal_mixin import UniversalMixin
 
 
@@ -84,6 +85,9 @@ class Perito(db.Model, UniversalMixin):
     renovacion = db.Column(db.Date, nullable=False, index=True)
     notas = db.Column(db.String(256))
 
+    # Índices
+    __table_args__ = (trigram_index("ix_peritos_nombre_trgm", "nombre"),)
+
     def __repr__(self):
         """Representación"""
         return f"<Perito {self.nombre}>"
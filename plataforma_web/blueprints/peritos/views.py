@@ -5,7 +5,7 @@ import json
 from flask import Blueprint, flash, redirect, request, render_template, url_for
 from flask_login import current_user, login_required
 
-from lib import datatables
+from lib import datatables, trigrams
 from lib.safe_string import safe_message, safe_string
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
@@ -13,7 +13,6 @@ from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.peritos.models import Perito
 from plataforma_web.blueprints.peritos.forms import PeritoForm, PeritoSearchForm
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 peritos = Blueprint("peritos", __name__, template_folder="templates")
@@ -93,7 +92,8 @@ def datatable_json():
         if distrito:
             consulta = consulta.filter(Perito.distrito == distrito)
     if "nombre" in request.form:
-        consulta = consulta.filter(Perito.nombre.like("%" + safe_string(request.form["nombre"]) + "%"))
+        consulta = trigrams.filter_similar(consulta, Perito.nombre, request.form["nombre"])
+        consulta = trigrams.order_by_similarity(consulta, Perito.nombre, request.form["nombre"])
     if "tipo" in request.form:
         consulta = consulta.filter_by(tipo=safe_string(request.form["tipo"]))
     registros = consulta.order_by(Perito.nombre).offset(start).limit(rows_per_page).all()
@@ -139,9 +139,9 @@ def new():
             renovacion=form.renovacion.data,
             notas=safe_string(form.notas.data),
         )
-        perito.save()
+        perito.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo perito {perito.nombre}, tipo {perito.tipo} en {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -168,9 +168,9 @@ def edit(perito_id):
         perito.email = form.email.data
         perito.renovacion = form.renovacion.data
         perito.notas = safe_string(form.notas.data)
-        perito.save()
+        perito.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado perito {perito.nombre} de {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -196,9 +196,9 @@ def delete(perito_id):
     """Eliminar Perito"""
     perito = Perito.query.get_or_404(perito_id)
     if perito.estatus == "A":
-        perito.delete()
+        perito.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado perito {perito.nombre} de {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -214,9 +214,9 @@ def recover(perito_id):
     """Recuperar Perito"""
     perito = Perito.query.get_or_404(perito_id)
     if perito.estatus == "B":
-        perito.recover()
+        perito.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado perito {perito.nombre} de {perito.distrito.nombre}"),
             url=url_for("peritos.detail", perito_id=perito.id),
@@ -74,9 +74,9 @@ def new():
             nombre=nombre,
             nivel=nivel,
         )
-        permiso.save()
+        permiso.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo permiso {nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -106,9 +106,9 @@ def new_with_rol(rol_id):
             nombre=nombre,
             nivel=nivel,
         )
-        permiso.save()
+        permiso.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo permiso {nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -144,9 +144,9 @@ def new_with_modulo(modulo_id):
             nombre=nombre,
             nivel=nivel,
         )
-        permiso.save()
+        permiso.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo permiso {nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -172,9 +172,9 @@ def edit(permiso_id):
     if form.validate_on_submit():
         permiso.nivel = form.nivel.data
         permiso.nombre = f"{permiso.rol.nombre} puede {Permiso.NIVELES[permiso.nivel]} en {permiso.modulo.nombre}"
-        permiso.save()
+        permiso.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado permiso {permiso.nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -192,9 +192,9 @@ def delete(permiso_id):
     """Eliminar Permiso"""
     permiso = Permiso.query.get_or_404(permiso_id)
     if permiso.estatus == "A":
-        permiso.delete()
+        permiso.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado permiso {permiso.nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -211,9 +211,9 @@ def recover(permiso_id):
     """Recuperar Permiso"""
     permiso = Permiso.query.get_or_404(permiso_id)
     if permiso.estatus == "B":
-        permiso.recover()
+        permiso.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado permiso {permiso.nombre}"),
             url=url_for("permisos.detail", permiso_id=permiso.id),
@@ -6,6 +6,8 @@ Rep Graficas, tareas en el fondo
 from datetime import datetime, timedelta
 import logging
 from lib.tasks import set_task_progress, set_task_error
+from lib.task_metrics import measure_task
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 from plataforma_web.blueprints.rep_graficas.models import RepGrafica
@@ -22,6 +24,7 @@ app = create_app()
 app.app_context().push()
 
 
+@measure_task
 def elaborar(rep_grafica_id: int):
     """Elaborar los reportes pendientes de una gráfica"""
 
@@ -41,21 +44,22 @@ def elaborar(rep_grafica_id: int):
         if rep_grafica.corte == 'DIARIO':
             puntero = rep_grafica.desde
             cantidad = 0
-            while puntero <= rep_grafica.hasta:
-                inicio = datetime(year=puntero.year, month=puntero.month, day=puntero.day, hour=0, minute=0, second=0)
-                termino = datetime(year=puntero.year, month=puntero.month, day=puntero.day, hour=23, minute=59, second=59)
-                siguiente_dia = (termino + timedelta(days=1)).date()
-                programado = datetime(year=siguiente_dia.year, month=siguiente_dia.month, day=siguiente_dia.day, hour=0, minute=0, second=0)
-                RepReporte(
-                    rep_grafica=rep_grafica,
-                    descripcion="Reporte diario del " + puntero.strftime("%Y-%m-%d"),
-                    inicio=inicio,
-                    termino=termino,
-                    programado=programado,
-                    progreso="PENDIENTE",
-                ).save()
-                puntero += timedelta(days=1)
-                cantidad += 1
+            with bulk():
+                while puntero <= rep_grafica.hasta:
+                    inicio = datetime(year=puntero.year, month=puntero.month, day=puntero.day, hour=0, minute=0, second=0)
+                    termino = datetime(year=puntero.year, month=puntero.month, day=puntero.day, hour=23, minute=59, second=59)
+                    siguiente_dia = (termino + timedelta(days=1)).date()
+                    programado = datetime(year=siguiente_dia.year, month=siguiente_dia.month, day=siguiente_dia.day, hour=0, minute=0, second=0)
+                    RepReporte(
+                        rep_grafica=rep_grafica,
+                        descripcion="Reporte diario del " + puntero.strftime("%Y-%m-%d"),
+                        inicio=inicio,
+                        termino=termino,
+                        programado=programado,
+                        progreso="PENDIENTE",
+                    ).save()
+                    puntero += timedelta(days=1)
+                    cantidad += 1
             mensaje = f"Para {rep_grafica.descripcion} se crearon {cantidad} reportes."
             bitacora.info(mensaje)
         else:
@@ -68,7 +72,7 @@ def elaborar(rep_grafica_id: int):
     cantidad = 0
     for rep_reporte in rep_grafica.rep_reportes:
         if rep_reporte.estatus == "A" and rep_reporte.progreso == "PENDIENTE" and rep_reporte.programado <= hoy:
-            app.task_queue.enqueue(
+            app.task_queues.enqueue(
                 "plataforma_web.blueprints.rep_reportes.tasks.elaborar",
                 rep_reporte_id=rep_reporte.id,
             )
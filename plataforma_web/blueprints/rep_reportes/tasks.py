@@ -5,7 +5,10 @@ Rep Reportes, tareas en el fondo
 """
 from datetime import datetime
 import logging
+from lib.replicas import read_replica
 from lib.tasks import set_task_progress, set_task_error
+from lib.task_metrics import measure_task
+from lib.universal_mixin import bulk
 
 from plataforma_web.app import create_app
 
@@ -25,6 +28,7 @@ app = create_app()
 app.app_context().push()
 
 
+@measure_task
 def elaborar(rep_reporte_id: int):
     """Elaborar reporte"""
 
@@ -55,20 +59,22 @@ def elaborar(rep_reporte_id: int):
     # TODO: Cuando rep_grafica tenga el listado de módulos se deberá filtrar esta consulta
     modulos = Modulo.query.filter_by(estatus="A").order_by(Modulo.nombre).all()
     cantidad = 0
-    for modulo in modulos:
-        cantidad = Bitacora.query.filter(Bitacora.modulo == modulo.nombre).filter(Bitacora.creado >= rep_reporte.inicio).filter(Bitacora.creado <= rep_reporte.termino).count()
-        RepResultado(
-            rep_reporte=rep_reporte,
-            modulo=modulo,
-            descripcion="Total de operaciones",
-            tipo="TOTAL",
-            cantidad=cantidad,
-        ).save()
-        cantidad += 1
+    with bulk():
+        for modulo in modulos:
+            with read_replica():
+                cantidad = Bitacora.query.filter(Bitacora.modulo_id == modulo.id).filter(Bitacora.creado >= rep_reporte.inicio).filter(Bitacora.creado <= rep_reporte.termino).count()
+            RepResultado(
+                rep_reporte=rep_reporte,
+                modulo=modulo,
+                descripcion="Total de operaciones",
+                tipo="TOTAL",
+                cantidad=cantidad,
+            ).save()
+            cantidad += 1
 
-    # Cambiar progreso a TERMINADO
-    rep_reporte.progreso = "TERMINADO"
-    rep_reporte.save()
+        # Cambiar progreso a TERMINADO
+        rep_reporte.progreso = "TERMINADO"
+        rep_reporte.save()
 
     # Terminar tarea
     if cantidad > 0:
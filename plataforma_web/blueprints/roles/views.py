@@ -8,7 +8,6 @@ from lib.safe_string import safe_message, safe_string
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.roles.models import Rol
 from plataforma_web.blueprints.roles.forms import RolForm
@@ -62,9 +61,9 @@ def new():
     form = RolForm()
     if form.validate_on_submit():
         rol = Rol(nombre=safe_string(form.nombre.data))
-        rol.save()
+        rol.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -83,9 +82,9 @@ def edit(rol_id):
     form = RolForm()
     if form.validate_on_submit():
         rol.nombre = safe_string(form.nombre.data)
-        rol.save()
+        rol.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -103,9 +102,9 @@ def delete(rol_id):
     """Eliminar Rol"""
     rol = Rol.query.get_or_404(rol_id)
     if rol.estatus == "A":
-        rol.delete()
+        rol.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -122,9 +121,9 @@ def recover(rol_id):
     """Recuperar Rol"""
     rol = Rol.query.get_or_404(rol_id)
     if rol.estatus == "B":
-        rol.recover()
+        rol.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado rol {rol.nombre}"),
             url=url_for("roles.detail", rol_id=rol.id),
@@ -16,7 +16,10 @@ from google.cloud import storage
 import sendgrid
 from sendgrid.helpers.mail import Attachment, ContentId, Disposition, Email, FileContent, FileName, FileType, To, Content, Mail
 
+from lib.replicas import read_replica
 from lib.tasks import set_task_progress, set_task_error
+from lib.task_metrics import count_storage_calls, count_task_rows, measure_task
+from lib.universal_mixin import bulk
 from plataforma_web.app import create_app
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.sentencias.models import Sentencia
@@ -37,6 +40,8 @@ locale.setlocale(locale.LC_TIME, "es_MX")
 SUBDIRECTORIO = "Sentencias"
 
 
+@measure_task
+@read_replica()
 def enviar_reporte():
     """Enviar via correo electronico el reporte de sentencias"""
 
@@ -137,6 +142,7 @@ def enviar_reporte():
     return mensaje_final
 
 
+@measure_task
 def refrescar(autoridad_id: int, usuario_id: int = None):
     """Rastrear las sentencias para agregar las que no tiene y dar de baja las que no existen en la BD"""
     bitacora.info("Inicia")
@@ -172,8 +178,11 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     deposito = os.environ.get("CLOUD_STORAGE_DEPOSITO", "pjecz-pruebas")
     bucket = storage.Client().get_bucket(deposito)
     subdirectorio = f"{SUBDIRECTORIO}/{autoridad.directorio_sentencias}"
-    blobs = list(bucket.list_blobs(prefix=subdirectorio))
+    blobs_iterador = bucket.list_blobs(prefix=subdirectorio)
+    blobs = list(blobs_iterador)
+    count_storage_calls(1 + blobs_iterador.page_number)
     total_en_deposito = len(blobs)
+    count_task_rows(total_en_deposito)
     if total_en_deposito == 0:
         return set_task_error(f"No existe o no hay archivos en {subdirectorio}")
     bitacora.info("- Tiene %d archivos en el depósito", total_en_deposito)
@@ -187,96 +196,99 @@ def refrescar(autoridad_id: int, usuario_id: int = None):
     contador_insertados = 0
     contador_presentes = 0
 
-    # Bucle por los archivos en el depósito
-    for blob in blobs:
-
-        # Validar que sea PDF
-        ruta = Path(blob.name)
-        if ruta.suffix.lower() != ".pdf":
-            continue
-
-        # Saltar y quitar de la lista si se encuentra en la consulta
-        esta_en_bd = False
-        for indice, sentencia in enumerate(sentencias):
-            if blob.public_url == sentencia.url:
-                sentencias.pop(indice)
-                esta_en_bd = True
-                break
-        if esta_en_bd:
-            contador_presentes += 1
-            continue
-
-        # A partir de aquí tenemos un archivo que no está en la base de datos
-        # El nombre del archivo para una sentencia debe ser como
-        # AAAA-MM-DD-EEEE-EEEE-SENT-SENT-G-IDHASED.pdf
-
-        # Separar elementos del nombre del archivo
-        nombre_sin_extension = ruta.name[:-4]
-        elementos = re.sub(letras_digitos_regex, "-", nombre_sin_extension).strip("-").split("-")
-
-        # Tomar la fecha
-        try:
-            ano = int(elementos[0])
-            mes = int(elementos[1])
-            dia = int(elementos[2])
-            fecha = date(ano, mes, dia)
-        except (IndexError, ValueError):
-            bitacora.warning("X Fecha incorrecta: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Descartar fechas en el futuro o muy en el pasado
-        if not limite_dt <= datetime(year=fecha.year, month=fecha.month, day=fecha.day) <= hoy_dt:
-            bitacora.warning("X Fecha fuera de rango: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Tomar la sentencia
-        try:
-            numero = int(elementos[3])
-            ano = int(elementos[4])
-            sentencia = str(numero) + "/" + str(ano)
-        except (IndexError, ValueError):
-            bitacora.warning("X Sentencia incorrecta: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Tomar el expediente
-        try:
-            numero = int(elementos[5])
-            ano = int(elementos[6])
-            expediente = str(numero) + "/" + str(ano)
-        except (IndexError, ValueError):
-            bitacora.warning("X Expediente incorrecto: %s", ruta)
-            contador_incorrectos += 1
-            continue
-
-        # Tomar la paridad de género
-        es_perspectiva_genero = False
-        if len(elementos) > 7 and elementos[7].upper() == "G":
-            es_perspectiva_genero = True
-
-        # Insertar
-        tiempo_local = blob.time_created.astimezone(tzlocal())
-        Sentencia(
-            creado=tiempo_local,
-            modificado=tiempo_local,
-            autoridad=autoridad,
-            fecha=fecha,
-            sentencia=sentencia,
-            expediente=expediente,
-            es_perspectiva_genero=es_perspectiva_genero,
-            archivo=ruta.name,
-            url=blob.public_url,
-        ).save()
-        contador_insertados += 1
-
-    # Los registros que no se encontraron serán dados de baja
-    contador_borrados = 0
-    for sentencia in sentencias:
-        if sentencia.estatus == "A":
-            sentencia.delete()
-            contador_borrados += 1
+    # Insertar y dar de baja en una sola transacción
+    with bulk():
+
+        # Bucle por los archivos en el depósito
+        for blob in blobs:
+
+            # Validar que sea PDF
+            ruta = Path(blob.name)
+            if ruta.suffix.lower() != ".pdf":
+                continue
+
+            # Saltar y quitar de la lista si se encuentra en la consulta
+            esta_en_bd = False
+            for indice, sentencia in enumerate(sentencias):
+                if blob.public_url == sentencia.url:
+                    sentencias.pop(indice)
+                    esta_en_bd = True
+                    break
+            if esta_en_bd:
+                contador_presentes += 1
+                continue
+
+            # A partir de aquí tenemos un archivo que no está en la base de datos
+            # El nombre del archivo para una sentencia debe ser como
+            # AAAA-MM-DD-EEEE-EEEE-SENT-SENT-G-IDHASED.pdf
+
+            # Separar elementos del nombre del archivo
+            nombre_sin_extension = ruta.name[:-4]
+            elementos = re.sub(letras_digitos_regex, "-", nombre_sin_extension).strip("-").split("-")
+
+            # Tomar la fecha
+            try:
+                ano = int(elementos[0])
+                mes = int(elementos[1])
+                dia = int(elementos[2])
+                fecha = date(ano, mes, dia)
+            except (IndexError, ValueError):
+                bitacora.warning("X Fecha incorrecta: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Descartar fechas en el futuro o muy en el pasado
+            if not limite_dt <= datetime(year=fecha.year, month=fecha.month, day=fecha.day) <= hoy_dt:
+                bitacora.warning("X Fecha fuera de rango: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Tomar la sentencia
+            try:
+                numero = int(elementos[3])
+                ano = int(elementos[4])
+                sentencia = str(numero) + "/" + str(ano)
+            except (IndexError, ValueError):
+                bitacora.warning("X Sentencia incorrecta: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Tomar el expediente
+            try:
+                numero = int(elementos[5])
+                ano = int(elementos[6])
+                expediente = str(numero) + "/" + str(ano)
+            except (IndexError, ValueError):
+                bitacora.warning("X Expediente incorrecto: %s", ruta)
+                contador_incorrectos += 1
+                continue
+
+            # Tomar la paridad de género
+            es_perspectiva_genero = False
+            if len(elementos) > 7 and elementos[7].upper() == "G":
+                es_perspectiva_genero = True
+
+            # Insertar
+            tiempo_local = blob.time_created.astimezone(tzlocal())
+            Sentencia(
+                creado=tiempo_local,
+                modificado=tiempo_local,
+                autoridad=autoridad,
+                fecha=fecha,
+                sentencia=sentencia,
+                expediente=expediente,
+                es_perspectiva_genero=es_perspectiva_genero,
+                archivo=ruta.name,
+                url=blob.public_url,
+            ).save()
+            contador_insertados += 1
+
+        # Los registros que no se encontraron serán dados de baja
+        contador_borrados = 0
+        for sentencia in sentencias:
+            if sentencia.estatus == "A":
+                sentencia.delete()
+                contador_borrados += 1
 
     # Mensaje final
     mensajes = []
@@ -11,17 +11,14 @@ from google.cloud import storage
 from werkzeug.datastructures import CombinedMultiDict
 from werkzeug.utils import secure_filename
 
-from lib import datatables
+from lib import catalogs, datatables
 from lib.safe_string import safe_expediente, safe_message, safe_sentencia, safe_string
 from lib.time_to_text import dia_mes_ano, mes_en_palabra
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.distritos.models import Distrito
-from plataforma_web.blueprints.materias.models import Materia
 from plataforma_web.blueprints.materias_tipos_juicios.models import MateriaTipoJuicio
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.sentencias.forms import SentenciaNewForm, SentenciaEditForm, SentenciaSearchForm, SentenciaSearchAdminForm
 from plataforma_web.blueprints.sentencias.models import Sentencia
@@ -107,18 +104,18 @@ def list_distritos():
     """Listado de Distritos"""
     return render_template(
         "sentencias/list_distritos.jinja2",
-        distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
+        distritos=catalogs.distritos_judiciales(),
     )
 
 
 @sentencias.route("/sentencias/distrito/<int:distrito_id>")
 def list_autoridades(distrito_id):
     """Listado de Autoridades de un distrito"""
-    distrito = Distrito.query.get_or_404(distrito_id)
+    distrito = catalogs.get_or_404("distritos", distrito_id)
     return render_template(
         "sentencias/list_autoridades.jinja2",
         distrito=distrito,
-        autoridades=Autoridad.query.filter(Autoridad.distrito == distrito).filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+        autoridades=catalogs.autoridades_jurisdiccionales(distrito_id=distrito.id),
     )
 
 
@@ -162,7 +159,7 @@ def search():
     """Buscar Sentencias"""
     if current_user.can_admin("SENTENCIAS"):
         puede_elegir_autoridad = True
-    elif current_user.autoridad.es_jurisdiccional:
+    elif catalogs.get_autoridad(current_user.autoridad_id).es_jurisdiccional:
         puede_elegir_autoridad = False
     else:
         puede_elegir_autoridad = True
@@ -176,13 +173,13 @@ def search():
         fallo_validacion = False
         # Autoridad es un campo obligatorio
         if puede_elegir_autoridad:
-            autoridad = Autoridad.query.get(form_search.autoridad.data)
+            autoridad = catalogs.get_autoridad(form_search.autoridad.data)
             plantilla = "sentencias/list_admin.jinja2"
         else:
-            autoridad = current_user.autoridad
+            autoridad = catalogs.get_autoridad(current_user.autoridad_id)
             plantilla = "sentencias/list.jinja2"
         busqueda["autoridad_id"] = autoridad.id
-        titulos.append(autoridad.distrito.nombre_corto + ", " + autoridad.descripcion_corta)
+        titulos.append(catalogs.get_distrito(autoridad.distrito_id).nombre_corto + ", " + autoridad.descripcion_corta)
         # Sentencia
         try:
             sentencia = safe_sentencia(form_search.sentencia.data)
@@ -221,12 +218,13 @@ def search():
         return render_template(
             "sentencias/search_admin.jinja2",
             form=form_search,
-            distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
-            autoridades=Autoridad.query.filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+            distritos=catalogs.distritos_judiciales(),
+            autoridades=catalogs.autoridades_jurisdiccionales(),
         )
     # Mostrar buscador con la autoridad fija
-    form_search.distrito.data = current_user.autoridad.distrito.nombre
-    form_search.autoridad.data = current_user.autoridad.descripcion
+    autoridad = catalogs.get_autoridad(current_user.autoridad_id)
+    form_search.distrito.data = catalogs.get_distrito(autoridad.distrito_id).nombre
+    form_search.autoridad.data = autoridad.descripcion
     return render_template("sentencias/search.jinja2", form=form_search)
 
 
@@ -242,9 +240,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "sentencia" in request.form:
         try:
             sentencia = safe_sentencia(request.form["sentencia"])
@@ -299,9 +297,9 @@ def datatable_json_admin():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter_by(autoridad=autoridad)
+            consulta = consulta.filter_by(autoridad_id=autoridad.id)
     if "sentencia" in request.form:
         try:
             sentencia = safe_sentencia(request.form["sentencia"])
@@ -373,7 +371,7 @@ def detail(sentencia_id):
 def new_success(sentencia):
     """Mensaje de éxito en nueva sentencia"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Nueva sentencia {sentencia.sentencia}, expediente {sentencia.expediente} de {sentencia.autoridad.clave}"),
         url=url_for("sentencias.detail", sentencia_id=sentencia.id),
@@ -491,7 +489,7 @@ def new():
             # Actualizar el nombre del archivo y el url
             sentencia.archivo = archivo_str
             sentencia.url = url
-            sentencia.save()
+            sentencia.save(commit=False)
 
             # Mostrar mensaje de éxito e ir al detalle
             bitacora = new_success(sentencia)
@@ -506,8 +504,8 @@ def new():
         "sentencias/new.jinja2",
         form=form,
         autoridad=autoridad,
-        materias=Materia.query.filter_by(estatus="A").order_by(Materia.id).all(),
-        materias_tipos_juicios=MateriaTipoJuicio.query.filter_by(estatus="A").order_by(MateriaTipoJuicio.materia_id, MateriaTipoJuicio.descripcion).all(),
+        materias=catalogs.materias(),
+        materias_tipos_juicios=catalogs.materias_tipos_juicios(),
     )
 
 
@@ -623,7 +621,7 @@ def new_for_autoridad(autoridad_id):
             # Actualizar el nombre del archivo y el url
             sentencia.archivo = archivo_str
             sentencia.url = url
-            sentencia.save()
+            sentencia.save(commit=False)
 
             # Mostrar mensaje de éxito e ir al detalle
             bitacora = new_success(sentencia)
@@ -638,8 +636,8 @@ def new_for_autoridad(autoridad_id):
         "sentencias/new_for_autoridad.jinja2",
         form=form,
         autoridad=autoridad,
-        materias=Materia.query.filter_by(estatus="A").order_by(Materia.id).all(),
-        materias_tipos_juicios=MateriaTipoJuicio.query.filter_by(estatus="A").order_by(MateriaTipoJuicio.materia_id, MateriaTipoJuicio.descripcion).all(),
+        materias=catalogs.materias(),
+        materias_tipos_juicios=catalogs.materias_tipos_juicios(),
     )
 
 
@@ -699,9 +697,9 @@ def edit(sentencia_id):
         sentencia.descripcion = safe_string(form.descripcion.data, max_len=1000)
 
         if es_valido:
-            sentencia.save()
+            sentencia.save(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Editada la sentencia {sentencia.sentencia}, expediente {sentencia.expediente} de {sentencia.autoridad.clave}"),
                 url=url_for("sentencias.detail", sentencia_id=sentencia.id),
@@ -720,15 +718,15 @@ def edit(sentencia_id):
         "sentencias/edit.jinja2",
         form=form,
         sentencia=sentencia,
-        materias=Materia.query.filter_by(estatus="A").order_by(Materia.id).all(),
-        materias_tipos_juicios=MateriaTipoJuicio.query.filter_by(estatus="A").order_by(MateriaTipoJuicio.materia_id, MateriaTipoJuicio.descripcion).all(),
+        materias=catalogs.materias(),
+        materias_tipos_juicios=catalogs.materias_tipos_juicios(),
     )
 
 
 def delete_success(sentencia):
     """Mensaje de éxito al eliminar una sentencia"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Eliminada la sentencia {sentencia.sentencia}, expediente {sentencia.expediente} de {sentencia.autoridad.clave}"),
         url=url_for("sentencias.detail", sentencia_id=sentencia.id),
@@ -748,7 +746,7 @@ def delete(sentencia_id):
         if current_user.can_admin("SENTENCIAS"):
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= sentencia.creado.timestamp():
-                sentencia.delete()
+                sentencia.delete(commit=False)
                 bitacora = delete_success(sentencia)
                 flash(bitacora.descripcion, "success")
             else:
@@ -756,7 +754,7 @@ def delete(sentencia_id):
         elif current_user.autoridad_id == sentencia.autoridad_id:
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_DIAS)
             if limite_dt.timestamp() <= sentencia.creado.timestamp():
-                sentencia.delete()
+                sentencia.delete(commit=False)
                 bitacora = delete_success(sentencia)
                 flash(bitacora.descripcion, "success")
             else:
@@ -769,7 +767,7 @@ def delete(sentencia_id):
 def recover_success(sentencia):
     """Mensaje de éxito al recuperar una sentencia"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Recuperada la sentencia {sentencia.sentencia}, expediente {sentencia.expediente} de {sentencia.autoridad.clave}"),
         url=url_for("sentencias.detail", sentencia_id=sentencia.id),
@@ -789,7 +787,7 @@ def recover(sentencia_id):
         if current_user.can_admin("SENTENCIAS"):
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_ADMINISTRADORES_DIAS)
             if limite_dt.timestamp() <= sentencia.creado.timestamp():
-                sentencia.recover()
+                sentencia.recover(commit=False)
                 bitacora = recover_success(sentencia)
                 flash(bitacora.descripcion, "success")
             else:
@@ -797,7 +795,7 @@ def recover(sentencia_id):
         elif current_user.autoridad_id == sentencia.autoridad_id:
             limite_dt = hoy_dt + datetime.timedelta(days=-LIMITE_DIAS)
             if limite_dt.timestamp() <= sentencia.creado.timestamp():
-                sentencia.recover()
+                sentencia.recover(commit=False)
                 bitacora = recover_success(sentencia)
                 flash(bitacora.descripcion, "success")
             else:
@@ -1,198 +1,123 @@
 """
 Sistemas, vistas
 """
-from datetime import date, datetime, timedelta
+from datetime import datetime
 
 from flask import Blueprint, redirect, render_template, url_for
-from flask_login import current_user
+from flask_login import current_user, login_required
 
-from plataforma_web.blueprints.audiencias.models import Audiencia
-from plataforma_web.blueprints.edictos.models import Edicto
-from plataforma_web.blueprints.listas_de_acuerdos.models import ListaDeAcuerdo
-from plataforma_web.blueprints.sentencias.models import Sentencia
+from lib import dashboard
 
 sistemas = Blueprint("sistemas", __name__, template_folder="templates")
 
-HOY = date.today()
-BREVE_LIMITE_DIAS = 15
-BREVE_DESDE_DATETIME = datetime(year=HOY.year, month=HOY.month, day=HOY.day) + timedelta(days=-BREVE_LIMITE_DIAS)
-
 TARJETA_SATISFACTORIA = "bg-light"
 TARJETA_ADVERTENCIA = "bg-warning"
 TARJETA_VACIA = "bg-danger"
-TARJETAS_LIMITE_REGISTROS = 5
 
 
-@sistemas.route("/inicio/audiencias_json")
-def audiencias_json():
-    """Audiencias en JSON"""
-    breve = "Sin agenda."
+def audiencias_card(tarjeta):
+    """Tarjeta de la agenda de audiencias"""
+    if tarjeta is None:
+        return {"titulo": "Agenda de Audiencias", "breve": "Sin agenda.", "listado": [], "url": url_for("audiencias.list_active"), "style": TARJETA_VACIA}
     listado = []
-    estilo = TARJETA_VACIA
-    if current_user.autoridad.audiencia_categoria == "NO DEFINIDO":
-        return {
-            "titulo": "Agenda de Audiencias",
-            "breve": breve,
-            "listado": listado,
-            "url": url_for("audiencias.list_active"),
-            "style": estilo,
-        }
-    # Listado
-    audiencias = Audiencia.query.filter(Audiencia.autoridad == current_user.autoridad).filter_by(estatus="A")
-    desde = datetime.now()  # Desde este momento
-    for audiencia in audiencias.filter(Audiencia.tiempo >= desde).order_by(Audiencia.tiempo).limit(TARJETAS_LIMITE_REGISTROS).all():
+    for renglon in tarjeta["listado"]:
         listado.append(
             {
-                "tiempo": audiencia.tiempo.strftime("%Y-%m-%d %H:%M"),
-                "tipo_audiencia": audiencia.tipo_audiencia,
-                "url": url_for("audiencias.detail", audiencia_id=audiencia.id),
+                "tiempo": renglon["tiempo"][:16].replace("T", " "),
+                "tipo_audiencia": renglon["texto_1"],
+                "url": url_for("audiencias.detail", audiencia_id=renglon["id"]),
             }
         )
-    # Breve
+    breve = "Sin agenda."
     estilo = TARJETA_SATISFACTORIA
-    total = audiencias.count()
-    if total > 0:
-        breve = f"Total {total}. "
+    if tarjeta["total"] > 0:
+        breve = f"Total {tarjeta['total']}. "
         if len(listado) > 0:
-            breve += "Desde " + desde.strftime("%Y-%m-%d %H:%M") + ". "
+            breve += "Desde " + datetime.now().strftime("%Y-%m-%d %H:%M") + ". "
         else:
             breve += "No hay eventos en la agenda de hoy."
             estilo = TARJETA_ADVERTENCIA
-    # Entregar JSON
-    return {
-        "titulo": "Agenda de Audiencias",
-        "breve": breve,
-        "listado": listado,
-        "url": url_for("audiencias.list_active"),
-        "style": estilo,
-    }
+    return {"titulo": "Agenda de Audiencias", "breve": breve, "listado": listado, "url": url_for("audiencias.list_active"), "style": estilo}
 
 
-@sistemas.route("/inicio/edictos_json")
-def edictos_json():
-    """Edictos en JSON"""
-    breve = "Sin edictos."
+def edictos_card(tarjeta):
+    """Tarjeta de edictos"""
+    if tarjeta is None:
+        return {"titulo": "Edictos", "breve": "Sin edictos.", "listado": [], "url": url_for("edictos.list_active"), "style": TARJETA_VACIA}
     listado = []
-    estilo = TARJETA_VACIA
-    if current_user.autoridad.directorio_edictos == "":
-        return {
-            "titulo": "Edictos",
-            "breve": breve,
-            "listado": listado,
-            "url": url_for("edictos.list_active"),
-            "style": estilo,
-        }
-    # Listado
-    edictos = Edicto.query.filter(Edicto.autoridad == current_user.autoridad).filter_by(estatus="A")
-    for edicto in edictos.order_by(Edicto.fecha.desc()).limit(TARJETAS_LIMITE_REGISTROS).all():
+    for renglon in tarjeta["listado"]:
         listado.append(
             {
-                "expediente": edicto.expediente,
-                "descripcion": edicto.descripcion,
-                "url": url_for("edictos.detail", edicto_id=edicto.id),
+                "expediente": renglon["texto_1"],
+                "descripcion": renglon["texto_2"],
+                "url": url_for("edictos.detail", edicto_id=renglon["id"]),
             }
         )
-    # Breve
+    breve = "Sin edictos."
     estilo = TARJETA_SATISFACTORIA
-    total = edictos.count()
-    if total > 0:
-        breve = f"Total {total}. "
-        cantidad = edictos.filter(Edicto.creado >= BREVE_DESDE_DATETIME).count()
-        if cantidad > 0:
-            breve += f"Se subieron {cantidad} en {BREVE_LIMITE_DIAS} días."
+    if tarjeta["total"] > 0:
+        breve = f"Total {tarjeta['total']}. "
+        if tarjeta["recientes"] > 0:
+            breve += f"Se subieron {tarjeta['recientes']} en {dashboard.BREVE_LIMITE_DIAS} días."
         else:
-            breve += f"Ninguno en {BREVE_LIMITE_DIAS} días."
+            breve += f"Ninguno en {dashboard.BREVE_LIMITE_DIAS} días."
             estilo = TARJETA_ADVERTENCIA
-    # Entregar JSON
-    return {
-        "titulo": "Edictos",
-        "breve": breve,
-        "listado": listado,
-        "url": url_for("edictos.list_active"),
-        "style": estilo,
-    }
+    return {"titulo": "Edictos", "breve": breve, "listado": listado, "url": url_for("edictos.list_active"), "style": estilo}
 
 
-@sistemas.route("/inicio/listas_de_acuerdos_json")
-def listas_de_acuerdos_json():
-    """Listas de Acuerdos en JSON"""
-    breve = "Sin listas de acuerdos."
+def listas_de_acuerdos_card(tarjeta):
+    """Tarjeta de listas de acuerdos"""
+    if tarjeta is None:
+        return {"titulo": "Listas de Acuerdos", "breve": "Sin listas de acuerdos.", "listado": [], "url": url_for("listas_de_acuerdos.list_active"), "style": TARJETA_VACIA}
     listado = []
-    estilo = TARJETA_VACIA
-    if current_user.autoridad.directorio_listas_de_acuerdos == "":
-        return {
-            "titulo": "Listas de Acuerdos",
-            "breve": breve,
-            "listado": listado,
-            "url": url_for("listas_de_acuerdos.list_active"),
-            "style": estilo,
-        }
-    # Listado
-    listas_de_acuerdos = ListaDeAcuerdo.query.filter(ListaDeAcuerdo.autoridad == current_user.autoridad).filter_by(estatus="A")
-    for lista_de_acuerdo in listas_de_acuerdos.order_by(ListaDeAcuerdo.fecha.desc()).limit(TARJETAS_LIMITE_REGISTROS).all():
+    for renglon in tarjeta["listado"]:
         listado.append(
             {
-                "fecha": lista_de_acuerdo.fecha.strftime("%Y-%m-%d"),
-                "url": url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=lista_de_acuerdo.id),
+                "fecha": renglon["tiempo"][:10],
+                "url": url_for("listas_de_acuerdos.detail", lista_de_acuerdo_id=renglon["id"]),
             }
         )
-    # Breve
-    estilo = TARJETA_SATISFACTORIA
-    total = listas_de_acuerdos.count()
-    if total > 0:
-        breve = f"Total {total}. "
-    # Entregar JSON
-    return {
-        "titulo": "Listas de Acuerdos",
-        "breve": breve,
-        "listado": listado,
-        "url": url_for("listas_de_acuerdos.list_active"),
-        "style": estilo,
-    }
+    breve = "Sin listas de acuerdos."
+    if tarjeta["total"] > 0:
+        breve = f"Total {tarjeta['total']}. "
+    return {"titulo": "Listas de Acuerdos", "breve": breve, "listado": listado, "url": url_for("listas_de_acuerdos.list_active"), "style": TARJETA_SATISFACTORIA}
 
 
-@sistemas.route("/inicio/sentencias_json")
-def sentencias_json():
-    """Sentencias en JSON"""
-    breve = "Sin V.P. de sentencias."
+def sentencias_card(tarjeta):
+    """Tarjeta de versiones públicas de sentencias"""
+    if tarjeta is None:
+        return {"titulo": "V.P. de Sentencias", "breve": "Sin V.P. de sentencias.", "listado": [], "url": url_for("sentencias.list_active"), "style": TARJETA_VACIA}
     listado = []
-    estilo = TARJETA_VACIA
-    if current_user.autoridad.directorio_sentencias == "":
-        return {
-            "titulo": "V.P. de Sentencias",
-            "breve": breve,
-            "listado": listado,
-            "url": url_for("sentencias.list_active"),
-            "style": estilo,
-        }
-    # Listado
-    sentencias = Sentencia.query.filter(Sentencia.autoridad == current_user.autoridad).filter_by(estatus="A")
-    for sentencia in sentencias.order_by(Sentencia.fecha.desc()).limit(TARJETAS_LIMITE_REGISTROS).all():
+    for renglon in tarjeta["listado"]:
         listado.append(
             {
-                "sentencia": sentencia.sentencia,
-                "materia_tipo_juicio": sentencia.materia_tipo_juicio.descripcion,
-                "url": url_for("sentencias.detail", sentencia_id=sentencia.id),
+                "sentencia": renglon["texto_1"],
+                "materia_tipo_juicio": renglon["texto_2"],
+                "url": url_for("sentencias.detail", sentencia_id=renglon["id"]),
             }
         )
-    # Breve
+    breve = "Sin V.P. de sentencias."
     estilo = TARJETA_SATISFACTORIA
-    total = sentencias.count()
-    if total > 0:
-        breve = f"Total {total}. "
-        cantidad = sentencias.filter(Sentencia.creado >= BREVE_DESDE_DATETIME).count()
-        if cantidad > 0:
-            breve += f"Se subieron {cantidad} en {BREVE_LIMITE_DIAS} días."
+    if tarjeta["total"] > 0:
+        breve = f"Total {tarjeta['total']}. "
+        if tarjeta["recientes"] > 0:
+            breve += f"Se subieron {tarjeta['recientes']} en {dashboard.BREVE_LIMITE_DIAS} días."
         else:
-            breve += f"Ninguno en {BREVE_LIMITE_DIAS} días."
+            breve += f"Ninguno en {dashboard.BREVE_LIMITE_DIAS} días."
             estilo = TARJETA_ADVERTENCIA
-    # Entregar JSON
+    return {"titulo": "V.P. de Sentencias", "breve": breve, "listado": listado, "url": url_for("sentencias.list_active"), "style": estilo}
+
+
+@sistemas.route("/inicio/tarjetas_json")
+@login_required
+def tarjetas_json():
+    """Tarjetas de la página de inicio en JSON, todas en una sola petición"""
+    tarjetas = dashboard.get_cards(current_user.autoridad)
     return {
-        "titulo": "V.P. de Sentencias",
-        "breve": breve,
-        "listado": listado,
-        "url": url_for("sentencias.list_active"),
-        "style": estilo,
+        "audiencias": audiencias_card(tarjetas.get("audiencias")),
+        "edictos": edictos_card(tarjetas.get("edictos")),
+        "listas_de_acuerdos": listas_de_acuerdos_card(tarjetas.get("listas_de_acuerdos")),
+        "sentencias": sentencias_card(tarjetas.get("sentencias")),
     }
 
 
@@ -7,7 +7,6 @@ from flask_login import current_user, login_required
 from lib.safe_string import safe_string, safe_message
 
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 from plataforma_web.blueprints.soportes_categorias.models import SoporteCategoria
@@ -64,9 +63,9 @@ def new():
     form = SoporteCategoriaForm()
     if form.validate_on_submit():
         soporte_categoria = SoporteCategoria(nombre=safe_string(form.nombre.data))
-        soporte_categoria.save()
+        soporte_categoria.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo soporte categoria {soporte_categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=soporte_categoria.id),
@@ -85,9 +84,9 @@ def edit(soporte_categoria_id):
     form = SoporteCategoriaForm()
     if form.validate_on_submit():
         soporte_categoria.nombre = safe_string(form.nombre.data)
-        soporte_categoria.save()
+        soporte_categoria.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado soporte categoria {soporte_categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=soporte_categoria.id),
@@ -105,9 +104,9 @@ def delete(soporte_categoria_id):
     """Eliminar Soporte Categoria"""
     soporte_categoria = SoporteCategoria.query.get_or_404(soporte_categoria_id)
     if soporte_categoria.estatus == "A":
-        soporte_categoria.delete()
+        soporte_categoria.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado soporte_categoria_id {soporte_categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=soporte_categoria.id),
@@ -123,9 +122,9 @@ def recover(soporte_categoria_id):
     """Recuperar Soporte Categoria"""
     soporte_categoria = SoporteCategoria.query.get_or_404(soporte_categoria_id)
     if soporte_categoria.estatus == "B":
-        soporte_categoria.recover()
+        soporte_categoria.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado soporte_categoria_id {soporte_categoria.nombre}"),
             url=url_for("soportes_categorias.detail", soporte_categoria_id=soporte_categoria.id),
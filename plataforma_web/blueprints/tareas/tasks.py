@@ -0,0 +1,32 @@
+"""
+Tareas, tareas para ejecutar en el fondo
+
+- reconciliar: Terminar las tareas que ya no están en espera ni en proceso en RQ
+"""
+import logging
+
+from lib.tasks import reconcile_tasks
+from lib.task_metrics import measure_task
+from plataforma_web.app import create_app
+
+bitacora = logging.getLogger(__name__)
+bitacora.setLevel(logging.INFO)
+formato = logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+empunadura = logging.FileHandler("tareas.log")
+empunadura.setFormatter(formato)
+bitacora.addHandler(empunadura)
+
+app = create_app()
+app.app_context().push()
+
+
+@measure_task
+def reconciliar():
+    """Terminar las tareas que ya no están en espera ni en proceso en RQ"""
+    cantidad = reconcile_tasks(app.task_queues)
+    if cantidad > 0:
+        mensaje = f"Se terminaron {cantidad} tareas huérfanas."
+        bitacora.info(mensaje)
+    else:
+        mensaje = "No hay tareas huérfanas."
+    return mensaje
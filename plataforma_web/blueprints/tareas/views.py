@@ -1,9 +1,15 @@
 """
 Tareas, vistas
 """
-from flask import Blueprint, render_template
-from flask_login import login_required
+from flask import Blueprint, current_app, render_template, request
+from flask_login import current_user, login_required
+from flask_socketio import join_room
 
+from lib.task_metrics import task_stats, task_stats_by_autoridad
+from lib.tasks import EVENTO_PROGRESO, task_progress_data, user_room
+from plataforma_web.extensions import socketio
+
+from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.decorators import permission_required
@@ -42,3 +48,60 @@ def list_inactive():
         titulo="Tareas inactivas",
         estatus="B",
     )
+
+
+@tareas.route("/tareas/colas")
+@permission_required(MODULO, Permiso.MODIFICAR)
+def queues():
+    """Profundidad y tiempos de espera de las colas"""
+    return render_template(
+        "tareas/queues.jinja2",
+        estadisticas=current_app.task_queues.stats(),
+        titulo="Colas de tareas",
+    )
+
+
+@tareas.route("/tareas/colas_json")
+@permission_required(MODULO, Permiso.MODIFICAR)
+def queues_json():
+    """Profundidad y tiempos de espera de las colas en JSON"""
+    return {"colas": current_app.task_queues.stats()}
+
+
+@tareas.route("/tareas/metricas")
+@permission_required(MODULO, Permiso.MODIFICAR)
+def metrics():
+    """Métricas de las tareas, de la más lenta a la más rápida"""
+    return render_template(
+        "tareas/metrics.jinja2",
+        resumenes=task_stats(current_app.redis),
+        titulo="Métricas de tareas",
+    )
+
+
+@tareas.route("/tareas/metricas/<nombre>")
+@permission_required(MODULO, Permiso.MODIFICAR)
+def metrics_autoridades(nombre):
+    """Métricas de una tarea por autoridad, para saber cuales la hacen lenta"""
+    resumenes = task_stats_by_autoridad(current_app.redis, nombre)
+    autoridades_ids = [resumen["autoridad_id"] for resumen in resumenes if resumen["autoridad_id"] is not None]
+    autoridades = {}
+    if autoridades_ids:
+        autoridades = {autoridad.id: autoridad for autoridad in Autoridad.query.filter(Autoridad.id.in_(autoridades_ids)).all()}
+    return render_template(
+        "tareas/metrics_autoridades.jinja2",
+        resumenes=resumenes,
+        autoridades=autoridades,
+        titulo=f"Métricas de {nombre} por autoridad",
+    )
+
+
+@socketio.on("connect")
+def connect():
+    """Al conectarse el navegador se une a la sala del usuario y recibe el progreso de sus tareas sin consultar de nuevo"""
+    if not current_user.is_authenticated:
+        return False
+    join_room(user_room(current_user.id))
+    for tarea in current_user.get_tasks_in_progress():
+        socketio.emit(EVENTO_PROGRESO, task_progress_data(tarea, tarea.get_progress()), to=request.sid)
+    return True
@@ -45,3 +45,10 @@ class TesisJurisprudenciaForm(FlaskForm):
     aplicacion_horas_minutos = TimeField("Aplicación hora:minuto", format="%H:%M", validators=[DataRequired()])
     epoca = QuerySelectField(query_factory=epocas_opciones, get_label="nombre")
     guardar = SubmitField("Guardar")
+
+
+class TesisJurisprudenciaSearchForm(FlaskForm):
+    """Formulario para buscar Tesis Jurisprudencias"""
+
+    frase = StringField("Frase", validators=[DataRequired(), Length(max=256)])
+    buscar = SubmitField("Buscar")
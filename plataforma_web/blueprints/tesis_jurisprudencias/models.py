@@ -2,9 +2,31 @@
 Tesis y Jurisprudencias, modelos
 """
 from collections import OrderedDict
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from plataforma_web.extensions import db
 from lib.universal_mixin import UniversalMixin
 
+# Vector de búsqueda en español, con más peso el título y el rubro que el texto y los precedentes
+BUSQUEDA_VECTOR_SQL = """
+    setweight(to_tsvector('spanish', coalesce({fila}titulo, '')), 'A') ||
+    setweight(to_tsvector('spanish', coalesce({fila}subtitulo, '')), 'A') ||
+    setweight(to_tsvector('spanish', coalesce({fila}rubro, '')), 'B') ||
+    setweight(to_tsvector('spanish', coalesce({fila}texto, '')), 'C') ||
+    setweight(to_tsvector('spanish', coalesce({fila}precedentes, '')), 'D')
+"""
+BUSQUEDA_DISPARADOR_SQL = f"""
+CREATE OR REPLACE FUNCTION tesis_jurisprudencias_busqueda_actualizar() RETURNS trigger AS $$
+BEGIN
+    NEW.busqueda := {BUSQUEDA_VECTOR_SQL.format(fila="NEW.")};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS tesis_jurisprudencias_busqueda ON tesis_jurisprudencias;
+CREATE TRIGGER tesis_jurisprudencias_busqueda BEFORE INSERT OR UPDATE OF titulo, subtitulo, rubro, texto, precedentes
+    ON tesis_jurisprudencias FOR EACH ROW EXECUTE PROCEDURE tesis_jurisprudencias_busqueda_actualizar();
+"""
+
 
 class TesisJurisprudencia(db.Model, UniversalMixin):
     """TesisJurisprudencia"""
@@ -67,6 +89,12 @@ class TesisJurisprudencia(db.Model, UniversalMixin):
     publicacion_tiempo = db.Column(db.DateTime(), nullable=False)  # Fecha y hora de publicación de la tesis o jurisprudencia
     aplicacion_tiempo = db.Column(db.DateTime(), nullable=False)  # Fecha y hora en la que se considera de aplicación obligatoria
 
+    # Búsqueda de texto completo, la mantiene el disparador en PostgreSQL; diferida para no cargarla en los listados
+    busqueda = db.deferred(db.Column(TSVECTOR().with_variant(db.Text(), "sqlite"), nullable=True))
+
+    # Índices
+    __table_args__ = (db.Index("ix_tesis_jurisprudencias_busqueda", "busqueda", postgresql_using="gin", info={"dialecto": "postgresql"}).ddl_if(dialect="postgresql"),)
+
     # Hijos de funcionarios
     tesis_jurisprudencias_funcionarios = db.relationship('TesisJurisprudenciaFuncionario', back_populates='tesis_jurisprudencias')
 
@@ -81,3 +109,7 @@ class TesisJurisprudencia(db.Model, UniversalMixin):
     def __repr__(self):
         """Representación"""
         return "<TesisJurisprudencia>"
+
+
+# Al crear la tabla en PostgreSQL se crea el disparador que llena la búsqueda
+event.listen(TesisJurisprudencia.__table__, "after_create", DDL(BUSQUEDA_DISPARADOR_SQL).execute_if(dialect="postgresql"))
@@ -5,19 +5,19 @@ import json
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
-from lib import datatables
-from lib.safe_string import safe_string, safe_message
+from lib import datatables, fulltext
+from lib.safe_string import safe_phrase, safe_string, safe_message
 from lib.time_utc import combine_to_utc, decombine_to_local
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.tesis_jurisprudencias.models import TesisJurisprudencia
-from plataforma_web.blueprints.tesis_jurisprudencias.forms import TesisJurisprudenciaForm
+from plataforma_web.blueprints.tesis_jurisprudencias.forms import TesisJurisprudenciaForm, TesisJurisprudenciaSearchForm
 
 MODULO = "TESIS JURISPRUDENCIAS"
+BUSQUEDA_COLUMNAS = [TesisJurisprudencia.titulo, TesisJurisprudencia.subtitulo, TesisJurisprudencia.rubro, TesisJurisprudencia.texto, TesisJurisprudencia.precedentes]
 ORGANOS_JURISDICCIONALES = ["PLENO O SALA DEL TSJ", "TRIBUNAL DISTRITAL", "TRIBUNAL DE CONCILIACION Y ARBITRAJE"]
 
 tesis_jurisprudencias = Blueprint("tesis_jurisprudencias", __name__, template_folder="templates")
@@ -135,6 +135,24 @@ def list_autoridad_tesis_jurisprudencias_inactive(autoridad_id):
     )
 
 
+@tesis_jurisprudencias.route("/tesis_jurisprudencias/buscar", methods=["GET", "POST"])
+def search():
+    """Buscar Tesis Jurisprudencias por texto completo"""
+    form_search = TesisJurisprudenciaSearchForm()
+    if form_search.validate_on_submit():
+        frase = safe_phrase(form_search.frase.data)
+        if frase != "":
+            return render_template(
+                "tesis_jurisprudencias/list_admin.jinja2" if current_user.can_admin(MODULO) else "tesis_jurisprudencias/list.jinja2",
+                autoridad=None,
+                filtros=json.dumps({"estatus": "A", "frase": frase}),
+                titulo=f"Tesis y Jurisprudencias con {frase}",
+                estatus="A",
+            )
+        flash("La frase a buscar es incorrecta.", "warning")
+    return render_template("tesis_jurisprudencias/search.jinja2", form=form_search)
+
+
 @tesis_jurisprudencias.route("/tesis_jurisprudencias/datatable_json", methods=["GET", "POST"])
 def datatable_json():
     """DataTable JSON para listado de Tesis Jurisprudencias"""
@@ -146,7 +164,14 @@ def datatable_json():
         consulta = consulta.filter_by(estatus=request.form["estatus"])
     else:
         consulta = consulta.filter_by(estatus="A")
-    registros = consulta.order_by(TesisJurisprudencia.titulo).offset(start).limit(rows_per_page).all()
+    frase = safe_phrase(request.form.get("frase", ""))
+    if frase != "":
+        consulta = fulltext.filter_match(consulta, TesisJurisprudencia.busqueda, BUSQUEDA_COLUMNAS, frase)
+        registros = fulltext.order_by_rank(consulta, TesisJurisprudencia.busqueda, frase).offset(start).limit(rows_per_page).all()
+        fragmentos = fulltext.headlines(TesisJurisprudencia, TesisJurisprudencia.texto, [resultado.id for resultado in registros], frase)
+    else:
+        registros = consulta.order_by(TesisJurisprudencia.titulo).offset(start).limit(rows_per_page).all()
+        fragmentos = {}
     total = consulta.count()
     # Elaborar datos para DataTable
     data = []
@@ -158,6 +183,7 @@ def datatable_json():
                     "url": url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=resultado.id),
                 },
                 "clase": resultado.clase,
+                "fragmento": fragmentos.get(resultado.id, ""),
             }
         )
     # Entregar JSON
@@ -175,7 +201,14 @@ def datatable_json_admin():
         consulta = consulta.filter_by(estatus=request.form["estatus"])
     else:
         consulta = consulta.filter_by(estatus="A")
-    registros = consulta.order_by(TesisJurisprudencia.id.desc()).offset(start).limit(rows_per_page).all()
+    frase = safe_phrase(request.form.get("frase", ""))
+    if frase != "":
+        consulta = fulltext.filter_match(consulta, TesisJurisprudencia.busqueda, BUSQUEDA_COLUMNAS, frase)
+        registros = fulltext.order_by_rank(consulta, TesisJurisprudencia.busqueda, frase).offset(start).limit(rows_per_page).all()
+        fragmentos = fulltext.headlines(TesisJurisprudencia, TesisJurisprudencia.texto, [resultado.id for resultado in registros], frase)
+    else:
+        registros = consulta.order_by(TesisJurisprudencia.id.desc()).offset(start).limit(rows_per_page).all()
+        fragmentos = {}
     total = consulta.count()
     # Elaborar datos para DataTable
     data = []
@@ -189,6 +222,7 @@ def datatable_json_admin():
                     "url": url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=resultado.id),
                 },
                 "clase": resultado.clase,
+                "fragmento": fragmentos.get(resultado.id, ""),
             }
         )
     # Entregar JSON
@@ -254,9 +288,9 @@ def new():
                 publicacion_tiempo=publicacion_tiempo,
                 aplicacion_tiempo=aplicacion_tiempo,
             )
-            tesis_jurisprudencia.save()
+            tesis_jurisprudencia.save(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Tesis Jurisprudencia {tesis_jurisprudencia.titulo}"),
                 url=url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=tesis_jurisprudencia.id),
@@ -321,9 +355,9 @@ def new_for_autoridad(autoridad_id):
                 publicacion_tiempo=publicacion_tiempo,
                 aplicacion_tiempo=aplicacion_tiempo,
             )
-            tesis_jurisprudencia.save()
+            tesis_jurisprudencia.save(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Nueva Tesis Jurisprudencia {tesis_jurisprudencia.titulo}"),
                 url=url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=tesis_jurisprudencia.id),
@@ -378,9 +412,9 @@ def edit(tesis_jurisprudencia_id):
             tesis_jurisprudencia.aprobacion_fecha = form.aprobacion_fecha.data
             tesis_jurisprudencia.publicacion_tiempo = publicacion_tiempo
             tesis_jurisprudencia.aplicacion_tiempo = aplicacion_tiempo
-            tesis_jurisprudencia.save()
+            tesis_jurisprudencia.save(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Editado Tesis Jurisprudencia {tesis_jurisprudencia.titulo}"),
                 url=url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=tesis_jurisprudencia.id),
@@ -413,9 +447,9 @@ def delete(tesis_jurisprudencia_id):
     tesis_jurisprudencia = TesisJurisprudencia.query.get_or_404(tesis_jurisprudencia_id)
     if tesis_jurisprudencia.estatus == "A":
         if current_user.can_admin(MODULO) or current_user.autoridad_id == tesis_jurisprudencia.autoridad_id:
-            tesis_jurisprudencia.delete()
+            tesis_jurisprudencia.delete(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Eliminado Tesis Jurisprudencia {tesis_jurisprudencia.titulo}"),
                 url=url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=tesis_jurisprudencia.id),
@@ -432,9 +466,9 @@ def recover(tesis_jurisprudencia_id):
     tesis_jurisprudencia = TesisJurisprudencia.query.get_or_404(tesis_jurisprudencia_id)
     if tesis_jurisprudencia.estatus == "B":
         if current_user.can_admin(MODULO) or current_user.autoridad_id == tesis_jurisprudencia.autoridad_id:
-            tesis_jurisprudencia.recover()
+            tesis_jurisprudencia.recover(commit=False)
             bitacora = Bitacora(
-                modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+                modulo_nombre=MODULO,
                 usuario=current_user,
                 descripcion=safe_message(f"Recuperado Tesis {tesis_jurisprudencia.titulo}"),
                 url=url_for("tesis_jurisprudencias.detail", tesis_jurisprudencia_id=tesis_jurisprudencia.id),
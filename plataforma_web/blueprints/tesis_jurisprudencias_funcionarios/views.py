@@ -10,7 +10,6 @@ from lib.safe_string import safe_string, safe_message
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 
 from plataforma_web.blueprints.tesis_jurisprudencias.models import TesisJurisprudencia
@@ -63,9 +62,9 @@ def new_with_tesis(tesis_jurisprudencias_id):
             tesis_jurisprudencias=tesis_jurisprudencia,
 
         )        
-        tesis_funcionario.save()
+        tesis_funcionario.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo funcionario en tesis-jurisprudencia-funcionario {tesis_funcionario.funcionario.nombres}"),
             url=url_for("tesis_jurisprudencias_funcionarios.detail", tesis_jurisprudencia_funcionario_id=tesis_funcionario.id),
@@ -87,9 +86,9 @@ def delete(tesis_jurisprudencia_funcionario_id):
     """Eliminar Tesis-Jurisprudencias-Funcionario"""
     tesis_funcionario = TesisJurisprudenciaFuncionario.query.get_or_404(tesis_jurisprudencia_funcionario_id)
     if tesis_funcionario.estatus == "A":
-        tesis_funcionario.delete()
+        tesis_funcionario.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado tesis-jurisprudencia-funcionario {tesis_funcionario.funcionario.nombres}"),
             url=url_for("tesis_jurisprudencias_funcionarios.detail", tesis_jurisprudencia_funcionario_id=tesis_funcionario.id),
@@ -105,9 +104,9 @@ def recover(tesis_jurisprudencia_funcionario_id):
     """Tesis-Jurisprudencias-Funcionario"""
     tesis_funcionario = TesisJurisprudenciaFuncionario.query.get_or_404(tesis_jurisprudencia_funcionario_id)
     if tesis_funcionario.estatus == "B":
-        tesis_funcionario.recover()
+        tesis_funcionario.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado tesis-jurisprudencias-funcionario {tesis_funcionario.funcionario.nombres}"),
             url=url_for("tesis_jurisprudencias_funcionarios.detail", tesis_jurisprudencia_funcionario_id=tesis_funcionario.id),
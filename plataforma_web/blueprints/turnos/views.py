@@ -68,7 +68,7 @@ def datatable_json():
     for turno in registros:
         data.append(
             {
-                "autoridad_clave": turno.autoridad.clave,
+                "autoridad_clave": turno.ventanilla.autoridad.clave,
                 "ventanilla_numero": turno.ventanilla.numero,
                 "detalle": {
                     "numero": turno.numero,
@@ -5,14 +5,12 @@ import json
 from flask import Blueprint, flash, redirect, request, render_template, url_for
 from flask_login import current_user, login_required
 
-from lib import datatables
+from lib import catalogs, datatables
 from lib.safe_string import safe_expediente, safe_message, safe_string
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.distritos.models import Distrito
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.ubicaciones_expedientes.models import UbicacionExpediente
 from plataforma_web.blueprints.ubicaciones_expedientes.forms import UbicacionExpedienteNewForm, UbicacionExpedienteEditForm, UbicacionExpedienteSearchForm, UbicacionExpedienteSearchAdminForm
@@ -87,18 +85,18 @@ def list_distritos():
     """Listado de Distritos"""
     return render_template(
         "ubicaciones_expedientes/list_distritos.jinja2",
-        distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
+        distritos=catalogs.distritos_judiciales(),
     )
 
 
 @ubicaciones_expedientes.route("/ubicaciones_expedientes/distrito/<int:distrito_id>")
 def list_autoridades(distrito_id):
     """Listado de Autoridades de un distrito"""
-    distrito = Distrito.query.get_or_404(distrito_id)
+    distrito = catalogs.get_or_404("distritos", distrito_id)
     return render_template(
         "ubicaciones_expedientes/list_autoridades.jinja2",
         distrito=distrito,
-        autoridades=Autoridad.query.filter(Autoridad.distrito == distrito).filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+        autoridades=catalogs.autoridades_jurisdiccionales(distrito_id=distrito.id),
     )
 
 
@@ -142,7 +140,7 @@ def search():
     """Buscar Ubicacion de Expediente"""
     if current_user.can_admin("UBICACIONES EXPEDIENTES"):
         puede_elegir_autoridad = True
-    elif current_user.autoridad.es_jurisdiccional:
+    elif catalogs.get_autoridad(current_user.autoridad_id).es_jurisdiccional:
         puede_elegir_autoridad = False
     else:
         puede_elegir_autoridad = True
@@ -155,13 +153,13 @@ def search():
         titulos = []
         # Autoridad
         if puede_elegir_autoridad:
-            autoridad = Autoridad.query.get(form_search.autoridad.data)
+            autoridad = catalogs.get_autoridad(form_search.autoridad.data)
             plantilla = "ubicaciones_expedientes/list_admin.jinja2"
         else:
-            autoridad = current_user.autoridad
+            autoridad = catalogs.get_autoridad(current_user.autoridad_id)
             plantilla = "ubicaciones_expedientes/list.jinja2"
         busqueda["autoridad_id"] = autoridad.id
-        titulos.append(autoridad.distrito.nombre_corto + ", " + autoridad.descripcion_corta)
+        titulos.append(catalogs.get_distrito(autoridad.distrito_id).nombre_corto + ", " + autoridad.descripcion_corta)
         # Expediente
         if form_search.expediente.data != "":
             try:
@@ -186,12 +184,13 @@ def search():
         return render_template(
             "ubicaciones_expedientes/search_admin.jinja2",
             form=form_search,
-            distritos=Distrito.query.filter_by(es_distrito_judicial=True).filter_by(estatus="A").order_by(Distrito.nombre).all(),
-            autoridades=Autoridad.query.filter_by(es_jurisdiccional=True).filter_by(es_notaria=False).filter_by(estatus="A").order_by(Autoridad.clave).all(),
+            distritos=catalogs.distritos_judiciales(),
+            autoridades=catalogs.autoridades_jurisdiccionales(),
         )
     # Mostrar buscador con la autoridad fija
-    form_search.distrito.data = current_user.autoridad.distrito.nombre
-    form_search.autoridad.data = current_user.autoridad.descripcion
+    autoridad = catalogs.get_autoridad(current_user.autoridad_id)
+    form_search.distrito.data = catalogs.get_distrito(autoridad.distrito_id).nombre
+    form_search.autoridad.data = autoridad.descripcion
     return render_template("ubicaciones_expedientes/search.jinja2", form=form_search)
 
 
@@ -207,9 +206,9 @@ def datatable_json():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter(UbicacionExpediente.autoridad == autoridad)
+            consulta = consulta.filter(UbicacionExpediente.autoridad_id == autoridad.id)
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -252,9 +251,9 @@ def datatable_json_admin():
     else:
         consulta = consulta.filter_by(estatus="A")
     if "autoridad_id" in request.form:
-        autoridad = Autoridad.query.get(request.form["autoridad_id"])
+        autoridad = catalogs.get_autoridad(request.form["autoridad_id"])
         if autoridad:
-            consulta = consulta.filter(UbicacionExpediente.autoridad == autoridad)
+            consulta = consulta.filter(UbicacionExpediente.autoridad_id == autoridad.id)
     if "expediente" in request.form:
         try:
             expediente = safe_expediente(request.form["expediente"])
@@ -295,7 +294,7 @@ def detail(ubicacion_expediente_id):
 def new_success(ubicacion_expediente):
     """Mensaje de éxito en nueva ubicación de expediente"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Nueva ubicación del expediente {ubicacion_expediente.expediente} en {ubicacion_expediente.ubicacion} de {ubicacion_expediente.autoridad.clave}"),
         url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -341,7 +340,7 @@ def new():
             expediente=expediente,
             ubicacion=ubicacion,
         )
-        ubicacion_expediente.save()
+        ubicacion_expediente.save(commit=False)
 
         # Mostrar mensaje de éxito e ir al detalle
         bitacora = new_success(ubicacion_expediente)
@@ -394,7 +393,7 @@ def new_for_autoridad(autoridad_id):
             expediente=expediente,
             ubicacion=ubicacion,
         )
-        ubicacion_expediente.save()
+        ubicacion_expediente.save(commit=False)
 
         # Registrar en bitácoras e ir al detalle
         bitacora = new_success(ubicacion_expediente)
@@ -410,7 +409,7 @@ def new_for_autoridad(autoridad_id):
 def edit_success(ubicacion_expediente):
     """Mensaje de éxito al editar una ubicación de expediente"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Editada la ubicación del expediente {ubicacion_expediente.expediente} en {ubicacion_expediente.ubicacion} de {ubicacion_expediente.autoridad.clave}"),
         url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -443,7 +442,7 @@ def edit(ubicacion_expediente_id):
         # Actualizar registro
         ubicacion_expediente.expediente = expediente
         ubicacion_expediente.ubicacion = form.ubicacion.data
-        ubicacion_expediente.save()
+        ubicacion_expediente.save(commit=False)
 
         # Registrar en bitácora e ir al detalle
         bitacora = edit_success(ubicacion_expediente)
@@ -459,7 +458,7 @@ def edit(ubicacion_expediente_id):
 def delete_success(ubicacion_expediente):
     """Mensaje de éxito al eliminar una ubicacion de expediente"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Eliminada la ubicación del expediente {ubicacion_expediente.expediente} de {ubicacion_expediente.autoridad.clave}"),
         url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -475,7 +474,7 @@ def delete(ubicacion_expediente_id):
     ubicacion_expediente = UbicacionExpediente.query.get_or_404(ubicacion_expediente_id)
     if ubicacion_expediente.estatus == "A":
         if current_user.can_admin("UBICACIONES EXPEDIENTES") or current_user.autoridad_id == ubicacion_expediente.autoridad_id:
-            ubicacion_expediente.delete()
+            ubicacion_expediente.delete(commit=False)
             bitacora = delete_success(ubicacion_expediente)
             flash(bitacora.descripcion, "success")
             return redirect(bitacora.url)
@@ -486,7 +485,7 @@ def delete(ubicacion_expediente_id):
 def recover_success(ubicacion_expediente):
     """Mensaje de éxito al recuperar una ubicacion de expediente"""
     bitacora = Bitacora(
-        modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+        modulo_nombre=MODULO,
         usuario=current_user,
         descripcion=safe_message(f"Recuperada la ubicación del expediente {ubicacion_expediente.expediente} de {ubicacion_expediente.autoridad.clave}"),
         url=url_for("ubicaciones_expedientes.detail", ubicacion_expediente_id=ubicacion_expediente.id),
@@ -502,7 +501,7 @@ def recover(ubicacion_expediente_id):
     ubicacion_expediente = UbicacionExpediente.query.get_or_404(ubicacion_expediente_id)
     if ubicacion_expediente.estatus == "B":
         if current_user.can_admin("UBICACIONES EXPEDIENTES") or current_user.autoridad_id == ubicacion_expediente.autoridad_id:
-            ubicacion_expediente.recover()
+            ubicacion_expediente.recover(commit=False)
             bitacora = recover_success(ubicacion_expediente)
             flash(bitacora.descripcion, "success")
             return redirect(bitacora.url)
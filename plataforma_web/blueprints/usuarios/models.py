@@ -5,12 +5,15 @@ from collections import OrderedDict
 from flask import current_app
 from flask_login import UserMixin
 
+from lib import catalogs, menus
 from lib.universal_mixin import UniversalMixin
 from plataforma_web.extensions import db, pwd_context
 
 from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
+from plataforma_web.blueprints.roles.models import Rol
 from plataforma_web.blueprints.tareas.models import Tarea
+from plataforma_web.blueprints.usuarios_roles.models import UsuarioRol
 
 
 class Usuario(db.Model, UserMixin, UniversalMixin):
@@ -55,6 +58,9 @@ class Usuario(db.Model, UserMixin, UniversalMixin):
     turnos = db.relationship("Turno", back_populates="usuario", lazy="noload")
     soportes_tickets = db.relationship("SoporteTicket", back_populates="usuario", lazy="noload")
 
+    # Niveles de permiso por módulo, se calculan una vez o vienen de la identidad guardada en Redis
+    permisos_niveles = None
+
     @property
     def nombre(self):
         """Junta nombres, apellido_paterno y apellido materno"""
@@ -78,31 +84,37 @@ class Usuario(db.Model, UserMixin, UniversalMixin):
 
     def modulos(self):
         """Elaborar listado con modulos para el menu principal"""
-        modulos = []
-        modulos_nombres = []
-        for usuario_rol in self.usuarios_roles:
-            if usuario_rol.estatus == "A":
-                for permiso in usuario_rol.rol.permisos:
-                    if permiso.estatus == "A" and permiso.nivel > 0 and permiso.modulo.en_navegacion and permiso.modulo.nombre not in modulos_nombres:
-                        modulos.append(permiso.modulo)
-                        modulos_nombres.append(permiso.modulo.nombre)
-        return sorted(modulos, key=lambda x: x.nombre_corto)
+        modulos = Modulo.query.join(Permiso).join(Rol).join(UsuarioRol)
+        modulos = modulos.filter(UsuarioRol.usuario_id == self.id).filter(UsuarioRol.estatus == "A")
+        modulos = modulos.filter(Permiso.estatus == "A").filter(Permiso.nivel > 0).filter(Modulo.en_navegacion == True)
+        return modulos.distinct().order_by(Modulo.nombre_corto).all()
+
+    def menu(self):
+        """Menú principal guardado en Redis, para dibujarlo sin consultar la base de datos"""
+        return menus.get_menu(self)
+
+    def get_permissions(self):
+        """Diccionario id del módulo -> nivel máximo de los roles y permisos activos"""
+        if self.permisos_niveles is None:
+            self.permisos_niveles = {}
+            for usuario_rol in self.usuarios_roles:
+                if usuario_rol.estatus == "A":
+                    for permiso in usuario_rol.rol.permisos:
+                        if permiso.estatus == "A" and permiso.nivel > self.permisos_niveles.get(permiso.modulo_id, 0):
+                            self.permisos_niveles[permiso.modulo_id] = permiso.nivel
+        return self.permisos_niveles
 
     def can(self, module, permission):
         """¿Tiene permiso?"""
         if isinstance(module, str):
-            modulo = Modulo.query.filter_by(nombre=module.upper()).filter_by(estatus="A").first()
-            if modulo is None:
+            modulo_id = catalogs.modulo_id(module)
+            if modulo_id is None:
                 return False
-        elif isinstance(module, Modulo) is False:
+        elif isinstance(module, Modulo):
+            modulo_id = module.id
+        else:
             return False
-        maximo = 0
-        for usuario_rol in self.usuarios_roles:
-            if usuario_rol.estatus == "A":
-                for permiso in usuario_rol.rol.permisos:
-                    if permiso.estatus == "A" and permiso.modulo == modulo and permiso.nivel > maximo:
-                        maximo = permiso.nivel
-        return maximo >= permission
+        return self.get_permissions().get(modulo_id, 0) >= permission
 
     def can_view(self, module):
         """¿Tiene permiso para ver?"""
@@ -122,7 +134,7 @@ class Usuario(db.Model, UserMixin, UniversalMixin):
 
     def launch_task(self, nombre, descripcion, *args, **kwargs):
         """Arrancar tarea"""
-        rq_job = current_app.task_queue.enqueue("plataforma_web.blueprints." + nombre, *args, **kwargs)
+        rq_job = current_app.task_queues.enqueue(nombre, *args, **kwargs)
         tarea = Tarea(id=rq_job.get_id(), nombre=nombre, descripcion=descripcion, usuario=self)
         tarea.save()
         return tarea
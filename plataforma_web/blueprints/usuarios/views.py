@@ -22,7 +22,6 @@ from plataforma_web.blueprints.autoridades.models import Autoridad
 from plataforma_web.blueprints.bitacoras.models import Bitacora
 from plataforma_web.blueprints.distritos.models import Distrito
 from plataforma_web.blueprints.entradas_salidas.models import EntradaSalida
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.usuarios.forms import AccesoForm, UsuarioFormNew, UsuarioFormEdit
 from plataforma_web.blueprints.usuarios.models import Usuario
 
@@ -177,9 +176,9 @@ def new():
             puesto=form.puesto.data,
             contrasena=contrasena,
         )
-        usuario.save()
+        usuario.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo usuario {usuario.email}: {usuario.nombre}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -210,9 +209,9 @@ def edit(usuario_id):
         usuario.puesto = form.puesto.data
         if form.contrasena.data != "":
             usuario.contrasena = pwd_context.hash(form.contrasena.data)
-        usuario.save()
+        usuario.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Editado usuario {usuario.email}: {usuario.nombre}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -241,9 +240,9 @@ def delete(usuario_id):
     """Eliminar Usuario"""
     usuario = Usuario.query.get_or_404(usuario_id)
     if usuario.estatus == "A":
-        usuario.delete()
+        usuario.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado usuario {usuario.email}: {usuario.nombre}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -260,9 +259,9 @@ def recover(usuario_id):
     """Recuperar Usuario"""
     usuario = Usuario.query.get_or_404(usuario_id)
     if usuario.estatus == "B":
-        usuario.recover()
+        usuario.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado usuario {usuario.email}: {usuario.nombre}"),
             url=url_for("usuarios.detail", usuario_id=usuario.id),
@@ -8,7 +8,6 @@ from lib.safe_string import safe_message
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.roles.models import Rol
 from plataforma_web.blueprints.usuarios.models import Usuario
@@ -76,9 +75,9 @@ def new():
             usuario=usuario,
             descripcion=descripcion,
         )
-        usuario_rol.save()
+        usuario_rol.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo usuario-rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -106,9 +105,9 @@ def new_with_rol(rol_id):
             usuario=usuario,
             descripcion=descripcion,
         )
-        usuario_rol.save()
+        usuario_rol.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo usuario-rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -142,9 +141,9 @@ def new_with_usuario(usuario_id):
             usuario=usuario,
             descripcion=descripcion,
         )
-        usuario_rol.save()
+        usuario_rol.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Nuevo usuario-rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -167,9 +166,9 @@ def delete(usuario_rol_id):
     """Eliminar Usuario-Rol"""
     usuario_rol = UsuarioRol.query.get_or_404(usuario_rol_id)
     if usuario_rol.estatus == "A":
-        usuario_rol.delete()
+        usuario_rol.delete(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Eliminado usuario-rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -186,9 +185,9 @@ def recover(usuario_rol_id):
     """Recuperar Usuario-Rol"""
     usuario_rol = UsuarioRol.query.get_or_404(usuario_rol_id)
     if usuario_rol.estatus == "B":
-        usuario_rol.recover()
+        usuario_rol.recover(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f"Recuperado usuario-rol {usuario_rol.descripcion}"),
             url=url_for("usuarios_roles.detail", usuario_rol_id=usuario_rol.id),
@@ -7,7 +7,6 @@ from flask_login import current_user, login_required
 from lib.safe_string import safe_message
 
 from plataforma_web.blueprints.bitacoras.models import Bitacora
-from plataforma_web.blueprints.modulos.models import Modulo
 from plataforma_web.blueprints.permisos.models import Permiso
 from plataforma_web.blueprints.usuarios.decorators import permission_required
 from plataforma_web.blueprints.ventanillas.models import Ventanilla
@@ -70,9 +69,9 @@ def new():
             numero=numero,
             descripcion=f"Ventanilla {numero} en {autoridad.clave}"
         )
-        ventanilla.save()
+        ventanilla.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f'Nueva ventanilla {ventanilla.descripcion}'),
             url=url_for('ventanillas.detail', ventanilla_id=ventanilla.id),
@@ -93,9 +92,9 @@ def edit(ventanilla_id):
         ventanilla.autoridad = form.autoridad.data
         ventanilla.numero = form.numero.data
         ventanilla.descripcion = f"Ventanilla {ventanilla.numero} en {ventanilla.autoridad.clave}"
-        ventanilla.save()
+        ventanilla.save(commit=False)
         bitacora = Bitacora(
-            modulo=Modulo.query.filter_by(nombre=MODULO).first(),
+            modulo_nombre=MODULO,
             usuario=current_user,
             descripcion=safe_message(f'Editada la ventanilla {ventanilla.descripcion}'),
             url=url_for('ventanillas.detail', ventanilla_id=ventanilla.id),
@@ -3,12 +3,16 @@ Extensiones
 """
 from flask_login import LoginManager
 from flask_moment import Moment
+from flask_socketio import SocketIO
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect
 from passlib.context import CryptContext
 
+from lib.replicas import RoutingSession
+
 csrf = CSRFProtect()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 login_manager = LoginManager()
 moment = Moment()
+socketio = SocketIO()
 pwd_context = CryptContext(schemes=["pbkdf2_sha256", "des_crypt"], deprecated="auto")
@@ -6,68 +6,73 @@ function obtener_autoridades_edictos(path_json, container_id, spinner_id) {
     // Se hace la peticion y se espera su respuesta
     fetch(path_json).then((promesa) => {
         promesa.json().then((datos) => {
+            dibujar_autoridades_edictos(datos, container_id, spinner_id);
+        });
+    });
+
+}
 
-            // Icono
-            var icono = document.createElement('span');
-            icono.classList.add('iconify');
-            icono.setAttribute("data-icon", 'mdi:file-check');
-            var icono_boton = document.createElement('div');
-            icono_boton.classList.add('feature-icon');
-            icono_boton.classList.add('bg-primary');
-            icono_boton.classList.add('bg-gradient');
-            icono_boton.appendChild(icono);
-            var icono_vinculo = document.createElement('a');
-            icono_vinculo.appendChild(icono_boton);
-            icono_vinculo.href = datos.url;
+// Dibujar la tarjeta con los datos ya obtenidos
+function dibujar_autoridades_edictos(datos, container_id, spinner_id) {
 
-            // Listado de edictos
-            var listado = document.createElement('ul');
-            for (var i = 0; i < datos.listado.length; i++) {
-                var vinculo = document.createElement('a');
-                vinculo.innerText = datos.listado[i].expediente + ', ' + datos.listado[i].descripcion;
-                vinculo.href = datos.listado[i].url;
-                var renglon = document.createElement('li');
-                renglon.appendChild(vinculo)
-                renglon.classList.add('list-group-item');
-                listado.appendChild(renglon);
-            }
-            listado.classList.add('list-group');
-            listado.classList.add('list-group-flush');
+    // Icono
+    var icono = document.createElement('span');
+    icono.classList.add('iconify');
+    icono.setAttribute("data-icon", 'mdi:file-check');
+    var icono_boton = document.createElement('div');
+    icono_boton.classList.add('feature-icon');
+    icono_boton.classList.add('bg-primary');
+    icono_boton.classList.add('bg-gradient');
+    icono_boton.appendChild(icono);
+    var icono_vinculo = document.createElement('a');
+    icono_vinculo.appendChild(icono_boton);
+    icono_vinculo.href = datos.url;
 
-            // Titulo
-            var titulo = document.createElement('h3');
-            titulo.classList.add('card-title');
-            titulo.innerText = datos.titulo;
-            var titulo_vinculo = document.createElement('a');
-            titulo_vinculo.appendChild(titulo);
-            titulo_vinculo.href = datos.url;
+    // Listado de edictos
+    var listado = document.createElement('ul');
+    for (var i = 0; i < datos.listado.length; i++) {
+        var vinculo = document.createElement('a');
+        vinculo.innerText = datos.listado[i].expediente + ', ' + datos.listado[i].descripcion;
+        vinculo.href = datos.listado[i].url;
+        var renglon = document.createElement('li');
+        renglon.appendChild(vinculo)
+        renglon.classList.add('list-group-item');
+        listado.appendChild(renglon);
+    }
+    listado.classList.add('list-group');
+    listado.classList.add('list-group-flush');
 
-            // Breve
-            var breve = document.createElement('p');
-            breve.classList.add('card-text');
-            breve.innerText = datos.breve;
+    // Titulo
+    var titulo = document.createElement('h3');
+    titulo.classList.add('card-title');
+    titulo.innerText = datos.titulo;
+    var titulo_vinculo = document.createElement('a');
+    titulo_vinculo.appendChild(titulo);
+    titulo_vinculo.href = datos.url;
 
-            // Cuerpo = Icono + Titulo + Breve
-            var cuerpo = document.createElement('div');
-            cuerpo.classList.add('card-body');
-            cuerpo.appendChild(icono_vinculo);
-            cuerpo.appendChild(titulo_vinculo);
-            cuerpo.appendChild(breve);
+    // Breve
+    var breve = document.createElement('p');
+    breve.classList.add('card-text');
+    breve.innerText = datos.breve;
 
-            // Tarjeta = Cuerpo + Listado
-            var tarjeta = document.createElement('div');
-            tarjeta.appendChild(cuerpo);
-            tarjeta.appendChild(listado);
-            tarjeta.classList.add('card');
-            tarjeta.classList.add(datos.style);
+    // Cuerpo = Icono + Titulo + Breve
+    var cuerpo = document.createElement('div');
+    cuerpo.classList.add('card-body');
+    cuerpo.appendChild(icono_vinculo);
+    cuerpo.appendChild(titulo_vinculo);
+    cuerpo.appendChild(breve);
 
-            // Poner en el contenedor
-            $(container_id).append(tarjeta);
+    // Tarjeta = Cuerpo + Listado
+    var tarjeta = document.createElement('div');
+    tarjeta.appendChild(cuerpo);
+    tarjeta.appendChild(listado);
+    tarjeta.classList.add('card');
+    tarjeta.classList.add(datos.style);
 
-            // Ocultar el spinner
-            $(spinner_id).hide();
+    // Poner en el contenedor
+    $(container_id).append(tarjeta);
 
-        });
-    });
+    // Ocultar el spinner
+    $(spinner_id).hide();
 
 }
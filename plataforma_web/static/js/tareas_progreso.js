@@ -0,0 +1,21 @@
+// tareas_progreso.js
+
+// Recibir el progreso de las tareas en el fondo por una sola conexión, sin consultar de nuevo
+function recibir_tareas_progreso(card_id, container_id) {
+    const socket = io();
+    socket.on('tarea_progreso', function (tarea) {
+        const renglon_id = 'tarea_' + tarea.id;
+        let renglon = $('#' + renglon_id);
+        if (renglon.length === 0) {
+            renglon = $('<div class="my-2"><p></p><div class="progress"><div class="progress-bar progress-bar-striped bg-success" role="progressbar" aria-valuemin="0" aria-valuemax="100"></div></div></div>');
+            renglon.attr('id', renglon_id);
+            $(container_id).append(renglon);
+        }
+        renglon.find('p').text(tarea.progreso + '% ' + tarea.descripcion);
+        renglon.find('.progress-bar').css('width', tarea.progreso + '%').attr('aria-valuenow', tarea.progreso);
+        $(card_id).removeClass('d-none');
+        if (tarea.ha_terminado) {
+            renglon.find('.progress-bar').removeClass('progress-bar-striped');
+        }
+    });
+}
@@ -0,0 +1,250 @@
+"""
+Datos sintéticos para las pruebas de rendimiento
+
+Se generan siempre los mismos renglones para la misma escala, semilla y fecha de referencia, así los resultados se pueden
+comparar entre commits.
+Las autoridades y sus registros vienen de lib.synthetic; los archivos de la primera autoridad se escriben en un directorio
+que hace las veces del depósito, con los mismos nombres y URL que sus registros, para que las tareas refrescar los encuentren presentes.
+"""
+from datetime import date, datetime, time, timedelta
+import os
+import random
+
+from lib.partitions import RECIENTES_DIAS
+from lib.synthetic import GLOSAS_METADATOS, generate
+from plataforma_web.extensions import db, pwd_context
+from plataforma_web.blueprints.abogados.models import Abogado
+from plataforma_web.blueprints.bitacoras.models import Bitacora
+from plataforma_web.blueprints.distritos.models import Distrito
+from plataforma_web.blueprints.entradas_salidas.models import EntradaSalida
+from plataforma_web.blueprints.epocas.models import Epoca
+from plataforma_web.blueprints.materias.models import Materia
+from plataforma_web.blueprints.modulos.models import Modulo
+from plataforma_web.blueprints.peritos.models import Perito
+from plataforma_web.blueprints.permisos.models import Permiso
+from plataforma_web.blueprints.rep_graficas.models import RepGrafica
+from plataforma_web.blueprints.rep_reportes.models import RepReporte
+from plataforma_web.blueprints.roles.models import Rol
+from plataforma_web.blueprints.tesis_jurisprudencias.models import TesisJurisprudencia
+from plataforma_web.blueprints.turnos.models import Turno
+from plataforma_web.blueprints.usuarios.models import Usuario
+from plataforma_web.blueprints.usuarios_roles.models import UsuarioRol
+from plataforma_web.blueprints.ventanillas.models import Ventanilla
+
+DEPOSITO = "benchmark"
+DIAS = 365  # Los registros se reparten en el último año
+LOTE = 5000  # Renglones por INSERT
+
+MODULOS = [
+    "ABOGADOS",
+    "AUDIENCIAS",
+    "AUTORIDADES",
+    "BITACORAS",
+    "EDICTOS",
+    "ENTRADAS SALIDAS",
+    "GLOSAS",
+    "LISTAS DE ACUERDOS",
+    "LISTAS DE ACUERDOS ACUERDOS",
+    "MODULOS",
+    "PERITOS",
+    "REP GRAFICAS",
+    "REP REPORTES",
+    "REP RESULTADOS",
+    "SENTENCIAS",
+    "TAREAS",
+    "TESIS JURISPRUDENCIAS",
+    "TURNOS",
+    "UBICACIONES EXPEDIENTES",
+    "USUARIOS",
+]
+
+# Renglones por autoridad y por usuario de lib.synthetic, multiplicados por la escala
+VOLUMENES = {
+    "listas_de_acuerdos": 200,
+    "acuerdos_por_lista": 5,
+    "sentencias": 100,
+    "edictos": 100,
+    "glosas": 50,
+    "audiencias": 200,
+    "ubicaciones_expedientes": 100,
+    "bitacoras": 600,
+    "entradas_salidas": 250,
+}
+
+# Renglones por autoridad, o en total para las tablas sin autoridad, multiplicados por la escala
+CANTIDADES = {
+    "autoridades": 8,
+    "tesis_jurisprudencias": 20,
+    "abogados": 1000,
+    "peritos": 300,
+    "bitacoras": 5000,
+    "entradas_salidas": 2000,
+    "turnos": 500,
+}
+
+
+def insert(modelo, renglones: list):
+    """Insertar los renglones por lotes, sin pasar por la sesión"""
+    for inicio in range(0, len(renglones), LOTE):
+        db.session.execute(modelo.__table__.insert(), renglones[inicio : inicio + LOTE])
+
+
+def seed(escala: int, semilla: int, raiz: str, hoy: date):
+    """Crear los datos y el depósito local con las fechas hacia atrás desde hoy, entrega los ids, fechas y rutas que usan las pruebas"""
+    azar = random.Random(semilla)
+    ahora = datetime.combine(hoy, time(12))
+
+    def fecha():
+        return hoy - timedelta(days=azar.randrange(DIAS))
+
+    # Catálogos
+    distrito = Distrito(nombre="DISTRITO JUDICIAL DE PRUEBAS", nombre_corto="Pruebas", es_distrito_judicial=True)
+    materia = Materia(nombre="CIVIL")
+    db.session.add_all([distrito, materia])
+    db.session.flush()
+    epoca = Epoca(nombre="DECIMA EPOCA")
+    modulos = [Modulo(nombre=nombre, nombre_corto=nombre.title(), icono="fa-solid fa-circle", ruta="/") for nombre in MODULOS]
+    rol = Rol(nombre="ADMINISTRADOR")
+    db.session.add_all([epoca, rol] + modulos)
+    db.session.flush()
+    insert(Permiso, [{"rol_id": rol.id, "modulo_id": modulo.id, "nombre": f"{rol.nombre} {modulo.nombre}", "nivel": Permiso.ADMINISTRAR} for modulo in modulos])
+
+    # Autoridades con sus registros y usuarios, los archivos de la primera en el depósito local
+    _, autoridades_ids = generate(
+        db.session.connection(),
+        autoridades=CANTIDADES["autoridades"] * escala,
+        anos=1,
+        semilla=semilla,
+        deposito=DEPOSITO,
+        raiz=raiz,
+        archivos=1,
+        volumenes={volumen: cantidad * escala for volumen, cantidad in VOLUMENES.items()},
+        hoy=hoy,
+    )
+
+    # Usuario administrador
+    usuario = Usuario(
+        autoridad_id=autoridades_ids[0],
+        email="benchmark@pjecz.gob.mx",
+        contrasena=pwd_context.hash("benchmark"),
+        nombres="PRUEBAS",
+        apellido_paterno="RENDIMIENTO",
+        workspace="EXTERNO",
+    )
+    db.session.add(usuario)
+    db.session.flush()
+    db.session.add(UsuarioRol(usuario=usuario, rol=rol, descripcion=f"{usuario.email} en {rol.nombre}"))
+
+    # Tesis de cada autoridad
+    for autoridad_id in autoridades_ids:
+        insert(
+            TesisJurisprudencia,
+            [
+                {
+                    "autoridad_id": autoridad_id,
+                    "epoca_id": epoca.id,
+                    "materia_id": materia.id,
+                    "titulo": f"TESIS {numero + 1} SOBRE LA PRUEBA DE RENDIMIENTO",
+                    "subtitulo": "",
+                    "tipo": "REITERACION",
+                    "estado": "ACTIVAR",
+                    "clave_control": f"PRB/{numero + 1}",
+                    "clase": "TESIS",
+                    "rubro": f"RUBRO DE LA TESIS {numero + 1}",
+                    "texto": "Texto de la tesis para medir la búsqueda y los listados.",
+                    "precedentes": "Precedentes de la tesis.",
+                    "aprobacion_fecha": fecha(),
+                    "publicacion_tiempo": ahora,
+                    "aplicacion_tiempo": ahora,
+                }
+                for numero in range(CANTIDADES["tesis_jurisprudencias"] * escala)
+            ],
+        )
+
+    # Tablas sin autoridad
+    insert(
+        Abogado,
+        [
+            {"fecha": fecha(), "numero": str(numero + 1), "libro": str(numero // 500 + 1), "nombre": f"ABOGADO {azar.randint(1, 100000)} DE PRUEBAS"}
+            for numero in range(CANTIDADES["abogados"] * escala)
+        ],
+    )
+    insert(
+        Perito,
+        [
+            {
+                "distrito_id": distrito.id,
+                "tipo": azar.choice(list(Perito.TIPOS)),
+                "nombre": f"PERITO {azar.randint(1, 100000)} DE PRUEBAS",
+                "domicilio": "CONOCIDO",
+                "renovacion": hoy + timedelta(days=azar.randrange(DIAS)),
+            }
+            for _ in range(CANTIDADES["peritos"] * escala)
+        ],
+    )
+    insert(
+        Bitacora,
+        [
+            {
+                "modulo_id": azar.choice(modulos).id,
+                "usuario_id": usuario.id,
+                "descripcion": "Operación de pruebas",
+                "url": "/",
+                "creado": ahora - timedelta(minutes=azar.randrange(60 * 24 * 60)),
+            }
+            for _ in range(CANTIDADES["bitacoras"] * escala)
+        ],
+    )
+    insert(
+        EntradaSalida,
+        [
+            {"usuario_id": usuario.id, "tipo": azar.choice(list(EntradaSalida.TIPOS)), "direccion_ip": "127.0.0.1", "creado": ahora - timedelta(minutes=azar.randrange(60 * 24 * 60))}
+            for _ in range(CANTIDADES["entradas_salidas"] * escala)
+        ],
+    )
+    ventanilla = Ventanilla(autoridad_id=autoridades_ids[0], descripcion="VENTANILLA DE PRUEBAS", numero=1)
+    db.session.add(ventanilla)
+    db.session.flush()
+    insert(
+        Turno,
+        [
+            {
+                "ventanilla_id": ventanilla.id,
+                "usuario_id": usuario.id,
+                "numero": numero + 1,
+                "atencion": ahora,
+                "termino": ahora,
+                "comentarios": "",
+                "tipo": azar.choice(list(Turno.TIPOS)),
+                "estado": azar.choice(list(Turno.ESTADOS)),
+            }
+            for numero in range(CANTIDADES["turnos"] * escala)
+        ],
+    )
+
+    # Gráfica con un reporte
+    rep_grafica = RepGrafica(descripcion="GRAFICA DE PRUEBAS", desde=hoy - timedelta(days=30), hasta=hoy, corte="DIARIO")
+    db.session.add(rep_grafica)
+    db.session.flush()
+    rep_reporte = RepReporte(
+        rep_grafica=rep_grafica,
+        descripcion="Reporte de pruebas",
+        inicio=ahora - timedelta(days=30),
+        termino=ahora,
+        programado=ahora,
+        progreso="PENDIENTE",
+    )
+    db.session.add(rep_reporte)
+    db.session.commit()
+
+    return {
+        "autoridad_id": autoridades_ids[0],
+        "usuario_id": usuario.id,
+        "rep_grafica_id": rep_grafica.id,
+        "rep_reporte_id": rep_reporte.id,
+        "ventanilla_id": ventanilla.id,
+        "hoy": hoy.isoformat(),
+        "fecha_desde": (hoy - timedelta(days=RECIENTES_DIAS)).isoformat(),
+        "deposito": raiz,
+        "glosas_metadatos": os.path.join(raiz, GLOSAS_METADATOS),
+    }
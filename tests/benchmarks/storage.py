@@ -0,0 +1,62 @@
+"""
+Depósito local que hace las veces de Google Cloud Storage para las tareas refrescar
+
+Sólo tiene lo que usan las tareas: Client().get_bucket(nombre).list_blobs(prefix=...) y de cada blob su name,
+public_url y time_created. Los archivos son los de un directorio local.
+"""
+from datetime import datetime, timezone
+import math
+import os
+
+from lib.synthetic import public_url
+from tests.benchmarks.dataset import DEPOSITO
+
+PAGINA = 1000  # Blobs por página, como en la API de Cloud Storage
+
+
+class LocalBlob:
+    """Archivo del depósito local"""
+
+    def __init__(self, raiz: str, name: str):
+        self.name = name
+        self.public_url = public_url(DEPOSITO, name)
+        self.time_created = datetime.fromtimestamp(os.path.getmtime(os.path.join(raiz, name)), tz=timezone.utc)
+
+
+class LocalBlobIterator:
+    """Iterador de blobs con el número de páginas que se habrían pedido"""
+
+    def __init__(self, blobs: list):
+        self.blobs = blobs
+        self.page_number = math.ceil(len(blobs) / PAGINA)
+
+    def __iter__(self):
+        return iter(self.blobs)
+
+
+class LocalBucket:
+    """Depósito local"""
+
+    def __init__(self, raiz: str):
+        self.raiz = raiz
+
+    def list_blobs(self, prefix: str = ""):
+        """Blobs cuyo nombre comienza con el prefijo, en orden alfabético"""
+        nombres = []
+        for directorio, _, archivos in os.walk(os.path.join(self.raiz, os.path.dirname(prefix))):
+            for archivo in archivos:
+                nombre = os.path.relpath(os.path.join(directorio, archivo), self.raiz).replace(os.sep, "/")
+                if nombre.startswith(prefix):
+                    nombres.append(nombre)
+        return LocalBlobIterator([LocalBlob(self.raiz, nombre) for nombre in sorted(nombres)])
+
+
+class LocalClient:
+    """Cliente que entrega el depósito local sin importar el nombre"""
+
+    def __init__(self, raiz: str):
+        self.raiz = raiz
+
+    def get_bucket(self, nombre: str):
+        """Depósito local"""
+        return LocalBucket(self.raiz)
@@ -0,0 +1,66 @@
+"""
+Pruebas de rendimiento de los datatable_json, de las tarjetas de la página de inicio y de la agenda de audiencias
+"""
+from datetime import date, timedelta
+
+from flask import url_for
+import pytest
+
+# Formulario que envía cada datatable, los valores entre llaves se toman de los datos sintéticos
+DATATABLES = {
+    "abogados.datatable_json": {"estatus": "A"},
+    "audiencias.datatable_json": {"estatus": "A", "autoridad_id": "{autoridad_id}"},
+    "bitacoras.datatable_json": {"fecha_desde": "{fecha_desde}"},
+    "edictos.datatable_json": {"estatus": "A", "autoridad_id": "{autoridad_id}"},
+    "entradas_salidas.datatable_json": {"fecha_desde": "{fecha_desde}"},
+    "glosas.datatable_json": {"estatus": "A", "autoridad_id": "{autoridad_id}"},
+    "listas_de_acuerdos.datatable_json": {"estatus": "A", "autoridad_id": "{autoridad_id}"},
+    "listas_de_acuerdos_acuerdos.datatable_json": {"estatus": "A"},
+    "peritos.datatable_json": {"estatus": "A"},
+    "rep_graficas.datatable_json": {"estatus": "A"},
+    "rep_reportes.datatable_json": {"estatus": "A", "rep_grafica_id": "{rep_grafica_id}"},
+    "rep_resultados.datatable_json": {"estatus": "A", "rep_reporte_id": "{rep_reporte_id}"},
+    "sentencias.datatable_json": {"estatus": "A", "autoridad_id": "{autoridad_id}"},
+    "tesis_jurisprudencias.datatable_json": {"estatus": "A"},
+    "turnos.datatable_json": {"estatus": "A", "ventanilla_id": "{ventanilla_id}"},
+    "ubicaciones_expedientes.datatable_json": {"estatus": "A", "autoridad_id": "{autoridad_id}"},
+}
+
+
+def test_todos_los_datatables(app):
+    """Cada datatable_json de la app debe estar en DATATABLES"""
+    endpoints = {regla.endpoint for regla in app.url_map.iter_rules() if regla.endpoint.endswith(".datatable_json")}
+    assert endpoints == set(DATATABLES)
+
+
+@pytest.mark.parametrize("endpoint", sorted(DATATABLES))
+def test_datatable_json(benchmark, app, cliente, datos, endpoint):
+    """Primera página de diez renglones"""
+    benchmark.group = "datatable_json"
+    with app.test_request_context():
+        url = url_for(endpoint)
+    formulario = {"draw": 1, "start": 0, "length": 10}
+    formulario.update({llave: valor.format(**datos) for llave, valor in DATATABLES[endpoint].items()})
+    respuesta = benchmark(cliente.post, url, data=formulario)
+    assert respuesta.status_code == 200
+    assert "aaData" in respuesta.get_json()
+
+
+def test_tarjetas_json(benchmark, app, cliente, datos):
+    """Tarjetas de la página de inicio de sistemas"""
+    benchmark.group = "sistemas"
+    with app.test_request_context():
+        url = url_for("sistemas.tarjetas_json")
+    respuesta = benchmark(cliente.get, url)
+    assert respuesta.status_code == 200
+
+
+def test_calendario_json(benchmark, app, cliente, datos):
+    """Agenda de audiencias de una vista de mes"""
+    benchmark.group = "audiencias"
+    desde = date.fromisoformat(datos["hoy"]).replace(day=1) - timedelta(days=31)
+    with app.test_request_context():
+        url = url_for("audiencias.calendar_json", autoridad_id=datos["autoridad_id"], desde=desde.isoformat(), hasta=(desde + timedelta(days=42)).isoformat())
+    respuesta = benchmark(cliente.get, url)
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()["cantidad"] > 0
@@ -0,0 +1,60 @@
+"""
+Pruebas de rendimiento de las tareas en el fondo
+
+Las tareas refrescar leen el depósito local de los datos sintéticos, donde todos los archivos ya están en la base
+de datos, así cada ronda recorre y compara lo mismo sin insertar ni dar de baja. Los módulos de tareas se importan
+antes que las pruebas porque al importarse crean su app y dejan su contexto puesto. Las de listas de acuerdos y
+sentencias necesitan el locale es_MX, como en los workers; sin él se omiten.
+"""
+from datetime import date, datetime, time, timedelta
+import importlib
+import locale
+from types import SimpleNamespace
+
+import pytest
+
+from plataforma_web.blueprints.rep_reportes.models import RepReporte
+from tests.benchmarks.storage import LocalClient
+
+REFRESCAR = ["edictos", "glosas", "listas_de_acuerdos", "sentencias"]
+TAREAS = {}
+for modulo in REFRESCAR + ["rep_reportes"]:
+    try:
+        TAREAS[modulo] = importlib.import_module(f"plataforma_web.blueprints.{modulo}.tasks")
+    except locale.Error:
+        pass
+
+
+@pytest.mark.parametrize("nombre", REFRESCAR)
+def test_refrescar(benchmark, monkeypatch, datos, nombre):
+    """Refrescar la primera autoridad con todos sus archivos presentes"""
+    benchmark.group = "refrescar"
+    if nombre not in TAREAS:
+        pytest.skip("Falta el locale es_MX")
+    tareas = TAREAS[nombre]
+    monkeypatch.setattr(tareas, "storage", SimpleNamespace(Client=lambda: LocalClient(datos["deposito"])))
+    if nombre == "glosas":
+        monkeypatch.setattr(tareas, "METADATOS_CSV", datos["glosas_metadatos"])
+    mensaje = benchmark(tareas.refrescar, autoridad_id=datos["autoridad_id"])
+    assert "No se insertaron registros" in mensaje
+
+
+def test_rep_reportes_elaborar(benchmark, datos):
+    """Elaborar un reporte nuevo en cada ronda"""
+    benchmark.group = "rep_reportes"
+    tareas = TAREAS["rep_reportes"]
+
+    def preparar():
+        ahora = datetime.combine(date.fromisoformat(datos["hoy"]), time(12))
+        rep_reporte = RepReporte(
+            rep_grafica_id=datos["rep_grafica_id"],
+            descripcion="Reporte de pruebas",
+            inicio=ahora - timedelta(days=30),
+            termino=ahora,
+            programado=ahora,
+            progreso="PENDIENTE",
+        ).save()
+        return (rep_reporte.id,), {}
+
+    mensaje = benchmark.pedantic(tareas.elaborar, setup=preparar, rounds=20)
+    assert "TERMINADO" in mensaje
@@ -0,0 +1,25 @@
+"""
+Pruebas de rendimiento de los permisos de los usuarios
+"""
+from plataforma_web.extensions import db
+from plataforma_web.blueprints.permisos.models import Permiso
+from plataforma_web.blueprints.usuarios.models import Usuario
+
+
+def test_usuario_can(benchmark, datos):
+    """Usuario recién consultado, calcula sus permisos desde los roles"""
+    benchmark.group = "usuarios"
+
+    def consultar():
+        db.session.expunge_all()
+        return Usuario.query.get(datos["usuario_id"]).can("EDICTOS", Permiso.VER)
+
+    assert benchmark(consultar)
+
+
+def test_usuario_can_calculado(benchmark, datos):
+    """Usuario con los permisos ya calculados en la petición"""
+    benchmark.group = "usuarios"
+    usuario = Usuario.query.get(datos["usuario_id"])
+    usuario.can("EDICTOS", Permiso.VER)
+    assert benchmark(usuario.can, "EDICTOS", Permiso.ADMINISTRAR)
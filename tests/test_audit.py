@@ -0,0 +1,60 @@
+"""
+Pruebas del registro de auditoría con la cola en Redis
+
+Usan una app mínima con SQLite en memoria y fakeredis, sin el resto de las extensiones.
+"""
+import pytest
+from flask import Flask
+
+from lib import audit
+import plataforma_web.app  # noqa: F401 pylint: disable=unused-import  Registra todos los modelos
+from plataforma_web.blueprints.bitacoras.models import Bitacora
+from plataforma_web.extensions import db
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def app():
+    """App con las tablas creadas, la cola de auditoría en fakeredis y una vista que falla después de guardar"""
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI="sqlite://", AUDITORIA_MODO=audit.MODO_COLA, PROPAGATE_EXCEPTIONS=True)
+    app.redis = fakeredis.FakeRedis()
+    db.init_app(app)
+    audit.init_app(app)
+
+    @app.route("/falla")
+    def falla():
+        Bitacora(modulo_id=1, usuario_id=1, descripcion="Antes de fallar", url="/").save()
+        raise RuntimeError("La vista falla después de confirmar")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def test_evento_malo_no_detiene_la_cola(app):
+    """Un evento que viola una restricción se descarta y los demás se escriben"""
+    audit.publish(
+        [
+            ("bitacoras", {"modulo_id": 1, "usuario_id": 1, "descripcion": "Primero", "url": "/"}),
+            ("bitacoras", {"modulo_id": None, "usuario_id": 1, "descripcion": "Malo", "url": "/"}),
+            ("bitacoras", {"modulo_id": 1, "usuario_id": 1, "descripcion": "Tercero", "url": "/"}),
+        ]
+    )
+    assert audit.drain() == 2
+    assert sorted(bitacora.descripcion for bitacora in Bitacora.query.all()) == ["Primero", "Tercero"]
+    assert app.redis.xpending(audit.STREAM, audit.GRUPO)["pending"] == 0
+    descartados = app.redis.xrange(audit.DESCARTADOS)
+    assert len(descartados) == 1 and b"error" in descartados[0][1]
+    # Los siguientes ya no se juntan con el malo
+    audit.publish([("bitacoras", {"modulo_id": 1, "usuario_id": 1, "descripcion": "Cuarto", "url": "/"})])
+    assert audit.drain() == 1
+
+
+def test_evento_se_envia_aunque_la_vista_falle(app):
+    """El evento de un cambio confirmado llega a la cola aunque la vista falle después y after_request no se ejecute"""
+    with pytest.raises(RuntimeError):
+        app.test_client().get("/falla")
+    assert app.redis.xlen(audit.STREAM) == 1